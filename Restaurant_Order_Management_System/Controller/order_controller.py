@@ -2,24 +2,29 @@ import json
 from datetime import date
 
 from Infrastructure.connection_db import MenuDatabase, TablesDatabase
+from Infrastructure.order_repository import OrderConflictError
+from Infrastructure.timings import timed
 from Model.order import Order
 from Model.order_number_genetator import OrderNumberGenerator
+from Model.ticket_body import TicketBody
 
 
 class OrderController():
-    def __init__(self, order_repository):
+    # Longest the GUI thread waits for queued writes before going on without them
+    FLUSH_TIMEOUT = 0.5
+
+    def __init__(self, order_repository, write_queue=None, print_queue=None):
         self.orders = {}
         self.active_order_id = None
         self.dishes = {}
         self.active_dish_id = None
-        self.order_number_generator = OrderNumberGenerator()
+        self.order_number_generator = OrderNumberGenerator(order_repository)
         self.custom_product_counter = 0
         self.order_repository = order_repository
-        try:
-            latest_order_id = self.order_repository.get_latest_order_id()
-            self.order_number_generator.seed_from_order_id(latest_order_id)
-        except Exception:
-            pass
+        self.write_queue = write_queue
+        self.print_queue = print_queue
+        # db_path -> (menu catalog version, product data for the cards)
+        self._menu_cache = {}
 
     def get_orders(self):
         return self.orders
@@ -53,6 +58,7 @@ class OrderController():
             return None
         return order.active_dish
 
+    @timed
     def new_order_button_clicked(self):
         #order_id = str(uuid.uuid4())
         #new_order = Order(order_id)
@@ -70,6 +76,7 @@ class OrderController():
 
         
 
+    @timed
     def new_dish_button_clicked(self):
         order = self.get_active_order()
         if not order:
@@ -80,10 +87,14 @@ class OrderController():
         return new_dish
 
 
+    @timed
     def remove_order_clicked(self, order_id):
         was_active = self.active_order_id == order_id
         try:
-            self.order_repository.delete_order(order_id)
+            if self.write_queue is not None:
+                self.write_queue.delete(order_id)
+            else:
+                self.order_repository.delete_order(order_id, source=self)
         except Exception:
             pass
         if order_id in self.orders:
@@ -95,6 +106,7 @@ class OrderController():
 
         return self.get_active_order()
         
+    @timed
     def remove_dish_clicked(self, dish_id):
         order = self.get_active_order()
         if not order:
@@ -161,6 +173,7 @@ class OrderController():
             order.total()
         return ok
 
+    @timed
     def product_card_add_button_clicked(self, product):
         order = self.orders.get(self.active_order_id)
         if not order or not order.active_dish:
@@ -170,6 +183,7 @@ class OrderController():
         order.total()
         return order.active_dish
             
+    @timed
     def order_selected(self, order_id:str):
         self.active_order_id = order_id
         order = self.orders[order_id]
@@ -182,6 +196,7 @@ class OrderController():
             order.active_dish = None
         return order
 
+    @timed
     def dish_selected(self, dish_id:str):
         self.orders[self.active_order_id].set_active_dish(dish_id)
         dish = self.orders[self.active_order_id].dishes[dish_id]
@@ -192,12 +207,13 @@ class OrderController():
             return {"name": "", "table": ""}
         return {"name": order.name, "table": order.table}
     
+    @timed
     def close_order_button_clicked(self):
         order = self.get_active_order()
         if not order:
             return None
         order.set_status("Closed")
-        self.order_repository.save_order(order)
+        self.save_order(order)
         return order
 
     def reopen_order_button_clicked(self):
@@ -218,6 +234,7 @@ class OrderController():
         self.custom_product_counter += 1
         return f"producto_libre_{self.custom_product_counter}"
 
+    @timed
     def send_order_button_clicked(self):
         order = self.get_active_order()
         if not order:
@@ -325,12 +342,215 @@ class OrderController():
             if not dish.to_go_overridden:
                 dish.set_to_go(order.to_go)
 
+    @timed
     def persist_active_order(self):
         order = self.get_active_order()
         if not order:
             return None
-        self.order_repository.save_order(order)
-        return order
+        return self.save_order(order)
+
+    @timed
+    def save_order(self, order, max_attempts=3):
+        """Save order and return it, or the merged order that replaced it after a conflict.
+
+        Returns None if the order was deleted elsewhere. With a write queue
+        the order is saved later and conflicts come back through orders_written.
+        """
+        if self.write_queue is not None:
+            self.write_queue.save(order)
+            return order
+        for attempt in range(1, max_attempts + 1):
+            try:
+                self.order_repository.save_order(order, source=self)
+                return order
+            except OrderConflictError:
+                if attempt == max_attempts:
+                    raise
+                self.orders.setdefault(order.id, order)
+                order = self.merge_orders([order.id]).get(order.id)
+                if order is None:
+                    return None
+
+    def flush_writes(self, timeout=FLUSH_TIMEOUT):
+        """Wait up to timeout seconds for queued writes. False if some are still queued."""
+        if self.write_queue is None:
+            return True
+        return self.write_queue.flush(timeout)
+
+    def queued_order_ids(self):
+        if self.write_queue is None:
+            return set()
+        return self.write_queue.queued_order_ids()
+
+    def load_open_orders(self):
+        """Open orders as stored, except that orders with queued writes keep their live state."""
+        queued_ids = self.queued_order_ids()
+        open_orders = {
+            order_id: order
+            for order_id, order in self.order_repository.load_open_orders().items()
+            if order_id not in queued_ids
+        }
+        for order_id in queued_ids:
+            order = self.orders.get(order_id)
+            if order is not None and order.status != "Closed":
+                open_orders[order_id] = order
+        return open_orders
+
+    @timed
+    def print_ticket(self, order):
+        """Queue the ticket of order for printing. None without a print queue."""
+        if self.print_queue is None:
+            return None
+        return self.print_queue.submit(order.id, TicketBody.build(order, use_print_time=True))
+
+    def is_own_change(self, change):
+        return change.source is not None and change.source in (self, self.write_queue)
+
+    @timed
+    def reload_orders(self, order_ids, deleted=False):
+        """Replace the given orders with their stored state.
+
+        Returns (orders still open, ids no longer open). The active order is
+        deselected if it was among them, so the view can select it again.
+        Orders with queued writes keep their live state instead of waiting
+        for the writer; if the stored order changed meanwhile, their write
+        conflicts and orders_written merges them.
+        """
+        queued_ids = self.queued_order_ids()
+        order_ids = [order_id for order_id in order_ids if order_id not in queued_ids]
+        loaded = {} if deleted else self.order_repository.load_orders(order_ids)
+        updated = []
+        removed = []
+        for order_id in order_ids:
+            order = loaded.get(order_id)
+            if order is None or order.status == "Closed":
+                if self.orders.pop(order_id, None) is not None:
+                    removed.append(order_id)
+                continue
+            self.orders[order_id] = order
+            updated.append(order)
+        if self.active_order_id in order_ids:
+            self.active_order_id = None
+        return updated, removed
+
+    @timed
+    def orders_written(self, results):
+        """Adopt what the write queue saved and merge the orders it could not save.
+
+        Returns (merged orders still open, ids no longer open), like reload_orders.
+        """
+        conflicted_ids = []
+        for result in results:
+            if isinstance(result.error, OrderConflictError):
+                conflicted_ids.append(result.order_id)
+                continue
+            if result.saved_order is None:
+                continue
+            order = self.orders.get(result.order_id)
+            # Orders reloaded since the write already match the database
+            if order is None or order._clean_token is None:
+                continue
+            order.adopt_clean_state(result.saved_order)
+            order._clean_token = result.clean_token
+
+        updated = []
+        removed = []
+        for order_id, order in self.merge_orders(conflicted_ids).items():
+            if order is not None:
+                self.save_order(order)
+            if order is None or order.status == "Closed":
+                self.orders.pop(order_id, None)
+                removed.append(order_id)
+            else:
+                updated.append(order)
+        if self.active_order_id in removed:
+            self.active_order_id = None
+        return updated, removed
+
+    def failed_writes(self, results):
+        """The results of the write queue that failed for a reason other than a conflict."""
+        return [
+            result for result in results
+            if result.error is not None and not isinstance(result.error, OrderConflictError)
+        ]
+
+    @timed
+    def merge_orders(self, order_ids):
+        """Rebase the local edits of order_ids onto their stored state.
+
+        For orders another terminal saved first. Fields and dishes edited
+        here win, everything else takes the stored value. Returns
+        {order_id: merged order, or None if it was deleted elsewhere} and
+        replaces the orders in self.orders; the merged orders still need saving.
+        """
+        order_ids = [order_id for order_id in order_ids if order_id in self.orders]
+        stored_orders = self.order_repository.load_orders(order_ids)
+        merged = {}
+        for order_id in order_ids:
+            stored = stored_orders.get(order_id)
+            if stored is None:
+                del self.orders[order_id]
+                merged[order_id] = None
+                continue
+            merged[order_id] = self.orders[order_id] = self._merge_order(self.orders[order_id], stored)
+        return merged
+
+    def _merge_order(self, local, stored):
+        for name in local.changed_fields():
+            if name not in {"created_at", "total_amount"}:
+                setattr(stored, name, getattr(local, name))
+
+        stored_dish_ids = set(stored.dishes)
+        for dish_id in local.persisted_dish_ids - set(local.dishes):
+            stored.dishes.pop(dish_id, None)
+        for dish_id, dish in local.dishes.items():
+            stored_dish = stored.dishes.get(dish_id)
+            if stored_dish is not None:
+                self._merge_dish(dish, stored_dish)
+            elif dish_id not in local.persisted_dish_ids or dish.has_changes():
+                # New here, or deleted elsewhere while edited here
+                stored.dishes[dish_id] = dish
+        if set(stored.dishes) != stored_dish_ids:
+            stored.renumber_dishes()
+
+        active_dish_id = local.active_dish.id if local.active_dish else None
+        if active_dish_id in stored.dishes:
+            stored.active_dish = stored.dishes[active_dish_id]
+        elif stored.dishes:
+            stored.active_dish = next(iter(stored.dishes.values()))
+        else:
+            stored.active_dish = None
+        stored.total()
+        return stored
+
+    def _merge_dish(self, local, stored):
+        for name in local.changed_fields():
+            if name not in {"display_name", "total_amount"}:
+                setattr(stored, name, getattr(local, name))
+
+        stored_by_row_id = {
+            product.row_id: name for name, product in stored.products.items() if product.row_id is not None
+        }
+        current_row_ids = {product.row_id for product in local.products.values()}
+        for row_id in local.persisted_item_ids - current_row_ids:
+            stored.products.pop(stored_by_row_id.get(row_id), None)
+        for product in local.products.values():
+            known = product.row_id in local.persisted_item_ids
+            if known and not product.is_dirty():
+                continue
+            stored_name = stored_by_row_id.get(product.row_id)
+            if stored_name is not None:
+                stored.products.pop(stored_name)
+            elif not known and product.name in stored.products and not product.is_custom:
+                # Added on both terminals
+                stored.products[product.name].quantity += product.quantity
+                continue
+            else:
+                # Written as a new row; the stored dish does not have it
+                product.row_id = None
+            product._clean_state = None
+            stored.products[product.name] = product
+        stored.total()
 
     def is_order_editable(self, order, unlocked_closed_order_ids=None):
         if not order:
@@ -338,9 +558,17 @@ class OrderController():
         unlocked = unlocked_closed_order_ids or set()
         return order.status != "Closed" or order.id in unlocked
 
+    @timed
     def get_menu_products_for_view(self, db_path="orders.db"):
+        """Menu cards to show. The same list is returned while the menu is unchanged."""
+        version = None
         try:
-            rows = MenuDatabase(db_path, "menu").fetch_all()
+            menu_database = MenuDatabase(db_path, "menu")
+            version = menu_database.catalog_version()
+            cached = self._menu_cache.get(db_path)
+            if cached is not None and version is not None and cached[0] == version:
+                return cached[1]
+            rows = menu_database.fetch_all()
         except Exception:
             rows = []
 
@@ -361,6 +589,7 @@ class OrderController():
                 "is_custom": True,
             }
         )
+        self._menu_cache[db_path] = (version, products)
         return products
 
     def get_active_table_names_for_view(self, db_path="orders.db"):
@@ -25,7 +25,7 @@ class OrderCrudController():
 
     def button_delete_clicked(self,row):
         model = self.view.table_view.model()
-        row_id = model._data[row][0]
+        row_id = model.row_data(row)[0]
 
         confirm = QMessageBox.question(
             self.view, "Confirm delete", f"Delete record ID {row_id}?",
@@ -41,7 +41,7 @@ class OrderCrudController():
 
     def button_edit_clicked(self,row):
         model = self.view.table_view.model()
-        row_id = model._data[row][0]
+        row_id = model.row_data(row)[0]
         name = self.view.tab2_form_line_name.text()
         labels = self.view.tab2_form_line_labels.text()
         date = self.view.tab2_form_line_date.text()
@@ -51,24 +51,28 @@ class OrderCrudController():
 
     
     def refresh_table(self):
-        data = self.db.fetch_all()
-        #model = TableModel(
-        #    data,
-        #    ["ID", "Name", "Labels", "Date", "Body"]
-        #)
-        #self.view.table_view.setModel(model)
-        #
-        self.view.main_model.update_data(data)
+        self.view.main_model.set_query(
+            self.db.fetch_page,
+            self.db.count,
+            lambda ids: self.db.search_by_ids({}, ids),
+        )
 
     def search(self, filters):
-        data = self.db.search(filters)
+        # Read the form once; every page of the result reuses these values
+        filters = {
+            column: value() if callable(value) else value
+            for column, value in filters.items()
+        }
+        self.view.main_model.set_query(
+            lambda after_id, limit: self.db.search_page(filters, after_id, limit),
+            lambda: self.db.search_count(filters),
+            lambda ids: self.db.search_by_ids(filters, ids),
+        )
 
-        #model = TableModel(
-        #    data,
-        #    ["ID", "Name", "Labels", "Date", "Body"]
-        #)
-        #self.view.table_view.setModel(model)
-        self.view.main_model.update_data(data)
+    def orders_changed(self, order_ids):
+        # Patch just the affected rows; the selection follows removed rows
+        self.view.main_model.refresh_keys(order_ids)
+        self.update_selection_table()
 
     ## SELECTION TABLE CONTROLLER
     def update_selection_table(self):
@@ -78,13 +82,15 @@ class OrderCrudController():
         rows = []
 
         for index in indexes:
-            row = index.row()
+            row_data = model.row_data(index.row())
+            if row_data is None:
+                continue
             rows.append([
-                model._data[row][0],  # ID
-                model._data[row][1],  # Name
-                model._data[row][2],  # Labels
-                model._data[row][3],  # Date
-                model._data[row][4],  # Body
+                row_data[0],  # ID
+                row_data[1],  # Name
+                row_data[2],  # Labels
+                row_data[3],  # Date
+                row_data[4],  # Body
             ])
 
         self.view.selection_table_model.update_data(rows)
@@ -92,13 +98,12 @@ class OrderCrudController():
     def selected_double_click(self, index):
         row_id = self.view.selection_table_model._data[index.row()][0]
 
-        for i, row in enumerate(self.view.main_model._data):
-            if row[0] == row_id:
-                self.view.table_view.selectRow(i)
-                self.view.table_view.scrollTo(
-                    self.view.main_model.index(i, 0)
-                )
-                break
+        i = self.view.main_model.row_for_key(row_id)
+        if i >= 0:
+            self.view.table_view.selectRow(i)
+            self.view.table_view.scrollTo(
+                self.view.main_model.index(i, 0)
+            )
 
     def delete_selected(self):
         rows = self.view.selection_table_model._data
@@ -123,15 +128,14 @@ class OrderCrudController():
         if confirm != QMessageBox.StandardButton.Yes:
             return
 
+        # The table drops the rows when the deletion is published
         self.db.delete_many_by_ids(ids)
 
-        self.refresh_table()
         self.view.selection_table_model.update_data([])
         self.view.table_view.clearSelection()
 
     def bulk_edit_clicked(self, ids, updates):
         self.db.bulk_update(ids, updates)
-        self.refresh_table()
         self.view.selection_table_model.update_data([])
         self.view.table_view.clearSelection()
 
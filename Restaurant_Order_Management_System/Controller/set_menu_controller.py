@@ -1,5 +1,6 @@
 ﻿import json
 
+from Infrastructure.catalog_io import MENU_FIELDS, import_records, write_records
 from Infrastructure.connection_db import MenuDatabase
 
 
@@ -21,50 +22,72 @@ class SetMenuController:
         return formatted_rows
 
     def add_menu_item(self, product_name, cost, shortcuts, color, shape, position, product_type):
-        product_name = (product_name or "").strip()
-        if not product_name:
-            return False, "Product name is required."
-
-        try:
-            cost_value = float(str(cost).strip() or "0")
-        except ValueError:
-            return False, "Cost must be numeric."
+        ok, values_or_error = self._validate_menu_item(
+            product_name, cost, shortcuts, color, shape, position, product_type
+        )
+        if not ok:
+            return False, values_or_error
 
-        try:
-            position_value = int(str(position).strip() or "0")
-        except ValueError:
-            return False, "Position must be an integer."
+        self.db.insert(**values_or_error)
+        self.refresh_table()
+        return True, "Record added."
 
-        ok, shortcuts_json_or_error = self._normalize_shortcuts(shortcuts)
+    def update_menu_item(self, row_id, product_name, cost, shortcuts, color, shape, position, product_type):
+        ok, values_or_error = self._validate_menu_item(
+            product_name, cost, shortcuts, color, shape, position, product_type
+        )
         if not ok:
-            return False, shortcuts_json_or_error
+            return False, values_or_error
 
-        normalized_type = self._normalize_product_type(product_type)
+        self.db.update_by_id(row_id=row_id, **values_or_error)
+        self.refresh_table()
+        return True, "Record updated."
 
-        self.db.insert(
-            product_name=product_name,
-            cost=cost_value,
-            shortcuts=shortcuts_json_or_error,
-            color=(color or "").strip(),
-            shape=(shape or "").strip(),
-            position=position_value,
-            product_type=normalized_type,
+    def import_menu(self, path, progress=None):
+        """Append the products of a CSV or JSON Lines file. Returns an ImportReport."""
+        report = import_records(
+            path,
+            self._menu_row_from_record,
+            self.db.insert_many,
+            progress=progress,
         )
         self.refresh_table()
-        return True, "Record added."
+        return report
+
+    def export_menu(self, path, progress=None):
+        records = (
+            {
+                "product_name": row[1],
+                "cost": row[2],
+                "shortcuts": self._parse_shortcuts_to_list(row[3]),
+                "color": row[4],
+                "shape": row[5],
+                "position": row[6],
+                "product_type": row[7],
+            }
+            for row in self.db.iter_rows()
+        )
+        return write_records(path, MENU_FIELDS, records, progress=progress)
 
-    def update_menu_item(self, row_id, product_name, cost, shortcuts, color, shape, position, product_type):
-        product_name = (product_name or "").strip()
+    def _menu_row_from_record(self, record):
+        ok, values_or_error = self._validate_menu_item(*(record.get(field) for field in MENU_FIELDS))
+        if not ok:
+            return False, values_or_error
+        return True, tuple(values_or_error[field] for field in MENU_FIELDS)
+
+    def _validate_menu_item(self, product_name, cost, shortcuts, color, shape, position, product_type):
+        """(True, column values) or (False, message); shared by the forms and imports."""
+        product_name = str(product_name or "").strip()
         if not product_name:
             return False, "Product name is required."
 
         try:
-            cost_value = float(str(cost).strip() or "0")
+            cost_value = float(str(cost if cost is not None else "").strip() or "0")
         except ValueError:
             return False, "Cost must be numeric."
 
         try:
-            position_value = int(str(position).strip() or "0")
+            position_value = int(str(position if position is not None else "").strip() or "0")
         except ValueError:
             return False, "Position must be an integer."
 
@@ -72,20 +95,15 @@ class SetMenuController:
         if not ok:
             return False, shortcuts_json_or_error
 
-        normalized_type = self._normalize_product_type(product_type)
-
-        self.db.update_by_id(
-            row_id=row_id,
-            product_name=product_name,
-            cost=cost_value,
-            shortcuts=shortcuts_json_or_error,
-            color=(color or "").strip(),
-            shape=(shape or "").strip(),
-            position=position_value,
-            product_type=normalized_type,
-        )
-        self.refresh_table()
-        return True, "Record updated."
+        return True, {
+            "product_name": product_name,
+            "cost": cost_value,
+            "shortcuts": shortcuts_json_or_error,
+            "color": str(color or "").strip(),
+            "shape": str(shape or "").strip(),
+            "position": position_value,
+            "product_type": self._normalize_product_type(product_type),
+        }
 
     def refresh_table(self):
         if hasattr(self.view, "refresh_table"):
@@ -96,9 +114,38 @@ class SetMenuController:
         if not selected_ids:
             self.view.show_warning("Selection", "Select at least one record to remove.")
             return
-        for row_id in selected_ids:
-            self.db.delete_by_id(row_id)
+        self.db.delete_many(selected_ids)
+        self.refresh_table()
+
+    def move_registry_button_clicked(self, offset):
+        selected_ids = self.view.get_selected_menu_ids()
+        if not selected_ids:
+            self.view.show_warning("Selection", "Select at least one record to move.")
+            return
+        positions = self._moved_positions(self.db.fetch_all(), selected_ids, offset)
+        if positions:
+            self.db.update_positions(positions)
         self.refresh_table()
+        self.view.select_menu_ids(selected_ids)
+
+    def _moved_positions(self, rows, selected_ids, offset):
+        """New (id, position) pairs after moving the selected rows one step; only changed rows."""
+        ordered_ids = [row[0] for row in rows]
+        selected = set(selected_ids)
+        indexes = range(len(ordered_ids)) if offset < 0 else range(len(ordered_ids) - 1, -1, -1)
+        for index in indexes:
+            target = index + offset
+            if ordered_ids[index] not in selected or not 0 <= target < len(ordered_ids):
+                continue
+            if ordered_ids[target] in selected:
+                continue
+            ordered_ids[index], ordered_ids[target] = ordered_ids[target], ordered_ids[index]
+        current_positions = {row[0]: row[6] for row in rows}
+        return [
+            (row_id, position)
+            for position, row_id in enumerate(ordered_ids)
+            if current_positions[row_id] != position
+        ]
     
     def edit_registry_button_clicked(self):
         selected_rows = self.view.get_selected_menu_rows()
@@ -1,5 +1,6 @@
 ﻿import sqlite3
 
+from Infrastructure.catalog_io import TABLE_FIELDS, import_records, write_records
 from Infrastructure.connection_db import TablesDatabase
 
 
@@ -12,17 +13,12 @@ class SetTablesController:
         return self.db.fetch_all()
 
     def add_table_item(self, table_name, position):
-        table_name = (table_name or "").strip()
-        if not table_name:
-            return False, "Table name is required."
-
-        try:
-            position_value = int(str(position).strip() or "0")
-        except ValueError:
-            return False, "Position must be an integer."
+        ok, values_or_error = self._validate_table_item(table_name, position)
+        if not ok:
+            return False, values_or_error
 
         try:
-            self.db.insert(table_name=table_name, position=position_value)
+            self.db.insert(**values_or_error)
         except sqlite3.IntegrityError:
             return False, "A table with that name already exists."
 
@@ -30,27 +26,51 @@ class SetTablesController:
         return True, "Record added."
 
     def update_table_item(self, row_id, table_name, position):
-        table_name = (table_name or "").strip()
-        if not table_name:
-            return False, "Table name is required."
+        ok, values_or_error = self._validate_table_item(table_name, position)
+        if not ok:
+            return False, values_or_error
 
         try:
-            position_value = int(str(position).strip() or "0")
-        except ValueError:
-            return False, "Position must be an integer."
-
-        try:
-            self.db.update_by_id(
-                row_id=row_id,
-                table_name=table_name,
-                position=position_value,
-            )
+            self.db.update_by_id(row_id=row_id, **values_or_error)
         except sqlite3.IntegrityError:
             return False, "A table with that name already exists."
 
         self.refresh_table()
         return True, "Record updated."
 
+    def import_tables(self, path, progress=None):
+        """Add the tables of a CSV or JSON Lines file; existing names take the imported position."""
+        report = import_records(
+            path,
+            self._table_row_from_record,
+            self.db.insert_many,
+            progress=progress,
+        )
+        self.refresh_table()
+        return report
+
+    def export_tables(self, path, progress=None):
+        records = ({"table_name": row[1], "position": row[2]} for row in self.db.iter_rows())
+        return write_records(path, TABLE_FIELDS, records, progress=progress)
+
+    def _table_row_from_record(self, record):
+        ok, values_or_error = self._validate_table_item(record.get("table_name"), record.get("position"))
+        if not ok:
+            return False, values_or_error
+        return True, (values_or_error["table_name"], values_or_error["position"])
+
+    def _validate_table_item(self, table_name, position):
+        table_name = str(table_name or "").strip()
+        if not table_name:
+            return False, "Table name is required."
+
+        try:
+            position_value = int(str(position if position is not None else "").strip() or "0")
+        except ValueError:
+            return False, "Position must be an integer."
+
+        return True, {"table_name": table_name, "position": position_value}
+
     def refresh_table(self):
         if hasattr(self.view, "refresh_table"):
             self.view.refresh_table()
@@ -60,10 +80,39 @@ class SetTablesController:
         if not selected_ids:
             self.view.show_warning("Selection", "Select at least one record to remove.")
             return
-        for row_id in selected_ids:
-            self.db.delete_by_id(row_id)
+        self.db.delete_many(selected_ids)
         self.refresh_table()
 
+    def move_registry_button_clicked(self, offset):
+        selected_ids = self.view.get_selected_table_ids()
+        if not selected_ids:
+            self.view.show_warning("Selection", "Select at least one record to move.")
+            return
+        positions = self._moved_positions(self.db.fetch_all(), selected_ids, offset)
+        if positions:
+            self.db.update_positions(positions)
+        self.refresh_table()
+        self.view.select_table_ids(selected_ids)
+
+    def _moved_positions(self, rows, selected_ids, offset):
+        """New (id, position) pairs after moving the selected rows one step; only changed rows."""
+        ordered_ids = [row[0] for row in rows]
+        selected = set(selected_ids)
+        indexes = range(len(ordered_ids)) if offset < 0 else range(len(ordered_ids) - 1, -1, -1)
+        for index in indexes:
+            target = index + offset
+            if ordered_ids[index] not in selected or not 0 <= target < len(ordered_ids):
+                continue
+            if ordered_ids[target] in selected:
+                continue
+            ordered_ids[index], ordered_ids[target] = ordered_ids[target], ordered_ids[index]
+        current_positions = {row[0]: row[2] for row in rows}
+        return [
+            (row_id, position)
+            for position, row_id in enumerate(ordered_ids)
+            if current_positions[row_id] != position
+        ]
+
     def edit_registry_button_clicked(self):
         selected_rows = self.view.get_selected_table_rows()
         if not selected_rows:
@@ -0,0 +1,122 @@
+from Infrastructure.connection_manager import get_connection
+from Infrastructure.migrations import ensure_schema
+
+
+class AnalyticsRepository:
+    """Read side of the daily rollup and product sales tables. Dates are 'yyyy-MM-dd' strings.
+
+    weekday follows QDate.dayOfWeek(): 1 is Monday, 7 is Sunday.
+    """
+
+    def __init__(self, db_path="orders.db"):
+        self.db_path = db_path
+        ensure_schema(self.db_path)
+
+    @property
+    def conn(self):
+        return get_connection(self.db_path)
+
+    def revenue_by_date(self, start=None, end=None):
+        where_sql, params = self._range_where(start, end, None)
+        where_sql += (" AND " if where_sql else " WHERE ") + "order_count > 0"
+        cur = self.conn.execute(
+            f"SELECT service_date, revenue FROM daily_revenue{where_sql}",
+            params,
+        )
+        return {row[0]: float(row[1] or 0.0) for row in cur.fetchall()}
+
+    def daily_totals(self, start, end):
+        where_sql, params = self._range_where(start, end, None)
+        cur = self.conn.execute(
+            f"SELECT service_date, revenue, order_count FROM daily_revenue{where_sql}",
+            params,
+        )
+        return {row[0]: (float(row[1] or 0.0), int(row[2] or 0)) for row in cur.fetchall()}
+
+    def summary(self, start, end, weekday=None):
+        where_sql, params = self._range_where(start, end, weekday)
+        row = self.conn.execute(
+            f"""
+            SELECT
+                COALESCE(SUM(revenue), 0),
+                COALESCE(SUM(paid), 0),
+                COALESCE(SUM(order_count), 0),
+                COALESCE(SUM(closed_count), 0),
+                COALESCE(SUM(to_go_count), 0)
+            FROM daily_revenue{where_sql}
+            """,
+            params,
+        ).fetchone()
+        return {
+            "revenue": float(row[0]),
+            "paid": float(row[1]),
+            "orders": int(row[2]),
+            "closed": int(row[3]),
+            "to_go": int(row[4]),
+        }
+
+    def top_table(self, start, end, weekday=None):
+        where_sql, params = self._range_where(start, end, weekday)
+        row = self.conn.execute(
+            f"""
+            SELECT table_name, SUM(order_count) AS uses
+            FROM daily_table_usage{where_sql}
+            GROUP BY table_name
+            HAVING uses > 0
+            ORDER BY uses DESC, table_name ASC
+            LIMIT 1
+            """,
+            params,
+        ).fetchone()
+        return row[0] if row else "-"
+
+    def peak_hours(self, start, end, weekday=None, top_n=3):
+        where_sql, params = self._range_where(start, end, weekday)
+        cur = self.conn.execute(
+            f"""
+            SELECT hour, SUM(order_count) AS orders
+            FROM daily_revenue_hours{where_sql}
+            GROUP BY hour
+            HAVING orders > 0
+            ORDER BY orders DESC, hour ASC
+            LIMIT ?
+            """,
+            params + [int(top_n)],
+        )
+        return [(int(row[0]), int(row[1])) for row in cur.fetchall()]
+
+    def top_products(self, start, end, weekday=None, product_types=None, limit=1):
+        where_sql, params = self._range_where(start, end, weekday)
+        if product_types:
+            placeholders = ", ".join("?" for _ in product_types)
+            where_sql += (" AND " if where_sql else " WHERE ") + f"product_type IN ({placeholders})"
+            params.extend(product_types)
+        cur = self.conn.execute(
+            f"""
+            SELECT product_name, SUM(quantity) AS sold
+            FROM product_sales{where_sql}
+            GROUP BY product_name
+            HAVING sold > 0
+            ORDER BY sold DESC, product_name ASC
+            LIMIT ?
+            """,
+            params + [int(limit)],
+        )
+        return [(row[0], int(row[1])) for row in cur.fetchall()]
+
+    def _range_where(self, start, end, weekday):
+        clauses = []
+        params = []
+        if start is not None:
+            clauses.append("service_date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("service_date <= ?")
+            params.append(end)
+        if weekday is not None:
+            # strftime('%w') counts Sunday as 0, QDate as 7
+            clauses.append("CAST(strftime('%w', service_date) AS INTEGER) = ?")
+            params.append(int(weekday) % 7)
+        if not clauses:
+            return "", params
+        return " WHERE " + " AND ".join(clauses), params
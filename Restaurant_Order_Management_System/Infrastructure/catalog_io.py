@@ -0,0 +1,127 @@
+import csv
+import json
+import os
+
+MENU_FIELDS = ["product_name", "cost", "shortcuts", "color", "shape", "position", "product_type"]
+TABLE_FIELDS = ["table_name", "position"]
+FILE_FILTER = "CSV (*.csv);;JSON Lines (*.jsonl *.ndjson)"
+
+
+class ImportReport:
+    def __init__(self, max_errors=20):
+        self.imported = 0
+        self.rejected = 0
+        self.errors = []
+        self.cancelled = False
+        self.max_errors = max_errors
+
+    @property
+    def processed(self):
+        return self.imported + self.rejected
+
+    def add_error(self, line_number, message):
+        self.rejected += 1
+        # Only the first errors are kept, so a bad file cannot grow memory
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line_number, message))
+
+    def summary(self):
+        lines = [f"Imported: {self.imported}", f"Rejected: {self.rejected}"]
+        if self.cancelled:
+            lines.append("Import cancelled; earlier batches were kept.")
+        for line_number, message in self.errors:
+            lines.append(f"Line {line_number}: {message}")
+        if self.rejected > len(self.errors):
+            lines.append(f"... and {self.rejected - len(self.errors)} more")
+        return "\n".join(lines)
+
+
+def file_format(path):
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in {".jsonl", ".ndjson"}:
+        return "jsonl"
+    raise ValueError(f"Unsupported file type: {extension or path}")
+
+
+def read_records(path):
+    """Yield (line_number, record, error) one row at a time from a CSV or JSON Lines file."""
+    if file_format(path) == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record, None
+        return
+
+    with open(path, encoding="utf-8-sig") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as error:
+                yield line_number, None, f"Invalid JSON: {error.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Each line must be a JSON object."
+                continue
+            yield line_number, record, None
+
+
+def import_records(path, validate, write_batch, batch_size=500, progress=None):
+    """Validate rows from path and hand them to write_batch in batches.
+
+    validate(record) returns (True, row) or (False, message).
+    progress(processed) may return False to stop after the current batch.
+    """
+    report = ImportReport()
+    batch = []
+    for line_number, record, error in read_records(path):
+        if error is None:
+            ok, row_or_error = validate(record)
+            if ok:
+                batch.append(row_or_error)
+            else:
+                error = row_or_error
+        if error is not None:
+            report.add_error(line_number, error)
+        if len(batch) >= batch_size:
+            write_batch(batch)
+            report.imported += len(batch)
+            batch = []
+            if progress is not None and progress(report.processed) is False:
+                report.cancelled = True
+                return report
+    if batch:
+        write_batch(batch)
+        report.imported += len(batch)
+    if progress is not None:
+        progress(report.processed)
+    return report
+
+
+def write_records(path, fields, records, progress=None, progress_every=500):
+    """Stream dict records to a CSV or JSON Lines file. Returns the number written."""
+    output_format = file_format(path)
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        if output_format == "csv":
+            writer = csv.DictWriter(handle, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+        for record in records:
+            if output_format == "csv":
+                writer.writerow({
+                    field: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+                    for field, value in record.items()
+                })
+            else:
+                handle.write(json.dumps({field: record.get(field) for field in fields}, ensure_ascii=False))
+                handle.write("\n")
+            count += 1
+            if progress is not None and count % progress_every == 0:
+                progress(count)
+    if progress is not None:
+        progress(count)
+    return count
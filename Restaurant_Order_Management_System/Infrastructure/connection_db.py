@@ -1,4 +1,41 @@
-﻿import sqlite3 as sql
+﻿import re
+import sqlite3 as sql
+from Infrastructure.connection_manager import get_connection
+from Infrastructure.migrations import catalog_version, create_menu_table, create_orders_table, create_tables_table, ensure_table, has_order_search_index
+from Infrastructure.order_events import CREATED, DELETED, UPDATED, order_events
+
+
+def iter_by_position(conn, table, columns, batch_size):
+    """Yield the rows of table ordered by (position, id), batch_size rows per query.
+
+    columns must start with id and include position. Each batch is a
+    short query on a cursor of its own, closed before its rows are
+    yielded. No statement or transaction stays open on the shared
+    connection while the caller works, and stopping early leaves the
+    connection as it was.
+    """
+    position_index = columns.index("position")
+    select_sql = f"SELECT {', '.join(columns)} FROM {table}"
+    last_key = None
+    while True:
+        cursor = conn.cursor()
+        try:
+            if last_key is None:
+                cursor.execute(f"{select_sql} ORDER BY position ASC, id ASC LIMIT ?", (batch_size,))
+            else:
+                cursor.execute(
+                    f"{select_sql} WHERE (position, id) > (?, ?) ORDER BY position ASC, id ASC LIMIT ?",
+                    last_key + (batch_size,),
+                )
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        last_key = (rows[-1][position_index], rows[-1][0])
+
+
 class Database():
     def __init__(self, database, table):
         if not database.endswith(".db"):
@@ -8,10 +45,10 @@ class Database():
 
         self.database = database
         self.table = table
-        self.create_database()
+        ensure_table(self.database, self.table, create_orders_table)
 
     def connect(self):
-        return sql.connect(self.database)
+        return get_connection(self.database)
 
     def _base_select_query(self):
         if self.table == "orders":
@@ -23,31 +60,7 @@ class Database():
         
     def create_database(self):
         with self.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.table} (
-                    id TEXT PRIMARY KEY,
-                    created_at TEXT NOT NULL,
-                    closed_at TEXT NOT NULL,
-                    service_date TEXT,
-                    sent_status INTEGER NOT NULL DEFAULT 0,
-                    name TEXT,
-                    table_name TEXT,
-                    status TEXT NOT NULL,
-                    to_go INTEGER NOT NULL,
-                    amount_paid REAL NOT NULL,
-                    total_amount REAL NOT NULL
-                )
-            """)
-            self._ensure_column(conn, "service_date", "TEXT")
-            self._ensure_column(conn, "sent_status", "INTEGER NOT NULL DEFAULT 0")
-    
-    def _ensure_column(self, conn, column_name, column_type):
-        cursor = conn.cursor()
-        cursor.execute(f"PRAGMA table_info({self.table})")
-        existing = {row[1] for row in cursor.fetchall()}
-        if column_name not in existing:
-            cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN {column_name} {column_type}")
+            create_orders_table(conn, self.table)
 
     def insert(self, id, created_at, closed_at, name, table_name, status, to_go, amount_paid, total_amount, service_date=None):
         with self.connect() as conn:
@@ -56,6 +69,7 @@ class Database():
                 f"INSERT INTO {self.table} (id, created_at, closed_at, service_date, name, table_name, status, to_go, amount_paid, total_amount) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
                 (id, created_at, closed_at, service_date, name, table_name, status, to_go, amount_paid, total_amount)
             )
+        self._publish(CREATED, [id])
 
     def fetch_all(self):
         with self.connect() as conn:
@@ -72,6 +86,7 @@ class Database():
                 f"DELETE FROM {self.table} WHERE id = ?",
                 (row_id,)
             )
+        self._publish(DELETED, [row_id])
 
     def edit_by_id(self, id, created_at, closed_at, name, table_name, status, to_go, amount_paid, total_amount, service_date=None):
         with self.connect() as conn:
@@ -93,19 +108,75 @@ class Database():
                 """, 
                 (created_at, closed_at, service_date, name, table_name, status, to_go, amount_paid, total_amount, id)
             )
+        self._publish(UPDATED, [id])
 
     def set_table(self, table_name): 
         if not table_name.isidentifier(): 
             raise ValueError("Invalid table") 
         self.table = table_name 
-        self.create_table()
+        ensure_table(self.database, self.table, create_orders_table)
+
+
+    def fetch_page(self, after_id=None, limit=200):
+        return self.search_page({}, after_id, limit)
 
+    def count(self):
+        return self.search_count({})
 
     def search(self, filters):
+        where_sql, params = self._search_where(filters)
+        query = self._base_select_query() + where_sql + " ORDER BY id ASC"
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def search_page(self, filters, after_id=None, limit=200):
+        # Keyset pagination on the primary key, so every page is an index seek
+        where_sql, params = self._search_where(filters)
+        if after_id is not None:
+            where_sql += (" AND " if where_sql else " WHERE ") + "id > ?"
+            params.append(after_id)
+        query = self._base_select_query() + where_sql + " ORDER BY id ASC LIMIT ?"
+        params.append(int(limit))
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def search_by_ids(self, filters, ids):
+        """Rows among ids that still match filters, for patching a loaded page."""
+        if not ids:
+            return []
+        where_sql, params = self._search_where(filters)
+        placeholders = ",".join("?" for _ in ids)
+        where_sql += (" AND " if where_sql else " WHERE ") + f"id IN ({placeholders})"
+        params.extend(ids)
+        query = self._base_select_query() + where_sql + " ORDER BY id ASC"
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def search_count(self, filters):
+        where_sql, params = self._search_where(filters)
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM {self.table}" + where_sql, params)
+            return int(cursor.fetchone()[0] or 0)
+
+    def _search_where(self, filters):
         where_clauses = []
         params = []
         numeric_columns = {"total_amount", "amount_paid"}
+        prefix_columns = {"id", "created_at", "closed_at", "service_date"}
+        full_text_columns = {"name", "additional_notes", "products"}
         allowed_ops = {"=", ">", "<"}
+        search_orders = self.table == "orders"
+        full_text_terms = []
 
         for column, value in filters.items():
             if column.endswith("_op"):
@@ -126,23 +197,79 @@ class Database():
                     numeric_value = float(value_text)
                 except ValueError:
                     continue
-                where_clauses.append(f"CAST({column} AS REAL) {operator} ?")
+                # REAL columns, compared directly so their indexes apply
+                where_clauses.append(f"{column} {operator} ?")
                 params.append(numeric_value)
+            elif search_orders and column in prefix_columns:
+                clause, clause_params = self._prefix_clause(column, value_text)
+                where_clauses.append(clause)
+                params.extend(clause_params)
+            elif search_orders and column == "to_go":
+                flag = self._to_go_flag(value_text)
+                if flag is None:
+                    continue
+                where_clauses.append("to_go = ?")
+                params.append(flag)
+            elif search_orders and column in full_text_columns:
+                term = self._full_text_term(column, value_text)
+                if term is not None and self._has_search_index():
+                    full_text_terms.append(term)
+                elif column == "products":
+                    where_clauses.append(
+                        "id IN (SELECT d.order_id FROM order_dishes d JOIN order_items i ON i.dish_id = d.id "
+                        "WHERE i.name LIKE ? OR i.display_name LIKE ?)"
+                    )
+                    params.extend([f"%{value_text}%", f"%{value_text}%"])
+                else:
+                    where_clauses.append(f"{column} LIKE ?")
+                    params.append(f"%{value_text}%")
             else:
                 where_clauses.append(f"{column} LIKE ?")
                 params.append(f"%{value_text}%")
 
-        query = self._base_select_query()
-
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-
-        query += " ORDER BY id ASC"
-
-        with self.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall()
+        if full_text_terms:
+            where_clauses.append(
+                "id IN (SELECT k.order_id FROM orders_fts JOIN order_search_keys k ON k.key = orders_fts.rowid "
+                "WHERE orders_fts MATCH ?)"
+            )
+            params.append(" AND ".join(full_text_terms))
+
+        if not where_clauses:
+            return "", params
+        return " WHERE " + " AND ".join(where_clauses), params
+
+    def _prefix_clause(self, column, prefix):
+        # A range on the column instead of LIKE, so its index can serve it
+        prefixes = [prefix]
+        if prefix.upper() != prefix:
+            prefixes.append(prefix.upper())
+        clauses = []
+        params = []
+        for value in prefixes:
+            clauses.append(f"({column} >= ? AND {column} < ?)")
+            params.extend([value, value[:-1] + chr(ord(value[-1]) + 1)])
+        return "(" + " OR ".join(clauses) + ")", params
+
+    def _to_go_flag(self, value_text):
+        value_text = value_text.lower()
+        if value_text in {"yes", "si", "sí", "true", "1"}:
+            return 1
+        if value_text in {"no", "false", "0"}:
+            return 0
+        return None
+
+    def _full_text_term(self, column, value_text):
+        # Every word must start a word of the column, e.g. "tac pas" finds "Taco al pastor"
+        words = re.findall(r"\w+", value_text)
+        if not words:
+            return None
+        phrases = " AND ".join('"' + word.replace('"', '""') + '"*' for word in words)
+        return f"{column} : ({phrases})"
+
+    def _has_search_index(self):
+        if not hasattr(self, "_search_index_available"):
+            self._search_index_available = has_order_search_index(self.connect())
+        return self._search_index_available
         
     def delete_many_by_ids(self, ids):
         placeholders = ",".join("?" for _ in ids)
@@ -151,6 +278,7 @@ class Database():
         with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(query, ids)
+        self._publish(DELETED, ids)
 
     def bulk_update(self, ids, updates):
         set_clause = ", ".join(f"{col} = ?" for col in updates.keys())
@@ -167,6 +295,12 @@ class Database():
         with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(query, values)
+        self._publish(UPDATED, ids)
+
+    def _publish(self, change_type, ids):
+        # Only the orders table backs the order views
+        if self.table == "orders":
+            order_events.publish(self.database, change_type, ids, self)
 
 
 class MenuDatabase():
@@ -177,87 +311,14 @@ class MenuDatabase():
             raise ValueError("Invalid table name")
         self.database = database
         self.table = table
-        self.create_database()
+        ensure_table(self.database, self.table, create_menu_table)
 
     def connect(self):
-        return sql.connect(self.database)
+        return get_connection(self.database)
 
     def create_database(self):
         with self.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-                (self.table,),
-            )
-            exists = cursor.fetchone() is not None
-
-            if not exists:
-                self._create_menu_schema(conn)
-                return
-
-            cursor.execute(f"PRAGMA table_info({self.table})")
-            existing_columns = {row[1] for row in cursor.fetchall()}
-            if "product_name" not in existing_columns:
-                backup_name = f"{self.table}_legacy"
-                cursor.execute(f"DROP TABLE IF EXISTS {backup_name}")
-                cursor.execute(f"ALTER TABLE {self.table} RENAME TO {backup_name}")
-                self._create_menu_schema(conn)
-                self._migrate_legacy_menu_data(conn, backup_name)
-                return
-
-            if "is_active" not in existing_columns:
-                cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1")
-            if "product_type" not in existing_columns:
-                cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN product_type TEXT NOT NULL DEFAULT 'Food'")
-            if "created_at" not in existing_columns:
-                cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN created_at TEXT")
-                cursor.execute(
-                    f"UPDATE {self.table} "
-                    "SET created_at = datetime('now', 'localtime') "
-                    "WHERE created_at IS NULL"
-                )
-
-    def _create_menu_schema(self, conn):
-        cursor = conn.cursor()
-        cursor.execute(
-            f"""
-            CREATE TABLE IF NOT EXISTS {self.table} (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                product_name TEXT NOT NULL,
-                cost REAL NOT NULL DEFAULT 0,
-                shortcuts TEXT NOT NULL DEFAULT '',
-                color TEXT NOT NULL DEFAULT '',
-                shape TEXT NOT NULL DEFAULT '',
-                position INTEGER NOT NULL DEFAULT 0,
-                product_type TEXT NOT NULL DEFAULT 'Food',
-                is_active INTEGER NOT NULL DEFAULT 1,
-                created_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
-            )
-            """
-        )
-
-    def _migrate_legacy_menu_data(self, conn, backup_name):
-        cursor = conn.cursor()
-        cursor.execute(f"PRAGMA table_info({backup_name})")
-        columns = {row[1] for row in cursor.fetchall()}
-        if "name" not in columns:
-            return
-        cursor.execute(
-            f"""
-            INSERT INTO {self.table} (product_name, cost, shortcuts, color, shape, position, product_type, is_active)
-            SELECT
-                COALESCE(name, ''),
-                0,
-                '',
-                '',
-                '',
-                0,
-                'Food',
-                1
-            FROM {backup_name}
-            WHERE COALESCE(name, '') != ''
-            """
-        )
+            create_menu_table(conn, self.table)
 
     def insert(self, product_name, cost, shortcuts, color, shape, position, product_type):
         with self.connect() as conn:
@@ -313,6 +374,82 @@ class MenuDatabase():
                 (product_name, cost, shortcuts, color, shape, position, product_type, row_id),
             )
 
+    def insert_many(self, rows):
+        """rows: (product_name, cost, shortcuts, color, shape, position, product_type)."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"""
+                INSERT INTO {self.table}
+                (product_name, cost, shortcuts, color, shape, position, product_type, is_active)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                """,
+                [tuple(row) for row in rows],
+            )
+
+    def catalog_version(self):
+        """Bumped by triggers on every change to the menu; None for other tables."""
+        return catalog_version(self.connect(), self.table)
+
+    def iter_rows(self, batch_size=500):
+        """Same columns and order as fetch_all, read batch_size rows at a time."""
+        columns = (
+            "id", "product_name", "cost", "shortcuts", "color", "shape", "position", "product_type", "is_active",
+            "created_at",
+        )
+        return iter_by_position(self.connect(), self.table, columns, batch_size)
+
+    def delete_many(self, row_ids):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE id = ?",
+                [(row_id,) for row_id in row_ids],
+            )
+
+    def update_many(self, rows):
+        """rows: (row_id, product_name, cost, shortcuts, color, shape, position, product_type)."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"""
+                UPDATE {self.table}
+                SET product_name = ?, cost = ?, shortcuts = ?, color = ?, shape = ?, position = ?, product_type = ?
+                WHERE id = ?
+                """,
+                [tuple(row[1:]) + (row[0],) for row in rows],
+            )
+
+    def upsert_many(self, rows):
+        """Same rows as update_many; a row_id of None inserts a new product."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"""
+                INSERT INTO {self.table}
+                (id, product_name, cost, shortcuts, color, shape, position, product_type, is_active)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT(id) DO UPDATE SET
+                    product_name = excluded.product_name,
+                    cost = excluded.cost,
+                    shortcuts = excluded.shortcuts,
+                    color = excluded.color,
+                    shape = excluded.shape,
+                    position = excluded.position,
+                    product_type = excluded.product_type
+                """,
+                [tuple(row) for row in rows],
+            )
+
+    def update_positions(self, positions):
+        """positions: (row_id, position) pairs, written in one transaction."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"UPDATE {self.table} SET position = ? WHERE id = ?",
+                [(position, row_id) for row_id, position in positions],
+            )
+
 
 class TablesDatabase():
     def __init__(self, database, table, seed_from_orders=False):
@@ -323,38 +460,17 @@ class TablesDatabase():
         self.database = database
         self.table = table
         self.seed_from_orders = bool(seed_from_orders)
-        self.create_database()
+        ensure_table(self.database, self.table, create_tables_table)
+        if self.seed_from_orders:
+            with self.connect() as conn:
+                self._seed_from_orders(conn)
 
     def connect(self):
-        return sql.connect(self.database)
+        return get_connection(self.database)
 
     def create_database(self):
         with self.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                f"""
-                CREATE TABLE IF NOT EXISTS {self.table} (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    table_name TEXT NOT NULL UNIQUE,
-                    position INTEGER NOT NULL DEFAULT 0,
-                    is_active INTEGER NOT NULL DEFAULT 1,
-                    created_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
-                )
-                """
-            )
-            cursor.execute(f"PRAGMA table_info({self.table})")
-            existing_columns = {row[1] for row in cursor.fetchall()}
-            if "position" not in existing_columns:
-                cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN position INTEGER NOT NULL DEFAULT 0")
-            if "is_active" not in existing_columns:
-                cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1")
-            if "created_at" not in existing_columns:
-                cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN created_at TEXT")
-                cursor.execute(
-                    f"UPDATE {self.table} "
-                    "SET created_at = datetime('now', 'localtime') "
-                    "WHERE created_at IS NULL"
-                )
+            create_tables_table(conn, self.table)
             if self.seed_from_orders:
                 self._seed_from_orders(conn)
 
@@ -430,3 +546,64 @@ class TablesDatabase():
                 (table_name, position, row_id),
             )
 
+    def insert_many(self, rows):
+        """rows: (table_name, position). Existing table names keep their id and take the new position."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"""
+                INSERT INTO {self.table}
+                (table_name, position, is_active)
+                VALUES (?, ?, 1)
+                ON CONFLICT(table_name) DO UPDATE SET position = excluded.position
+                """,
+                [tuple(row) for row in rows],
+            )
+
+    def iter_rows(self, batch_size=500):
+        """Same columns and order as fetch_all, read batch_size rows at a time."""
+        columns = ("id", "table_name", "position", "is_active", "created_at")
+        return iter_by_position(self.connect(), self.table, columns, batch_size)
+
+    def delete_many(self, row_ids):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE id = ?",
+                [(row_id,) for row_id in row_ids],
+            )
+
+    def update_many(self, rows):
+        """rows: (row_id, table_name, position)."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"UPDATE {self.table} SET table_name = ?, position = ? WHERE id = ?",
+                [(table_name, position, row_id) for row_id, table_name, position in rows],
+            )
+
+    def upsert_many(self, rows):
+        """Same rows as update_many; a row_id of None inserts a new table."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"""
+                INSERT INTO {self.table}
+                (id, table_name, position, is_active)
+                VALUES (?, ?, ?, 1)
+                ON CONFLICT(id) DO UPDATE SET
+                    table_name = excluded.table_name,
+                    position = excluded.position
+                """,
+                [tuple(row) for row in rows],
+            )
+
+    def update_positions(self, positions):
+        """positions: (row_id, position) pairs, written in one transaction."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                f"UPDATE {self.table} SET position = ? WHERE id = ?",
+                [(position, row_id) for row_id, position in positions],
+            )
+
@@ -0,0 +1,80 @@
+import atexit
+import os
+import sqlite3 as sql
+import threading
+
+from Infrastructure.sql_tracer import sql_tracer
+
+
+class ConnectionManager():
+    """Hands out one long-lived connection per database file and thread."""
+
+    def __init__(self, journal_mode="WAL", synchronous="NORMAL", busy_timeout_ms=5000):
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open_connections = []
+
+    def connection(self, database):
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = {}
+            self._local.connections = connections
+        key = self._key(database)
+        conn = connections.get(key)
+        if conn is None:
+            conn = self._open(database)
+            connections[key] = conn
+            with self._lock:
+                self._open_connections.append(conn)
+        return conn
+
+    def close_thread_connections(self):
+        connections = getattr(self._local, "connections", None) or {}
+        for conn in connections.values():
+            self._close(conn)
+        self._local.connections = {}
+
+    def close_all(self):
+        with self._lock:
+            open_connections = list(self._open_connections)
+        for conn in open_connections:
+            self._close(conn)
+
+    def _open(self, database):
+        # check_same_thread is off only so close_all can run at exit;
+        # each thread still gets its own connection.
+        conn = sql_tracer.connect(
+            database,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _close(self, conn):
+        with self._lock:
+            if conn in self._open_connections:
+                self._open_connections.remove(conn)
+        try:
+            conn.close()
+        except sql.Error:
+            pass
+
+    def _key(self, database):
+        if database == ":memory:":
+            return database
+        return os.path.abspath(database)
+
+
+connection_manager = ConnectionManager()
+atexit.register(connection_manager.close_all)
+
+
+def get_connection(database):
+    return connection_manager.connection(database)
@@ -0,0 +1,1104 @@
+import os
+import sqlite3
+import threading
+from Infrastructure.connection_manager import get_connection
+
+
+def create_orders_table(conn, table="orders"):
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            closed_at TEXT NOT NULL,
+            service_date TEXT,
+            in_progress INTEGER NOT NULL DEFAULT 0,
+            sent_status INTEGER NOT NULL DEFAULT 0,
+            name TEXT,
+            table_name TEXT,
+            status TEXT NOT NULL,
+            to_go INTEGER NOT NULL,
+            additional_notes TEXT NOT NULL DEFAULT '',
+            include_additional_notes_in_ticket INTEGER NOT NULL DEFAULT 0,
+            amount_paid REAL NOT NULL,
+            total_amount REAL NOT NULL
+        )
+        """
+    )
+    _ensure_column(conn, table, "service_date", "TEXT")
+    _ensure_column(conn, table, "in_progress", "INTEGER NOT NULL DEFAULT 0")
+    _ensure_column(conn, table, "sent_status", "INTEGER NOT NULL DEFAULT 0")
+    _ensure_column(conn, table, "additional_notes", "TEXT NOT NULL DEFAULT ''")
+    _ensure_column(conn, table, "include_additional_notes_in_ticket", "INTEGER NOT NULL DEFAULT 0")
+
+
+def create_order_detail_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS order_dishes (
+            id TEXT PRIMARY KEY,
+            order_id TEXT NOT NULL,
+            display_name TEXT,
+            status TEXT NOT NULL,
+            sent_count INTEGER NOT NULL,
+            to_go INTEGER NOT NULL,
+            total_amount REAL NOT NULL,
+            FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS order_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dish_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            display_name TEXT,
+            price REAL NOT NULL,
+            quantity INTEGER NOT NULL,
+            notes TEXT,
+            is_custom INTEGER NOT NULL,
+            FOREIGN KEY(dish_id) REFERENCES order_dishes(id) ON DELETE CASCADE
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS order_counter_state (
+            key TEXT PRIMARY KEY,
+            last_order_id TEXT
+        )
+        """
+    )
+
+
+def create_menu_table(conn, table="menu"):
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+        (table,),
+    )
+    exists = cursor.fetchone() is not None
+
+    if not exists:
+        _create_menu_schema(conn, table)
+        return
+
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    if "product_name" not in existing_columns:
+        backup_name = f"{table}_legacy"
+        cursor.execute(f"DROP TABLE IF EXISTS {backup_name}")
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {backup_name}")
+        _create_menu_schema(conn, table)
+        _migrate_legacy_menu_data(conn, table, backup_name)
+        return
+
+    if "is_active" not in existing_columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1")
+    if "product_type" not in existing_columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN product_type TEXT NOT NULL DEFAULT 'Food'")
+    if "created_at" not in existing_columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN created_at TEXT")
+        cursor.execute(
+            f"UPDATE {table} "
+            "SET created_at = datetime('now', 'localtime') "
+            "WHERE created_at IS NULL"
+        )
+
+
+def _create_menu_schema(conn, table):
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_name TEXT NOT NULL,
+            cost REAL NOT NULL DEFAULT 0,
+            shortcuts TEXT NOT NULL DEFAULT '',
+            color TEXT NOT NULL DEFAULT '',
+            shape TEXT NOT NULL DEFAULT '',
+            position INTEGER NOT NULL DEFAULT 0,
+            product_type TEXT NOT NULL DEFAULT 'Food',
+            is_active INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+        """
+    )
+
+
+def _migrate_legacy_menu_data(conn, table, backup_name):
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA table_info({backup_name})")
+    columns = {row[1] for row in cursor.fetchall()}
+    if "name" not in columns:
+        return
+    cursor.execute(
+        f"""
+        INSERT INTO {table} (product_name, cost, shortcuts, color, shape, position, product_type, is_active)
+        SELECT
+            COALESCE(name, ''),
+            0,
+            '',
+            '',
+            '',
+            0,
+            'Food',
+            1
+        FROM {backup_name}
+        WHERE COALESCE(name, '') != ''
+        """
+    )
+
+
+def create_tables_table(conn, table="tables"):
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL UNIQUE,
+            position INTEGER NOT NULL DEFAULT 0,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+        """
+    )
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    if "position" not in existing_columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN position INTEGER NOT NULL DEFAULT 0")
+    if "is_active" not in existing_columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1")
+    if "created_at" not in existing_columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN created_at TEXT")
+        cursor.execute(
+            f"UPDATE {table} "
+            "SET created_at = datetime('now', 'localtime') "
+            "WHERE created_at IS NULL"
+        )
+
+
+def _ensure_column(conn, table, column_name, column_type):
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+    if column_name not in existing:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column_name} {column_type}")
+
+
+def _baseline(conn):
+    # Idempotent, so databases created before user_version was tracked
+    # are brought up to the same shape as new ones.
+    create_orders_table(conn)
+    create_order_detail_tables(conn)
+    create_menu_table(conn)
+    create_tables_table(conn)
+
+
+def _hot_query_indexes(conn):
+    cursor = conn.cursor()
+    # Partial index: only open tickets are listed, and they are a tiny
+    # fraction of the history.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orders_open_created_at "
+        "ON orders(created_at) WHERE status != 'Closed'"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_service_date ON orders(service_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_table_name ON orders(TRIM(table_name))")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_dishes_order_id ON order_dishes(order_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_items_dish_id ON order_items(dish_id)")
+    cursor.execute("ANALYZE")
+
+
+# Day an order counts for: its service date, else the day it was created or closed
+ORDER_DAY_SQL = (
+    "COALESCE(date(NULLIF(substr({o}.service_date, 1, 10), '')), "
+    "date(substr({o}.created_at, 1, 10)), date(substr({o}.closed_at, 1, 10)))"
+)
+ORDER_REVENUE_SQL = (
+    "CASE WHEN COALESCE({o}.amount_paid, 0) > 0 THEN {o}.amount_paid "
+    "ELSE COALESCE({o}.total_amount, 0) END"
+)
+ORDER_HOUR_SQL = (
+    "CASE WHEN substr({o}.created_at, 11, 1) IN ('T', ' ') "
+    "THEN CAST(substr({o}.created_at, 12, 2) AS INTEGER) END"
+)
+
+
+def _daily_rollup_statements(o, sign):
+    """Add (sign 1) or remove (sign -1) the contribution of order row o."""
+    day = ORDER_DAY_SQL.format(o=o)
+    return [
+        f"""
+        INSERT INTO daily_revenue (service_date, revenue, paid, order_count, closed_count, to_go_count)
+        SELECT day, {sign} * revenue, {sign} * paid, {sign}, {sign} * closed, {sign} * to_go
+        FROM (
+            SELECT
+                {day} AS day,
+                {ORDER_REVENUE_SQL.format(o=o)} AS revenue,
+                COALESCE({o}.amount_paid, 0) AS paid,
+                lower(trim({o}.status)) = 'closed' AS closed,
+                lower(CAST({o}.to_go AS TEXT)) IN ('1', 'true', 'yes') AS to_go
+        )
+        WHERE day IS NOT NULL
+        ON CONFLICT(service_date) DO UPDATE SET
+            revenue = revenue + excluded.revenue,
+            paid = paid + excluded.paid,
+            order_count = order_count + excluded.order_count,
+            closed_count = closed_count + excluded.closed_count,
+            to_go_count = to_go_count + excluded.to_go_count;
+        """,
+        f"""
+        INSERT INTO daily_revenue_hours (service_date, hour, order_count)
+        SELECT day, hour, {sign}
+        FROM (SELECT {day} AS day, {ORDER_HOUR_SQL.format(o=o)} AS hour)
+        WHERE day IS NOT NULL AND hour BETWEEN 0 AND 23
+        ON CONFLICT(service_date, hour) DO UPDATE SET
+            order_count = order_count + excluded.order_count;
+        """,
+        f"""
+        INSERT INTO daily_table_usage (service_date, table_name, order_count)
+        SELECT day, table_name, {sign}
+        FROM (SELECT {day} AS day, trim(COALESCE({o}.table_name, '')) AS table_name)
+        WHERE day IS NOT NULL AND table_name != ''
+        ON CONFLICT(service_date, table_name) DO UPDATE SET
+            order_count = order_count + excluded.order_count;
+        """,
+    ]
+
+
+# Columns of an order row that its daily rollup contribution depends on
+DAILY_ROLLUP_COLUMNS = (
+    "created_at", "closed_at", "service_date", "status", "to_go", "table_name", "amount_paid", "total_amount",
+)
+
+
+def _columns_changed(columns):
+    """WHEN condition of an update trigger: any of columns really changed."""
+    return " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns)
+
+
+def _daily_revenue_rollup(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_revenue (
+            service_date TEXT PRIMARY KEY,
+            revenue REAL NOT NULL DEFAULT 0,
+            paid REAL NOT NULL DEFAULT 0,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            closed_count INTEGER NOT NULL DEFAULT 0,
+            to_go_count INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_revenue_hours (
+            service_date TEXT NOT NULL,
+            hour INTEGER NOT NULL,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (service_date, hour)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_table_usage (
+            service_date TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (service_date, table_name)
+        )
+        """
+    )
+    _backfill_daily_rollup(conn)
+
+    watched_columns = ", ".join(DAILY_ROLLUP_COLUMNS)
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS orders_daily_rollup_insert AFTER INSERT ON orders BEGIN "
+        + "".join(_daily_rollup_statements("NEW", 1))
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS orders_daily_rollup_delete AFTER DELETE ON orders BEGIN "
+        + "".join(_daily_rollup_statements("OLD", -1))
+        + " END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS orders_daily_rollup_update AFTER UPDATE OF {watched_columns} ON orders BEGIN "
+        + "".join(_daily_rollup_statements("OLD", -1))
+        + "".join(_daily_rollup_statements("NEW", 1))
+        + " END"
+    )
+
+
+def _backfill_daily_rollup(conn):
+    cursor = conn.cursor()
+    day = ORDER_DAY_SQL.format(o="orders")
+    cursor.execute(
+        f"""
+        INSERT OR IGNORE INTO daily_revenue (service_date, revenue, paid, order_count, closed_count, to_go_count)
+        SELECT day, SUM(revenue), SUM(paid), COUNT(*), SUM(closed), SUM(to_go)
+        FROM (
+            SELECT
+                {day} AS day,
+                {ORDER_REVENUE_SQL.format(o="orders")} AS revenue,
+                COALESCE(amount_paid, 0) AS paid,
+                lower(trim(status)) = 'closed' AS closed,
+                lower(CAST(to_go AS TEXT)) IN ('1', 'true', 'yes') AS to_go
+            FROM orders
+        )
+        WHERE day IS NOT NULL
+        GROUP BY day
+        """
+    )
+    cursor.execute(
+        f"""
+        INSERT OR IGNORE INTO daily_revenue_hours (service_date, hour, order_count)
+        SELECT day, hour, COUNT(*)
+        FROM (SELECT {day} AS day, {ORDER_HOUR_SQL.format(o="orders")} AS hour FROM orders)
+        WHERE day IS NOT NULL AND hour BETWEEN 0 AND 23
+        GROUP BY day, hour
+        """
+    )
+    cursor.execute(
+        f"""
+        INSERT OR IGNORE INTO daily_table_usage (service_date, table_name, order_count)
+        SELECT day, table_name, COUNT(*)
+        FROM (SELECT {day} AS day, trim(COALESCE(table_name, '')) AS table_name FROM orders)
+        WHERE day IS NOT NULL AND table_name != ''
+        GROUP BY day, table_name
+        """
+    )
+
+
+# Menu type of an order item at the time it is written; '' when it is not on the menu
+PRODUCT_TYPE_SQL = (
+    "COALESCE((SELECT CASE WHEN lower(trim(m.product_type)) IN ('food', 'drink', 'comida', 'bebida') "
+    "THEN lower(trim(m.product_type)) ELSE 'food' END "
+    "FROM menu m WHERE lower(trim(m.product_name)) = lower(trim({item}.name)) "
+    "ORDER BY m.position DESC, m.id DESC LIMIT 1), '')"
+)
+PRODUCT_NAME_SQL = "trim(COALESCE({item}.display_name, {item}.name, ''))"
+
+
+def _product_sales_statement(item, sign, join_sql, type_sql=None, backfill=False):
+    """Add or remove item rows (alias i, or a NEW/OLD row) for the orders reached by join_sql.
+
+    type_sql is the product type to count them under; by default it is
+    looked up in the menu. A backfill leaves rows that already exist alone.
+    """
+    type_sql = type_sql or PRODUCT_TYPE_SQL.format(item=item)
+    conflict = "DO NOTHING" if backfill else "DO UPDATE SET quantity = quantity + excluded.quantity"
+    return f"""
+        INSERT INTO product_sales (service_date, product_name, product_type, quantity)
+        SELECT day, product_name, product_type, SUM(quantity)
+        FROM (
+            SELECT
+                {ORDER_DAY_SQL.format(o="o")} AS day,
+                {PRODUCT_NAME_SQL.format(item=item)} AS product_name,
+                {type_sql} AS product_type,
+                {sign} * MAX(COALESCE({item}.quantity, 0), 0) AS quantity
+            {join_sql}
+        )
+        WHERE day IS NOT NULL AND product_name != ''
+        GROUP BY day, product_name, product_type
+        ON CONFLICT(service_date, product_name, product_type) {conflict};
+    """
+
+
+def _product_sales_aggregate(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS product_sales (
+            service_date TEXT NOT NULL,
+            product_name TEXT NOT NULL,
+            product_type TEXT NOT NULL DEFAULT '',
+            quantity INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (service_date, product_name, product_type)
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_menu_product_name_key ON menu(lower(trim(product_name)))"
+    )
+    cursor.execute(
+        _product_sales_statement(
+            "i",
+            1,
+            "FROM order_items i JOIN order_dishes d ON d.id = i.dish_id JOIN orders o ON o.id = d.order_id",
+            backfill=True,
+        )
+    )
+    _create_product_sales_triggers(cursor, stored_types=False)
+
+
+PRODUCT_SALES_TRIGGERS = (
+    "order_items_product_sales_insert",
+    "order_items_product_sales_delete",
+    "order_items_product_sales_update",
+    "order_dishes_product_sales_delete",
+    "order_dishes_product_sales_move",
+    "orders_product_sales_delete",
+    "orders_product_sales_move",
+)
+
+
+def _create_product_sales_triggers(cursor, stored_types):
+    """Triggers that keep product_sales in step with orders, dishes and items.
+
+    With stored_types, items are counted under the product_type stored on
+    the item row instead of the menu type at the time of the write.
+    """
+
+    def item_type(item):
+        if stored_types:
+            return f"COALESCE({item}.product_type, '')"
+        return None
+
+    def item_row(row):
+        # A single NEW/OLD item, counted only while its dish and order still exist.
+        # Cascaded deletes are subtracted by the dish/order triggers instead.
+        return (
+            "FROM order_dishes d JOIN orders o ON o.id = d.order_id "
+            f"WHERE d.id = {row}.dish_id"
+        )
+
+    assign_type = ""
+    if stored_types:
+        # Items keep the menu type they were first written with; a renamed
+        # item takes the type of its new name
+        assign_type = (
+            f"UPDATE order_items SET product_type = {PRODUCT_TYPE_SQL.format(item='NEW')} "
+            "WHERE id = NEW.id AND {condition};"
+        )
+    # Read back after assign_type, which NEW does not reflect
+    new_type = None
+    if stored_types:
+        new_type = "(SELECT COALESCE(product_type, '') FROM order_items WHERE id = NEW.id)"
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_items_product_sales_insert AFTER INSERT ON order_items BEGIN "
+        + assign_type.format(condition="product_type IS NULL")
+        + _product_sales_statement("NEW", 1, item_row("NEW"), new_type)
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_items_product_sales_delete AFTER DELETE ON order_items BEGIN "
+        + _product_sales_statement("OLD", -1, item_row("OLD"), item_type("OLD"))
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_items_product_sales_update "
+        "AFTER UPDATE OF dish_id, name, display_name, quantity ON order_items "
+        "WHEN OLD.dish_id IS NOT NEW.dish_id OR OLD.name IS NOT NEW.name "
+        "OR OLD.display_name IS NOT NEW.display_name OR OLD.quantity IS NOT NEW.quantity BEGIN "
+        + _product_sales_statement("OLD", -1, item_row("OLD"), item_type("OLD"))
+        + assign_type.format(condition="lower(trim(OLD.name)) IS NOT lower(trim(NEW.name))")
+        + _product_sales_statement("NEW", 1, item_row("NEW"), new_type)
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_dishes_product_sales_delete BEFORE DELETE ON order_dishes BEGIN "
+        + _product_sales_statement(
+            "i",
+            -1,
+            "FROM order_items i JOIN orders o ON o.id = OLD.order_id WHERE i.dish_id = OLD.id",
+            item_type("i"),
+        )
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_dishes_product_sales_move "
+        "AFTER UPDATE OF order_id ON order_dishes WHEN OLD.order_id IS NOT NEW.order_id BEGIN "
+        + _product_sales_statement(
+            "i",
+            -1,
+            "FROM order_items i JOIN orders o ON o.id = OLD.order_id WHERE i.dish_id = OLD.id",
+            item_type("i"),
+        )
+        + _product_sales_statement(
+            "i",
+            1,
+            "FROM order_items i JOIN orders o ON o.id = NEW.order_id WHERE i.dish_id = NEW.id",
+            item_type("i"),
+        )
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS orders_product_sales_delete BEFORE DELETE ON orders BEGIN "
+        + _product_sales_statement(
+            "i",
+            -1,
+            "FROM order_items i JOIN order_dishes d ON d.id = i.dish_id "
+            "JOIN orders o ON o.id = d.order_id WHERE d.order_id = OLD.id",
+            item_type("i"),
+        )
+        + " END"
+    )
+    # The item rows are unchanged when an order moves to another day, so
+    # the old and new days come from OLD/NEW rather than from a join.
+    old_day = ORDER_DAY_SQL.format(o="OLD")
+    new_day = ORDER_DAY_SQL.format(o="NEW")
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS orders_product_sales_move "
+        "AFTER UPDATE OF service_date, created_at, closed_at ON orders "
+        f"WHEN {old_day} IS NOT {new_day} BEGIN "
+        + _product_sales_statement(
+            "i",
+            -1,
+            "FROM order_items i JOIN order_dishes d ON d.id = i.dish_id "
+            "JOIN (SELECT OLD.service_date AS service_date, OLD.created_at AS created_at, "
+            "OLD.closed_at AS closed_at) o WHERE d.order_id = OLD.id",
+            item_type("i"),
+        )
+        + _product_sales_statement(
+            "i",
+            1,
+            "FROM order_items i JOIN order_dishes d ON d.id = i.dish_id "
+            "JOIN orders o ON o.id = d.order_id WHERE d.order_id = NEW.id",
+            item_type("i"),
+        )
+        + " END"
+    )
+
+
+# Words an order item adds to the full-text index: its name, and its display name if different
+ORDER_ITEM_WORDS_SQL = (
+    "{item}.name || CASE WHEN COALESCE({item}.display_name, '') IN ('', {item}.name) "
+    "THEN '' ELSE ' ' || {item}.display_name END"
+)
+# Space-separated product names of an order, for the full-text index
+ORDER_PRODUCTS_SQL = (
+    f"COALESCE((SELECT group_concat({ORDER_ITEM_WORDS_SQL.format(item='i')}, ' ') "
+    "FROM order_dishes d JOIN order_items i ON i.dish_id = d.id WHERE d.order_id = {order_id}), '')"
+)
+
+
+def _refresh_order_products_statement(order_id, search_row=None):
+    search_row = search_row or f"(SELECT rowid FROM orders WHERE id = {order_id})"
+    return (
+        f"UPDATE orders_fts SET products = {ORDER_PRODUCTS_SQL.format(order_id=order_id)} "
+        f"WHERE rowid = {search_row};"
+    )
+
+
+# Row of orders_fts that indexes an order
+ORDER_SEARCH_KEY_SQL = "(SELECT key FROM order_search_keys WHERE order_id = {order_id})"
+
+
+def has_order_search_index(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'orders_fts'"
+    ).fetchone()
+    return row is not None
+
+
+def _order_search_index(conn):
+    cursor = conn.cursor()
+    # Range predicates of the Order Database search form
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_total_amount ON orders(total_amount)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_amount_paid ON orders(amount_paid)")
+    try:
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS orders_fts USING fts5(
+                name, table_name, additional_notes, products,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+            """
+        )
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5; Database.search falls back to LIKE
+        return
+
+    # Rows share the rowid of their order
+    cursor.execute(
+        f"""
+        INSERT INTO orders_fts (rowid, name, table_name, additional_notes, products)
+        SELECT o.rowid, COALESCE(o.name, ''), COALESCE(o.table_name, ''), COALESCE(o.additional_notes, ''),
+            {ORDER_PRODUCTS_SQL.format(order_id="o.id")}
+        FROM orders o
+        WHERE o.rowid NOT IN (SELECT rowid FROM orders_fts)
+        """
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS orders_fts_insert AFTER INSERT ON orders BEGIN
+            INSERT INTO orders_fts (rowid, name, table_name, additional_notes, products)
+            VALUES (
+                NEW.rowid, COALESCE(NEW.name, ''), COALESCE(NEW.table_name, ''),
+                COALESCE(NEW.additional_notes, ''), {ORDER_PRODUCTS_SQL.format(order_id="NEW.id")}
+            );
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS orders_fts_delete AFTER DELETE ON orders BEGIN
+            DELETE FROM orders_fts WHERE rowid = OLD.rowid;
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS orders_fts_update
+        AFTER UPDATE OF name, table_name, additional_notes ON orders BEGIN
+            UPDATE orders_fts SET
+                name = COALESCE(NEW.name, ''),
+                table_name = COALESCE(NEW.table_name, ''),
+                additional_notes = COALESCE(NEW.additional_notes, '')
+            WHERE rowid = NEW.rowid;
+        END
+        """
+    )
+    dish_order = "(SELECT order_id FROM order_dishes WHERE id = {row}.dish_id)"
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_items_fts_insert AFTER INSERT ON order_items BEGIN "
+        + _refresh_order_products_statement(dish_order.format(row="NEW"))
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_items_fts_delete AFTER DELETE ON order_items BEGIN "
+        + _refresh_order_products_statement(dish_order.format(row="OLD"))
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_items_fts_update "
+        "AFTER UPDATE OF dish_id, name, display_name ON order_items BEGIN "
+        + _refresh_order_products_statement(dish_order.format(row="OLD"))
+        + _refresh_order_products_statement(dish_order.format(row="NEW"))
+        + " END"
+    )
+    # Items removed by the cascade no longer reach their order, so the dish refreshes it
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_dishes_fts_delete AFTER DELETE ON order_dishes BEGIN "
+        + _refresh_order_products_statement("OLD.order_id")
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER IF NOT EXISTS order_dishes_fts_update "
+        "AFTER UPDATE OF order_id ON order_dishes WHEN OLD.order_id IS NOT NEW.order_id BEGIN "
+        + _refresh_order_products_statement("OLD.order_id")
+        + _refresh_order_products_statement("NEW.order_id")
+        + " END"
+    )
+
+
+def catalog_version(conn, name):
+    """Change counter of a catalogue table, or None when it is not tracked."""
+    row = conn.execute("SELECT version FROM catalog_versions WHERE name = ?", (name,)).fetchone()
+    return None if row is None else int(row[0])
+
+
+def _catalog_versions(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS catalog_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    cursor.execute("INSERT OR IGNORE INTO catalog_versions (name, version) VALUES ('menu', 0)")
+    # Every writer bumps the counter, including imports and other processes
+    bump = "UPDATE catalog_versions SET version = version + 1 WHERE name = 'menu';"
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS menu_catalog_version_{event.lower()} "
+            f"AFTER {event} ON menu BEGIN {bump} END"
+        )
+
+
+def _print_jobs(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS print_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL DEFAULT 0,
+            last_error TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL,
+            printed_at TEXT NOT NULL DEFAULT ''
+        )
+        """
+    )
+    # The printer thread polls for the next due job
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_print_jobs_due ON print_jobs(status, next_attempt_at, id)"
+    )
+
+
+# Folios are O<yyyymmdd><number>; the number is zero padded to four digits
+_FOLIO_GLOB = "O" + "[0-9]" * 12 + "*"
+
+
+def _order_sequences(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS order_sequences (
+            day TEXT PRIMARY KEY,
+            last_value INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    # Start every day after its highest folio, including deleted ones
+    cursor.execute(
+        f"""
+        INSERT INTO order_sequences (day, last_value)
+        SELECT day, MAX(last_value) FROM (
+            SELECT substr(id, 2, 8) AS day, CAST(substr(id, 10) AS INTEGER) AS last_value
+            FROM orders WHERE id GLOB '{_FOLIO_GLOB}'
+            UNION ALL
+            SELECT substr(last_order_id, 2, 8), CAST(substr(last_order_id, 10) AS INTEGER)
+            FROM order_counter_state
+            WHERE key = 'max_order_id' AND last_order_id GLOB '{_FOLIO_GLOB}'
+        )
+        GROUP BY day
+        """
+    )
+    # Folios written by anything other than next_order_number keep the sequence ahead
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS orders_sequence_insert
+        AFTER INSERT ON orders WHEN NEW.id GLOB '{_FOLIO_GLOB}' BEGIN
+            INSERT INTO order_sequences (day, last_value)
+            VALUES (substr(NEW.id, 2, 8), CAST(substr(NEW.id, 10) AS INTEGER))
+            ON CONFLICT(day) DO UPDATE SET last_value = MAX(last_value, excluded.last_value);
+        END
+        """
+    )
+
+
+def _order_versions(conn):
+    _ensure_column(conn, "orders", "version", "INTEGER NOT NULL DEFAULT 1")
+    cursor = conn.cursor()
+    # Writers that do not bump the version themselves still invalidate
+    # what other terminals loaded; no other trigger watches version
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS orders_version_bump
+        AFTER UPDATE ON orders WHEN NEW.version = OLD.version BEGIN
+            UPDATE orders SET version = OLD.version + 1 WHERE rowid = NEW.rowid;
+        END
+        """
+    )
+
+
+def _slow_queries(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS slow_queries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recorded_at TEXT NOT NULL,
+            duration_ms REAL NOT NULL,
+            rows INTEGER NOT NULL DEFAULT 0,
+            statement TEXT NOT NULL,
+            parameters TEXT NOT NULL DEFAULT '',
+            site TEXT NOT NULL DEFAULT '',
+            caller TEXT NOT NULL DEFAULT '',
+            thread TEXT NOT NULL DEFAULT '',
+            trace TEXT NOT NULL DEFAULT '',
+            query_plan TEXT NOT NULL DEFAULT ''
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_slow_queries_recorded_at ON slow_queries(recorded_at)"
+    )
+
+
+def _item_product_types(conn):
+    _ensure_column(conn, "order_items", "product_type", "TEXT")
+    cursor = conn.cursor()
+    # The menu is the best record left of what older items were sold as
+    cursor.execute(
+        f"UPDATE order_items SET product_type = {PRODUCT_TYPE_SQL.format(item='order_items')} "
+        "WHERE product_type IS NULL"
+    )
+    for trigger in PRODUCT_SALES_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    _create_product_sales_triggers(cursor, stored_types=True)
+    # Rows subtracted under a type other than the one they were added
+    # with left stray counts behind, so rebuild from the items
+    cursor.execute("DELETE FROM product_sales")
+    cursor.execute(
+        _product_sales_statement(
+            "i",
+            1,
+            "FROM order_items i JOIN order_dishes d ON d.id = i.dish_id JOIN orders o ON o.id = d.order_id",
+            "COALESCE(i.product_type, '')",
+        )
+    )
+
+
+def _narrow_order_triggers(conn):
+    cursor = conn.cursor()
+    # UPDATE OF fires for every column a statement sets, changed or not
+    watched_columns = ", ".join(DAILY_ROLLUP_COLUMNS)
+    cursor.execute("DROP TRIGGER IF EXISTS orders_daily_rollup_update")
+    cursor.execute(
+        f"CREATE TRIGGER orders_daily_rollup_update AFTER UPDATE OF {watched_columns} ON orders "
+        f"WHEN {_columns_changed(DAILY_ROLLUP_COLUMNS)} BEGIN "
+        + "".join(_daily_rollup_statements("OLD", -1))
+        + "".join(_daily_rollup_statements("NEW", 1))
+        + " END"
+    )
+    if not has_order_search_index(conn):
+        return
+    search_columns = ("name", "table_name", "additional_notes")
+    cursor.execute("DROP TRIGGER IF EXISTS orders_fts_update")
+    cursor.execute(
+        f"""
+        CREATE TRIGGER orders_fts_update
+        AFTER UPDATE OF {", ".join(search_columns)} ON orders WHEN {_columns_changed(search_columns)} BEGIN
+            UPDATE orders_fts SET
+                name = COALESCE(NEW.name, ''),
+                table_name = COALESCE(NEW.table_name, ''),
+                additional_notes = COALESCE(NEW.additional_notes, '')
+            WHERE rowid = NEW.rowid;
+        END
+        """
+    )
+    dish_order = "(SELECT order_id FROM order_dishes WHERE id = {row}.dish_id)"
+    # A new item only adds its own words, instead of rebuilding the order's list
+    cursor.execute("DROP TRIGGER IF EXISTS order_items_fts_insert")
+    cursor.execute(
+        f"""
+        CREATE TRIGGER order_items_fts_insert AFTER INSERT ON order_items BEGIN
+            UPDATE orders_fts SET products = trim(products || ' ' || {ORDER_ITEM_WORDS_SQL.format(item="NEW")})
+            WHERE rowid = (SELECT rowid FROM orders WHERE id = {dish_order.format(row="NEW")});
+        END
+        """
+    )
+    item_columns = ("dish_id", "name", "display_name")
+    cursor.execute("DROP TRIGGER IF EXISTS order_items_fts_update")
+    cursor.execute(
+        f"CREATE TRIGGER order_items_fts_update AFTER UPDATE OF {', '.join(item_columns)} ON order_items "
+        f"WHEN {_columns_changed(item_columns)} BEGIN "
+        + _refresh_order_products_statement(dish_order.format(row="OLD"))
+        + _refresh_order_products_statement(dish_order.format(row="NEW"))
+        + " END"
+    )
+
+
+ORDER_SEARCH_TRIGGERS = (
+    "orders_fts_insert",
+    "orders_fts_delete",
+    "orders_fts_update",
+    "order_items_fts_insert",
+    "order_items_fts_delete",
+    "order_items_fts_update",
+    "order_dishes_fts_delete",
+    "order_dishes_fts_update",
+)
+
+
+def _order_search_keys(conn):
+    if not has_order_search_index(conn):
+        return
+    cursor = conn.cursor()
+    # orders_fts was keyed by the implicit rowid of orders, which VACUUM may
+    # renumber because orders has a TEXT primary key. order_search_keys
+    # gives every order an INTEGER PRIMARY KEY that stays put instead.
+    for trigger in ORDER_SEARCH_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute("DROP TABLE IF EXISTS orders_fts")
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS order_search_keys (
+            key INTEGER PRIMARY KEY,
+            order_id TEXT NOT NULL UNIQUE
+        )
+        """
+    )
+    cursor.execute("INSERT OR IGNORE INTO order_search_keys (order_id) SELECT id FROM orders ORDER BY id")
+    cursor.execute(
+        """
+        CREATE VIRTUAL TABLE orders_fts USING fts5(
+            name, table_name, additional_notes, products,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO orders_fts (rowid, name, table_name, additional_notes, products)
+        SELECT k.key, COALESCE(o.name, ''), COALESCE(o.table_name, ''), COALESCE(o.additional_notes, ''),
+            {ORDER_PRODUCTS_SQL.format(order_id="o.id")}
+        FROM orders o JOIN order_search_keys k ON k.order_id = o.id
+        """
+    )
+
+    cursor.execute(
+        f"""
+        CREATE TRIGGER orders_fts_insert AFTER INSERT ON orders BEGIN
+            INSERT OR IGNORE INTO order_search_keys (order_id) VALUES (NEW.id);
+            INSERT INTO orders_fts (rowid, name, table_name, additional_notes, products)
+            VALUES (
+                {ORDER_SEARCH_KEY_SQL.format(order_id="NEW.id")}, COALESCE(NEW.name, ''),
+                COALESCE(NEW.table_name, ''), COALESCE(NEW.additional_notes, ''),
+                {ORDER_PRODUCTS_SQL.format(order_id="NEW.id")}
+            );
+        END
+        """
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER orders_fts_delete AFTER DELETE ON orders BEGIN
+            DELETE FROM orders_fts WHERE rowid = {ORDER_SEARCH_KEY_SQL.format(order_id="OLD.id")};
+            DELETE FROM order_search_keys WHERE order_id = OLD.id;
+        END
+        """
+    )
+    search_columns = ("name", "table_name", "additional_notes")
+    cursor.execute(
+        f"""
+        CREATE TRIGGER orders_fts_update
+        AFTER UPDATE OF {", ".join(search_columns)} ON orders WHEN {_columns_changed(search_columns)} BEGIN
+            UPDATE orders_fts SET
+                name = COALESCE(NEW.name, ''),
+                table_name = COALESCE(NEW.table_name, ''),
+                additional_notes = COALESCE(NEW.additional_notes, '')
+            WHERE rowid = {ORDER_SEARCH_KEY_SQL.format(order_id="NEW.id")};
+        END
+        """
+    )
+
+    def refresh(order_id):
+        return _refresh_order_products_statement(order_id, ORDER_SEARCH_KEY_SQL.format(order_id=order_id))
+
+    dish_order = "(SELECT order_id FROM order_dishes WHERE id = {row}.dish_id)"
+    new_order = dish_order.format(row="NEW")
+    cursor.execute(
+        f"""
+        CREATE TRIGGER order_items_fts_insert AFTER INSERT ON order_items BEGIN
+            UPDATE orders_fts SET products = trim(products || ' ' || {ORDER_ITEM_WORDS_SQL.format(item="NEW")})
+            WHERE rowid = {ORDER_SEARCH_KEY_SQL.format(order_id=new_order)};
+        END
+        """
+    )
+    cursor.execute(
+        "CREATE TRIGGER order_items_fts_delete AFTER DELETE ON order_items BEGIN "
+        + refresh(dish_order.format(row="OLD"))
+        + " END"
+    )
+    item_columns = ("dish_id", "name", "display_name")
+    cursor.execute(
+        f"CREATE TRIGGER order_items_fts_update AFTER UPDATE OF {', '.join(item_columns)} ON order_items "
+        f"WHEN {_columns_changed(item_columns)} BEGIN "
+        + refresh(dish_order.format(row="OLD"))
+        + refresh(new_order)
+        + " END"
+    )
+    # Items removed by the cascade no longer reach their order, so the dish refreshes it
+    cursor.execute(
+        "CREATE TRIGGER order_dishes_fts_delete AFTER DELETE ON order_dishes BEGIN "
+        + refresh("OLD.order_id")
+        + " END"
+    )
+    cursor.execute(
+        "CREATE TRIGGER order_dishes_fts_update "
+        "AFTER UPDATE OF order_id ON order_dishes WHEN OLD.order_id IS NOT NEW.order_id BEGIN "
+        + refresh("OLD.order_id")
+        + refresh("NEW.order_id")
+        + " END"
+    )
+
+
+# (version, description, function). Append only; never edit a released step.
+MIGRATIONS = [
+    (1, "baseline schema", _baseline),
+    (2, "indexes for open orders, order details and cascades", _hot_query_indexes),
+    (3, "daily revenue rollup maintained by triggers", _daily_revenue_rollup),
+    (4, "per-product sales aggregate maintained by triggers", _product_sales_aggregate),
+    (5, "full-text search index and range indexes for the order search", _order_search_index),
+    (6, "menu change counter for the catalogue cache", _catalog_versions),
+    (7, "spool table for the ticket print queue", _print_jobs),
+    (8, "per-day order number sequences", _order_sequences),
+    (9, "row versions for optimistic order updates", _order_versions),
+    (10, "slow statement log of the SQL tracer", _slow_queries),
+    (11, "product type stored on order items for the sales aggregate", _item_product_types),
+    (12, "skip order triggers when their columns did not change", _narrow_order_triggers),
+    (13, "stable integer keys for the order search index", _order_search_keys),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+_BASELINE_TABLES = {"orders", "menu", "tables"}
+_verified_databases = set()
+_verified_tables = set()
+_lock = threading.Lock()
+
+
+def schema_version(conn):
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def apply_migrations(conn, target_version=None):
+    target_version = LATEST_VERSION if target_version is None else target_version
+    current_version = schema_version(conn)
+    for version, _description, migrate in MIGRATIONS:
+        if version <= current_version or version > target_version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while this one waited for the lock
+            current_version = schema_version(conn)
+            if version <= current_version:
+                conn.commit()
+                continue
+            migrate(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current_version = version
+    return current_version
+
+
+def ensure_schema(database):
+    """Migrate database to the latest version once per process."""
+    key = _database_key(database)
+    if key in _verified_databases:
+        return
+    with _lock:
+        if key in _verified_databases:
+            return
+        apply_migrations(get_connection(database))
+        _verified_databases.add(key)
+
+
+def ensure_table(database, table, create_table):
+    """Run create_table once per process for tables outside the default schema."""
+    ensure_schema(database)
+    if table in _BASELINE_TABLES:
+        return
+    key = (_database_key(database), table)
+    if key in _verified_tables:
+        return
+    with _lock:
+        if key in _verified_tables:
+            return
+        conn = get_connection(database)
+        with conn:
+            create_table(conn, table)
+        _verified_tables.add(key)
+
+
+def _database_key(database):
+    if database == ":memory:":
+        return database
+    return os.path.abspath(database)
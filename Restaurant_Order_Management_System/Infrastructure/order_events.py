@@ -0,0 +1,56 @@
+import logging
+import threading
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+logger = logging.getLogger(__name__)
+
+
+class OrderChange:
+    def __init__(self, db_path, change_type, order_ids, source=None):
+        self.db_path = db_path
+        self.change_type = change_type
+        self.order_ids = tuple(order_ids)
+        self.source = source
+
+
+class OrderEventBus:
+    """Tells listeners which orders were created, updated or deleted.
+
+    Writers publish after their transaction commits, and listeners run on
+    the writer's thread; View.order_event_signals relays the changes to the
+    GUI thread. source is whatever object asked for the write, so a view can
+    skip the changes it made itself.
+    """
+
+    def __init__(self):
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def publish(self, db_path, change_type, order_ids, source=None):
+        order_ids = [order_id for order_id in dict.fromkeys(order_ids) if order_id is not None]
+        if not order_ids:
+            return
+        change = OrderChange(db_path, change_type, order_ids, source)
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(change)
+            except Exception:
+                # The change is committed; one failing listener must not hide it from the others
+                logger.exception("Order change listener %r failed", listener)
+
+
+order_events = OrderEventBus()
@@ -0,0 +1,112 @@
+import csv
+import json
+import os
+
+from Infrastructure.order_repository import ORDER_LINE_FIELDS
+
+FILE_FILTER = "CSV (*.csv);;JSON Lines (*.jsonl *.ndjson);;Columnar JSON (*.json)"
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def export_format(path):
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in {".jsonl", ".ndjson"}:
+        return "jsonl"
+    if extension == ".json":
+        return "columnar"
+    raise ValueError(f"Unsupported file type: {extension or path}")
+
+
+def export_order_history(repository, path, start_date=None, end_date=None,
+                         progress=None, is_cancelled=None, batch_size=1000):
+    """Stream order lines with a service_date in [start_date, end_date] to path.
+
+    The file is written next to path and only moved into place once the
+    export completes, so a cancelled or failed export leaves nothing behind.
+    Returns the number of lines written; raises ExportCancelled when
+    is_cancelled() turns true.
+    """
+    output_format = export_format(path)
+    temp_path = f"{path}.part"
+    count = 0
+    try:
+        with open(temp_path, "w", newline="", encoding="utf-8") as handle:
+            writer = _WRITERS[output_format](handle)
+            for rows in repository.iter_order_lines(start_date, end_date, batch_size):
+                if is_cancelled is not None and is_cancelled():
+                    raise ExportCancelled()
+                writer.write_chunk(rows)
+                count += len(rows)
+                if progress is not None:
+                    progress(count)
+            writer.close()
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+class _CsvWriter:
+    def __init__(self, handle):
+        self.writer = csv.writer(handle)
+        self.writer.writerow(ORDER_LINE_FIELDS)
+
+    def write_chunk(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        pass
+
+
+class _JsonLinesWriter:
+    def __init__(self, handle):
+        self.handle = handle
+
+    def write_chunk(self, rows):
+        self.handle.writelines(
+            json.dumps(dict(zip(ORDER_LINE_FIELDS, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+    def close(self):
+        pass
+
+
+class _ColumnarWriter:
+    # One JSON document holding row groups of column arrays, in the spirit of
+    # Parquet: {"fields": [...], "row_groups": [{"rows": n, "columns": {...}}]}
+    def __init__(self, handle):
+        self.handle = handle
+        self.first = True
+        handle.write('{"fields": ')
+        handle.write(json.dumps(list(ORDER_LINE_FIELDS)))
+        handle.write(', "row_groups": [\n')
+
+    def write_chunk(self, rows):
+        columns = {
+            field: list(values)
+            for field, values in zip(ORDER_LINE_FIELDS, zip(*rows))
+        }
+        if not self.first:
+            self.handle.write(",\n")
+        self.first = False
+        self.handle.write(json.dumps({"rows": len(rows), "columns": columns}, ensure_ascii=False))
+
+    def close(self):
+        self.handle.write("\n]}\n")
+
+
+_WRITERS = {
+    "csv": _CsvWriter,
+    "jsonl": _JsonLinesWriter,
+    "columnar": _ColumnarWriter,
+}
@@ -1,262 +1,464 @@
 import sqlite3
 from datetime import datetime
-import re
 from Model.order import Order
 from Model.dish import Dish
 from Model.product import Product
+from Infrastructure.connection_manager import get_connection
+from Infrastructure.migrations import ensure_schema
+from Infrastructure.order_events import CREATED, DELETED, UPDATED, order_events
+from Infrastructure.timings import timed
+
+
+ORDER_LINE_FIELDS = (
+    "order_id", "service_date", "created_at", "closed_at", "status", "table_name", "name",
+    "to_go", "order_total", "amount_paid",
+    "dish_id", "dish_name", "dish_status", "dish_to_go", "dish_total",
+    "item_name", "item_display_name", "price", "quantity", "notes", "is_custom",
+    "line_total",
+)
+
+
+# Columns of _order_values(), in order
+ORDER_COLUMNS = (
+    "id", "created_at", "closed_at", "service_date", "in_progress", "sent_status", "name", "table_name", "status",
+    "to_go", "additional_notes", "include_additional_notes_in_ticket", "amount_paid", "total_amount",
+)
+# Order.STATE_FIELDS name -> the orders columns it is stored in
+ORDER_FIELD_COLUMNS = {
+    "created_at": ("created_at",),
+    "closed_at": ("closed_at",),
+    "service_date": ("service_date",),
+    "status": ("status", "in_progress"),
+    "sent_status": ("sent_status",),
+    "name": ("name",),
+    "table": ("table_name",),
+    "to_go": ("to_go",),
+    "additional_notes": ("additional_notes",),
+    "include_additional_notes_in_ticket": ("include_additional_notes_in_ticket",),
+    "amount_paid": ("amount_paid",),
+    "total_amount": ("total_amount",),
+}
+
+
+class OrderConflictError(Exception):
+    """The order was changed or deleted by someone else since it was loaded.
+
+    stored_version is the version now in the database, or None if the order
+    no longer exists.
+    """
+
+    def __init__(self, order_id, expected_version, stored_version):
+        self.order_id = order_id
+        self.expected_version = expected_version
+        self.stored_version = stored_version
+        if stored_version is None:
+            message = f"Order {order_id} was deleted by another terminal"
+        else:
+            message = (
+                f"Order {order_id} was saved by another terminal "
+                f"(version {stored_version}, expected {expected_version})"
+            )
+        super().__init__(message)
 
 
 class OrderRepository:
     def __init__(self, db_path="orders.db"):
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        self._migrate()
+        self.db_path = db_path
+        ensure_schema(self.db_path)
 
-    def _migrate(self):
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS orders (
-                id TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL,
-                closed_at TEXT NOT NULL,
-                service_date TEXT,
-                in_progress INTEGER NOT NULL DEFAULT 0,
-                sent_status INTEGER NOT NULL DEFAULT 0,
-                name TEXT,
-                table_name TEXT,
-                status TEXT NOT NULL,
-                to_go INTEGER NOT NULL,
-                additional_notes TEXT NOT NULL DEFAULT '',
-                include_additional_notes_in_ticket INTEGER NOT NULL DEFAULT 0,
-                amount_paid REAL NOT NULL,
-                total_amount REAL NOT NULL
-            )
-            """
-        )
-        self._ensure_orders_column("service_date", "TEXT")
-        self._ensure_orders_column("in_progress", "INTEGER NOT NULL DEFAULT 0")
-        self._ensure_orders_column("sent_status", "INTEGER NOT NULL DEFAULT 0")
-        self._ensure_orders_column("additional_notes", "TEXT NOT NULL DEFAULT ''")
-        self._ensure_orders_column(
-            "include_additional_notes_in_ticket",
-            "INTEGER NOT NULL DEFAULT 0",
-        )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS order_dishes (
-                id TEXT PRIMARY KEY,
-                order_id TEXT NOT NULL,
-                display_name TEXT,
-                status TEXT NOT NULL,
-                sent_count INTEGER NOT NULL,
-                to_go INTEGER NOT NULL,
-                total_amount REAL NOT NULL,
-                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
-            )
-            """
-        )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS order_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                dish_id TEXT NOT NULL,
-                name TEXT NOT NULL,
-                display_name TEXT,
-                price REAL NOT NULL,
-                quantity INTEGER NOT NULL,
-                notes TEXT,
-                is_custom INTEGER NOT NULL,
-                FOREIGN KEY(dish_id) REFERENCES order_dishes(id) ON DELETE CASCADE
-            )
-            """
-        )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS order_counter_state (
-                key TEXT PRIMARY KEY,
-                last_order_id TEXT
-            )
-            """
-        )
-        self.conn.commit()
+    @property
+    def conn(self):
+        # Shared with Database, MenuDatabase and TablesDatabase, so rows are
+        # typed per cursor instead of through conn.row_factory.
+        return get_connection(self.db_path)
 
-    def _ensure_orders_column(self, column_name, column_type):
+    def _cursor(self):
         cur = self.conn.cursor()
-        cur.execute("PRAGMA table_info(orders)")
-        existing = {row[1] for row in cur.fetchall()}
-        if column_name not in existing:
-            cur.execute(f"ALTER TABLE orders ADD COLUMN {column_name} {column_type}")
+        cur.row_factory = sqlite3.Row
+        return cur
 
-    def save_order(self, order):
-        cur = self.conn.cursor()
-        cur.execute("BEGIN")
+    @timed
+    def save_order(self, order, source=None):
+        self.save_orders([order], source=source)
+
+    @timed
+    def save_orders(self, orders, deleted_order_ids=(), source=None):
+        """Save several orders and delete others in a single transaction.
+
+        Raises OrderConflictError, and saves nothing, if one of the orders was
+        changed elsewhere since it was loaded. Once committed, the change is
+        published on order_events with source.
+        """
+        cur = self._cursor()
+        # Take the write lock up front: a deferred transaction that has to
+        # upgrade fails at once with "database is locked" under contention
+        cur.execute("BEGIN IMMEDIATE")
         try:
-            cur.execute("SELECT closed_at FROM orders WHERE id = ?", (order.id,))
-            existing = cur.fetchone()
-            existing_closed_at = existing["closed_at"] if existing else ""
-            if order.status == "Closed":
-                closed_at_value = existing_closed_at or datetime.now().isoformat()
-            else:
-                closed_at_value = ""
+            on_commit = []
+            created_ids = []
+            updated_ids = []
+            for order in orders:
+                if self._save_order_rows(cur, order, on_commit):
+                    created_ids.append(order.id)
+                else:
+                    updated_ids.append(order.id)
+            for order_id in deleted_order_ids:
+                cur.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        for apply in on_commit:
+            apply()
+        order_events.publish(self.db_path, CREATED, created_ids, source)
+        order_events.publish(self.db_path, UPDATED, updated_ids, source)
+        order_events.publish(self.db_path, DELETED, deleted_order_ids, source)
+
+    def stamp_closed_at(self, order):
+        if order.status == "Closed":
+            order.closed_at = order.closed_at or datetime.now().isoformat()
+        else:
+            order.closed_at = ""
+
+    def _save_order_rows(self, cur, order, on_commit):
+        """Write only the rows that changed since the order was loaded or last saved.
+
+        Any change bumps the version of the order row first, provided it is
+        still the version the order was loaded with.
+        """
+        self.stamp_closed_at(order)
+        order_state = order.persistent_state()
+        version = order.version
+        inserted = order._clean_state is None
+        if inserted:
+            self._insert_order(cur, order)
+            version = 1
+        elif order_state != order._clean_state or self._dishes_changed(order):
+            self._update_order(cur, order, order.changed_fields())
+            version += 1
+        on_commit.append(lambda: (order.mark_clean(order_state), setattr(order, "version", version)))
+
+        removed_dish_ids = [
+            dish_id for dish_id in order.persisted_dish_ids if dish_id not in order.dishes
+        ]
+        if removed_dish_ids:
+            placeholders = ", ".join("?" for _ in removed_dish_ids)
+            cur.execute(f"DELETE FROM order_dishes WHERE id IN ({placeholders})", removed_dish_ids)
+
+        for dish in order.dishes.values():
+            self._save_dish_rows(cur, order, dish, inserted, on_commit)
+
+        dish_ids = set(order.dishes)
+        on_commit.append(lambda: setattr(order, "persisted_dish_ids", dish_ids))
+        return inserted
+
+    def _dishes_changed(self, order):
+        if order.persisted_dish_ids - set(order.dishes):
+            return True
+        return any(
+            dish.id not in order.persisted_dish_ids or dish.has_changes()
+            for dish in order.dishes.values()
+        )
+
+    def _save_dish_rows(self, cur, order, dish, force_insert, on_commit):
+        dish_state = dish.persistent_state()
+        dish_values = (
+            dish.id,
+            order.id,
+            dish.display_name,
+            dish.status,
+            int(dish.sent_count),
+            int(bool(dish.to_go)),
+            float(dish.total_amount),
+        )
+        inserted = force_insert or dish.id not in order.persisted_dish_ids
+        if inserted:
+            self._upsert_dish(cur, dish_values)
+        elif dish_state != dish._clean_state:
             cur.execute(
                 """
-                INSERT OR REPLACE INTO orders (
-                    id, created_at, closed_at, service_date, in_progress, sent_status, name, table_name, status,
-                    to_go, additional_notes, include_additional_notes_in_ticket, amount_paid, total_amount
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                UPDATE order_dishes SET
+                    order_id = ?, display_name = ?, status = ?, sent_count = ?, to_go = ?, total_amount = ?
+                WHERE id = ?
                 """,
-                (
-                    order.id,
-                    order.created_at.isoformat(),
-                    closed_at_value,
-                    (order.service_date or order.created_at.date().isoformat()),
-                    1 if (order.status == "In progress") else 0,
-                    int(bool(getattr(order, "sent_status", False))),
-                    order.name,
-                    order.table,
-                    order.status,
-                    int(bool(order.to_go)),
-                    str(getattr(order, "additional_notes", "") or ""),
-                    int(bool(getattr(order, "include_additional_notes_in_ticket", False))),
-                    float(order.amount_paid),
-                    float(order.total_amount),
-                ),
+                dish_values[1:] + (dish.id,),
             )
+            if cur.rowcount == 0:
+                self._upsert_dish(cur, dish_values)
+                inserted = True
+        on_commit.append(lambda: dish.mark_clean(dish_state))
 
-            cur.execute("DELETE FROM order_items WHERE dish_id IN (SELECT id FROM order_dishes WHERE order_id = ?)", (order.id,))
-            cur.execute("DELETE FROM order_dishes WHERE order_id = ?", (order.id,))
-
-            for dish in order.dishes.values():
-                cur.execute(
-                    """
-                    INSERT INTO order_dishes (
-                        id, order_id, display_name, status, sent_count, to_go, total_amount
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        dish.id,
-                        order.id,
-                        dish.display_name,
-                        dish.status,
-                        int(dish.sent_count),
-                        int(bool(dish.to_go)),
-                        float(dish.total_amount),
-                    ),
-                )
+        current_item_ids = {
+            product.row_id for product in dish.products.values() if product.row_id is not None
+        }
+        removed_item_ids = [
+            row_id for row_id in dish.persisted_item_ids if row_id not in current_item_ids
+        ]
+        if removed_item_ids and not inserted:
+            placeholders = ", ".join("?" for _ in removed_item_ids)
+            cur.execute(f"DELETE FROM order_items WHERE id IN ({placeholders})", removed_item_ids)
 
-                for product in dish.products.values():
+        item_ids = set()
+        for product in dish.products.values():
+            product_state = product.persistent_state()
+            item_values = (
+                dish.id,
+                product.name,
+                product.display_name,
+                float(product.price),
+                int(product.quantity),
+                product.notes,
+                int(bool(product.is_custom)),
+            )
+            row_id = product.row_id
+            if row_id is not None and not inserted and row_id in dish.persisted_item_ids:
+                if product_state != product._clean_state:
                     cur.execute(
                         """
-                        INSERT INTO order_items (
-                            dish_id, name, display_name, price, quantity, notes, is_custom
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                        UPDATE order_items SET
+                            name = ?, display_name = ?, price = ?, quantity = ?, notes = ?, is_custom = ?
+                        WHERE id = ? AND dish_id = ?
                         """,
-                        (
-                            dish.id,
-                            product.name,
-                            product.display_name,
-                            float(product.price),
-                            int(product.quantity),
-                            product.notes,
-                            int(bool(product.is_custom)),
-                        ),
+                        item_values[1:] + (row_id, dish.id),
                     )
-            self.conn.commit()
-            # Save order ID to prevent counter reset when orders are deleted
-            self._update_max_order_id(order.id)
-        except Exception:
-            self.conn.rollback()
-            raise
+                    if cur.rowcount == 0:
+                        row_id = self._insert_item(cur, item_values)
+            else:
+                row_id = self._insert_item(cur, item_values)
+            item_ids.add(row_id)
+            on_commit.append(
+                lambda product=product, row_id=row_id, product_state=product_state: (
+                    setattr(product, "row_id", row_id),
+                    product.mark_clean(product_state),
+                )
+            )
+        on_commit.append(lambda: setattr(dish, "persisted_item_ids", item_ids))
+
+    def _order_values(self, order):
+        return (
+            order.id,
+            order.created_at.isoformat(),
+            order.closed_at,
+            (order.service_date or order.created_at.date().isoformat()),
+            1 if (order.status == "In progress") else 0,
+            int(bool(getattr(order, "sent_status", False))),
+            order.name,
+            order.table,
+            order.status,
+            int(bool(order.to_go)),
+            str(getattr(order, "additional_notes", "") or ""),
+            int(bool(getattr(order, "include_additional_notes_in_ticket", False))),
+            float(order.amount_paid),
+            float(order.total_amount),
+        )
+
+    def _insert_order(self, cur, order):
+        cur.execute(
+            """
+            INSERT INTO orders (
+                id, created_at, closed_at, service_date, in_progress, sent_status, name, table_name, status,
+                to_go, additional_notes, include_additional_notes_in_ticket, amount_paid, total_amount, version
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+            ON CONFLICT(id) DO NOTHING
+            """,
+            self._order_values(order),
+        )
+        if cur.rowcount == 0:
+            raise self._conflict(cur, order)
+        # Dishes an earlier order with this id left behind are stale
+        cur.execute("DELETE FROM order_dishes WHERE order_id = ?", (order.id,))
+
+    def _update_order(self, cur, order, changed_fields):
+        # Compare-and-swap on version. Only the changed columns are set, so
+        # the triggers watching the others (rollups, search index) stay idle;
+        # without field changes it only bumps the version.
+        values = dict(zip(ORDER_COLUMNS, self._order_values(order)))
+        columns = list(dict.fromkeys(
+            column for field in changed_fields for column in ORDER_FIELD_COLUMNS[field]
+        ))
+        assignments = "".join(f"{column} = ?, " for column in columns)
+        cur.execute(
+            f"UPDATE orders SET {assignments}version = version + 1 WHERE id = ? AND version = ?",
+            [values[column] for column in columns] + [order.id, order.version],
+        )
+        if cur.rowcount == 0:
+            raise self._conflict(cur, order)
+
+    def _conflict(self, cur, order):
+        cur.execute("SELECT version FROM orders WHERE id = ?", (order.id,))
+        row = cur.fetchone()
+        return OrderConflictError(order.id, order.version, None if row is None else row["version"])
+
+    def _upsert_dish(self, cur, dish_values):
+        cur.execute(
+            """
+            INSERT INTO order_dishes (
+                id, order_id, display_name, status, sent_count, to_go, total_amount
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                order_id = excluded.order_id,
+                display_name = excluded.display_name,
+                status = excluded.status,
+                sent_count = excluded.sent_count,
+                to_go = excluded.to_go,
+                total_amount = excluded.total_amount
+            """,
+            dish_values,
+        )
+        cur.execute("DELETE FROM order_items WHERE dish_id = ?", (dish_values[0],))
+
+    def _insert_item(self, cur, item_values):
+        cur.execute(
+            """
+            INSERT INTO order_items (
+                dish_id, name, display_name, price, quantity, notes, is_custom
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            item_values,
+        )
+        return cur.lastrowid
 
     def save_closed_order(self, order):
         self.save_order(order)
 
+    @timed
     def load_open_orders(self):
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT id FROM orders WHERE status != ? ORDER BY created_at ASC",
-            ("Closed",),
-        )
-        rows = cur.fetchall()
+        cur = self._cursor()
+        # Literal status so the planner can use idx_orders_open_created_at
+        cur.execute("SELECT id FROM orders WHERE status != 'Closed' ORDER BY created_at ASC")
+        return self.load_orders([row["id"] for row in cur.fetchall()])
+
+    @timed
+    def load_orders(self, order_ids):
+        """Load several orders with one query per table. Keeps the order of order_ids."""
+        order_ids = list(dict.fromkeys(order_ids))
+        if not order_ids:
+            return {}
+
+        order_rows = {}
+        for chunk in self._chunks(order_ids):
+            placeholders = ", ".join("?" for _ in chunk)
+            cur = self._cursor().execute(
+                f"SELECT * FROM orders WHERE id IN ({placeholders})",
+                chunk,
+            )
+            for row in cur.fetchall():
+                order_rows[row["id"]] = row
+
+        dish_rows_by_order = {}
+        for chunk in self._chunks(list(order_rows)):
+            placeholders = ", ".join("?" for _ in chunk)
+            cur = self._cursor().execute(
+                f"SELECT * FROM order_dishes WHERE order_id IN ({placeholders}) ORDER BY rowid",
+                chunk,
+            )
+            for row in cur.fetchall():
+                dish_rows_by_order.setdefault(row["order_id"], []).append(row)
+
+        dish_ids = [row["id"] for rows in dish_rows_by_order.values() for row in rows]
+        item_rows_by_dish = {}
+        for chunk in self._chunks(dish_ids):
+            placeholders = ", ".join("?" for _ in chunk)
+            cur = self._cursor().execute(
+                f"SELECT * FROM order_items WHERE dish_id IN ({placeholders}) ORDER BY id",
+                chunk,
+            )
+            for row in cur.fetchall():
+                item_rows_by_dish.setdefault(row["dish_id"], []).append(row)
+
         orders = {}
-        for row in rows:
-            order = self.load_order(row["id"])
-            if order:
-                orders[order.id] = order
+        for order_id in order_ids:
+            order_row = order_rows.get(order_id)
+            if order_row is None:
+                continue
+            orders[order_id] = self._build_order(
+                order_row,
+                dish_rows_by_order.get(order_id, []),
+                item_rows_by_dish,
+            )
         return orders
 
-    def delete_order(self, order_id):
-        cur = self.conn.cursor()
-        cur.execute("DELETE FROM orders WHERE id = ?", (order_id,))
-        self.conn.commit()
-        # Save the deleted order ID as historical max to prevent counter reset
-        self._update_max_order_id(order_id)
+    def _chunks(self, values, size=500):
+        # Stay below SQLite's host parameter limit
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
+    def iter_order_lines(self, start_date=None, end_date=None, batch_size=1000):
+        """Yield lists of order lines (one per item, ORDER_LINE_FIELDS order) by service_date.
 
-    def get_latest_order_id(self):
+        Rows are pulled from an open cursor with fetchmany, so memory stays
+        bounded by batch_size however many orders are in the range.
+        """
+        where = []
+        params = []
+        if start_date:
+            where.append("o.service_date >= ?")
+            params.append(start_date)
+        if end_date:
+            where.append("o.service_date <= ?")
+            params.append(end_date)
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
         cur = self.conn.cursor()
-        # First check if there's a saved historical max
-        cur.execute("SELECT last_order_id FROM order_counter_state WHERE key = 'max_order_id'")
-        row = cur.fetchone()
-        if row and row["last_order_id"]:
-            historical_max = row["last_order_id"]
-            # Also check current orders for the actual max
-            cur.execute("SELECT id FROM orders ORDER BY id DESC LIMIT 200")
-            rows = cur.fetchall()
-            current_max = None
-            for cur_row in rows:
-                order_id = cur_row["id"]
-                if re.fullmatch(r"O\d{8}\d{4}", str(order_id or "")):
-                    current_max = order_id
-                    break
-            # Return the max between historical and current
-            if current_max and self._compare_order_ids(current_max, historical_max) >= 0:
-                return current_max
-            return historical_max
-        # Fallback: look for orders in the table
-        cur.execute("SELECT id FROM orders ORDER BY id DESC LIMIT 200")
-        rows = cur.fetchall()
-        for row in rows:
-            order_id = row["id"]
-            if re.fullmatch(r"O\d{8}\d{4}", str(order_id or "")):
-                return order_id
-        return None
-
-    def _compare_order_ids(self, id1, id2):
-        """Compare two order IDs. Returns: >0 if id1 > id2, 0 if equal, <0 if id1 < id2"""
-        m1 = re.fullmatch(r"O(\d{8})(\d{4})", str(id1).strip())
-        m2 = re.fullmatch(r"O(\d{8})(\d{4})", str(id2).strip())
-        if not m1 or not m2:
-            return 0
-        date_cmp = m1.group(1) - m2.group(1) if isinstance(m1.group(1), int) else int(m1.group(1)) - int(m2.group(1))
-        if date_cmp != 0:
-            return date_cmp
-        num_cmp = int(m1.group(2)) - int(m2.group(2))
-        return num_cmp
-
-    def _update_max_order_id(self, order_id):
-        """Save order_id as the max historical order ID if it's newer than the current max"""
-        if not re.fullmatch(r"O\d{8}\d{4}", str(order_id).strip()):
-            return
+        cur.execute(
+            f"""
+            SELECT
+                o.id, o.service_date, o.created_at, o.closed_at, o.status, o.table_name, o.name,
+                o.to_go, o.total_amount, o.amount_paid,
+                d.id, d.display_name, d.status, d.to_go, d.total_amount,
+                i.name, i.display_name, i.price, i.quantity, i.notes, i.is_custom,
+                i.price * i.quantity
+            FROM orders o
+            LEFT JOIN order_dishes d ON d.order_id = o.id
+            LEFT JOIN order_items i ON i.dish_id = d.id
+            {where_sql}
+            ORDER BY o.service_date, o.created_at, o.id, d.rowid, i.id
+            """,
+            params,
+        )
+        try:
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            cur.close()
+
+    @timed
+    def delete_order(self, order_id, source=None):
+        self.save_orders([], [order_id], source)
+
+    @timed
+    def next_order_number(self, day):
+        """Reserve the next order number of day (yyyymmdd).
+
+        One atomic statement, so connections and processes never get the
+        same number, and numbers of deleted orders are never handed out again.
+        """
         cur = self.conn.cursor()
-        cur.execute("SELECT last_order_id FROM order_counter_state WHERE key = 'max_order_id'")
-        row = cur.fetchone()
-        current_max = row["last_order_id"] if row else None
-        if not current_max or self._compare_order_ids(order_id, current_max) >= 0:
+        try:
             cur.execute(
-                "INSERT OR REPLACE INTO order_counter_state (key, last_order_id) VALUES (?, ?)",
-                ("max_order_id", order_id)
+                """
+                INSERT INTO order_sequences (day, last_value) VALUES (?, 1)
+                ON CONFLICT(day) DO UPDATE SET last_value = last_value + 1
+                RETURNING last_value
+                """,
+                (day,),
             )
+            value = cur.fetchone()[0]
             self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cur.close()
+        return int(value)
 
+    @timed
     def load_order(self, order_id):
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
-        order_row = cur.fetchone()
-        if not order_row:
-            return None
+        return self.load_orders([order_id]).get(order_id)
 
+    def _build_order(self, order_row, dish_rows, item_rows_by_dish):
         order = Order(order_row["id"])
         try:
             order.created_at = datetime.fromisoformat(order_row["created_at"])
@@ -286,12 +488,8 @@ class OrderRepository:
             else False
         )
         order.amount_paid = float(order_row["amount_paid"] or 0.0)
-
-        cur.execute(
-            "SELECT * FROM order_dishes WHERE order_id = ? ORDER BY rowid",
-            (order.id,),
-        )
-        dish_rows = cur.fetchall()
+        order.closed_at = order_row["closed_at"] or ""
+        order.version = int(order_row["version"])
 
         for dish_row in dish_rows:
             dish = Dish(dish_row["id"])
@@ -300,13 +498,7 @@ class OrderRepository:
             dish.sent_count = int(dish_row["sent_count"] or 0)
             dish.to_go = bool(dish_row["to_go"])
 
-            cur.execute(
-                "SELECT * FROM order_items WHERE dish_id = ? ORDER BY id",
-                (dish.id,),
-            )
-            item_rows = cur.fetchall()
-
-            for item_row in item_rows:
+            for item_row in item_rows_by_dish.get(dish.id, []):
                 product = Product(
                     item_row["name"],
                     float(item_row["price"]),
@@ -318,9 +510,13 @@ class OrderRepository:
                     else item_row["name"],
                 )
                 product.quantity = int(item_row["quantity"] or 1)
+                product.row_id = item_row["id"]
+                product.mark_clean()
                 dish.products[product.name] = product
+                dish.persisted_item_ids.add(product.row_id)
 
             dish.total()
+            dish.mark_clean()
             order.dishes[dish.id] = dish
 
         if order.dishes:
@@ -328,4 +524,6 @@ class OrderRepository:
         else:
             order.active_dish = None
         order.total()
+        order.persisted_dish_ids = set(order.dishes)
+        order.mark_clean()
         return order
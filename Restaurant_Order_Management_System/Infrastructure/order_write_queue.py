@@ -0,0 +1,225 @@
+import copy
+import itertools
+import logging
+import threading
+import time
+from Infrastructure.connection_manager import connection_manager
+from Infrastructure.order_repository import OrderConflictError, OrderRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OrderWriteResult:
+    def __init__(self, order_id, deleted=False, saved_order=None, clean_token=None, error=None, retrying=False):
+        self.order_id = order_id
+        self.deleted = deleted
+        self.saved_order = saved_order
+        self.clean_token = clean_token
+        self.error = error
+        # The write failed and is queued again
+        self.retrying = retrying
+
+
+class OrderWriteQueue:
+    """Write-behind persistence for orders on a background thread.
+
+    save() takes a snapshot of the order on the calling thread, so the caller
+    may keep editing it. Pending snapshots are coalesced per order id and
+    written in batches, one transaction per batch, through the writer
+    thread's own connection. Listeners receive a list of OrderWriteResult
+    on the writer thread after every batch; pass result.saved_order to
+    Order.adopt_clean_state once the live order is back on its own thread.
+    An order saved elsewhere first is left out of its batch and reported
+    with an OrderConflictError as result.error. Any other error, such as a
+    lock timeout, is reported with result.retrying set and the batch is
+    queued again after a delay that doubles up to max_retry_delay.
+    """
+
+    def __init__(self, db_path="orders.db", batch_delay=0.05, retry_delay=0.5, max_retry_delay=30.0,
+                 attempts_after_close=3):
+        self.repository = OrderRepository(db_path)
+        self.batch_delay = batch_delay
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.attempts_after_close = attempts_after_close
+        self._pending = {}
+        self._condition = threading.Condition()
+        # Ids of the batch being written
+        self._writing = set()
+        self._flush_waiters = 0
+        self._stopped = False
+        self._failures = 0
+        self._failed_batches = 0
+        self._retry_at = 0.0
+        self._listeners = []
+        # Clean tokens identify the clean state an order or snapshot started from.
+        # _lineages holds, per order id, the tokens the last saved snapshot descends from.
+        self._tokens = itertools.count(1)
+        self._last_saved = {}
+        self._lineages = {}
+        self._thread = threading.Thread(target=self._run, name="order-writer", daemon=True)
+        self._thread.start()
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def save(self, order):
+        self.repository.stamp_closed_at(order)
+        if order._clean_token is None:
+            order._clean_token = next(self._tokens)
+        snapshot = copy.deepcopy(order)
+        with self._condition:
+            self._pending[order.id] = snapshot
+            self._condition.notify_all()
+
+    def delete(self, order_id):
+        with self._condition:
+            self._pending[order_id] = None
+            self._condition.notify_all()
+
+    def has_pending(self):
+        with self._condition:
+            return bool(self._pending) or bool(self._writing)
+
+    def queued_order_ids(self):
+        """Ids of the orders with a save or delete that is queued or being written."""
+        with self._condition:
+            return set(self._pending) | self._writing
+
+    def flush(self, timeout=None):
+        """Wait until every queued write has been committed.
+
+        False on timeout, or as soon as a write fails; the failed writes
+        stay queued for the next retry.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            failed_batches = self._failed_batches
+            try:
+                while self._pending or self._writing:
+                    if self._failed_batches != failed_batches:
+                        return False
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self, timeout=None):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            while True:
+                with self._condition:
+                    while not self._pending and not self._stopped:
+                        self._condition.wait()
+                    if not self._pending:
+                        return
+                    # Back off after a failed write; edits made meanwhile join the retry
+                    while not self._stopped:
+                        remaining = self._retry_at - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    # Let a burst of edits collapse into one snapshot per order
+                    deadline = time.monotonic() + self.batch_delay
+                    while not self._stopped and not self._flush_waiters:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    batch = self._pending
+                    self._pending = {}
+                    self._writing = set(batch)
+                try:
+                    results = self._write_batch(batch)
+                finally:
+                    with self._condition:
+                        self._writing = set()
+                        self._condition.notify_all()
+                for listener in list(self._listeners):
+                    try:
+                        listener(results)
+                    except Exception:
+                        logger.exception("Order write listener %r failed", listener)
+        finally:
+            connection_manager.close_thread_connections()
+
+    def _write_batch(self, batch):
+        snapshots = [snapshot for snapshot in batch.values() if snapshot is not None]
+        deleted_ids = [order_id for order_id, snapshot in batch.items() if snapshot is None]
+        for snapshot in snapshots:
+            self._adopt_last_saved(snapshot)
+        results = []
+        while True:
+            try:
+                self.repository.save_orders(snapshots, deleted_ids, source=self)
+                break
+            except OrderConflictError as conflict:
+                # The transaction rolled back; save the rest without this order
+                snapshots = [snapshot for snapshot in snapshots if snapshot.id != conflict.order_id]
+                self._last_saved.pop(conflict.order_id, None)
+                self._lineages.pop(conflict.order_id, None)
+                results.append(OrderWriteResult(conflict.order_id, error=conflict))
+            except Exception as error:
+                conflicted_ids = {result.order_id for result in results}
+                failed = {
+                    order_id: snapshot for order_id, snapshot in batch.items() if order_id not in conflicted_ids
+                }
+                retrying = self._requeue(failed, error)
+                return results + [
+                    OrderWriteResult(order_id, deleted=snapshot is None, error=error, retrying=retrying)
+                    for order_id, snapshot in failed.items()
+                ]
+        with self._condition:
+            self._failures = 0
+            self._retry_at = 0.0
+
+        for snapshot in snapshots:
+            token = next(self._tokens)
+            lineage = self._lineages.get(snapshot.id)
+            if lineage is None or snapshot._clean_token not in lineage:
+                lineage = {snapshot._clean_token}
+            lineage.add(token)
+            self._lineages[snapshot.id] = lineage
+            self._last_saved[snapshot.id] = snapshot
+            results.append(OrderWriteResult(snapshot.id, saved_order=snapshot, clean_token=token))
+        for order_id in deleted_ids:
+            self._last_saved.pop(order_id, None)
+            self._lineages.pop(order_id, None)
+            results.append(OrderWriteResult(order_id, deleted=True))
+        return results
+
+    def _requeue(self, failed, error):
+        """Queue the writes of a failed batch again. False once closing has given up on them."""
+        with self._condition:
+            self._failures += 1
+            self._failed_batches += 1
+            self._condition.notify_all()
+            if self._stopped and self._failures > self.attempts_after_close:
+                logger.error("Giving up on %d order writes at close: %s", len(failed), error)
+                return False
+            delay = min(self.retry_delay * 2 ** (self._failures - 1), self.max_retry_delay)
+            self._retry_at = time.monotonic() + delay
+            for order_id, snapshot in failed.items():
+                # A newer snapshot queued meanwhile already carries these edits
+                self._pending.setdefault(order_id, snapshot)
+        logger.warning("Order write failed, retrying in %.1f s: %s", delay, error)
+        return True
+
+    def _adopt_last_saved(self, snapshot):
+        # The live order may not have adopted the previous write yet. Without
+        # its row ids the snapshot would insert the same items a second time.
+        last_saved = self._last_saved.get(snapshot.id)
+        lineage = self._lineages.get(snapshot.id, ())
+        if last_saved is None or snapshot._clean_token not in lineage:
+            return
+        snapshot.adopt_clean_state(last_saved)
@@ -0,0 +1,139 @@
+import copy
+import functools
+import logging
+import sqlite3
+import threading
+import time
+from Infrastructure.connection_manager import connection_manager
+from Infrastructure.print_spool import PrintSpool
+from Infrastructure.timings import timings
+
+logger = logging.getLogger(__name__)
+
+
+class PrintQueue:
+    """Prints tickets on a background thread from the print_jobs spool.
+
+    submit() stores the ticket and returns at once, so a sleeping printer
+    never blocks the caller. The printer thread prints due jobs oldest first
+    and retries failures with exponential backoff, giving up after
+    max_attempts. A job is claimed for claim_timeout seconds before it is
+    printed, so terminals sharing the spool never print it twice, and a
+    job left printing by a crash is picked up again after that. Database
+    errors are logged and retried with the same backoff instead of
+    stopping the thread. Listeners receive the PrintJob whenever its
+    status changes, on the printer thread (or on the caller's thread for
+    submit).
+    """
+
+    def __init__(self, printer, db_path="orders.db", max_attempts=5, retry_delay=2.0, max_retry_delay=60.0,
+                 claim_timeout=60.0):
+        self.printer = printer
+        self.spool = PrintSpool(db_path)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.claim_timeout = claim_timeout
+        self._condition = threading.Condition()
+        self._submitted = False
+        self._stopped = False
+        self._recovered = False
+        # Result of a printed job that could not be written to the spool yet
+        self._unrecorded = None
+        self._listeners = []
+        self._thread = threading.Thread(target=self._run, name="ticket-printer", daemon=True)
+        self._thread.start()
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def submit(self, order_id, ticket_text):
+        job = self.spool.add(order_id, ticket_text)
+        with self._condition:
+            self._submitted = True
+            self._condition.notify_all()
+        self._notify(job)
+        return job
+
+    def close(self, timeout=5.0):
+        # A printer stuck mid-job must not hold up shutdown; the job is requeued on start
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def retry_delay_for(self, attempts):
+        return min(self.max_retry_delay, self.retry_delay * 2 ** max(0, attempts - 1))
+
+    def _run(self):
+        failures = 0
+        try:
+            while True:
+                with self._condition:
+                    if self._stopped:
+                        return
+                try:
+                    self._work()
+                    failures = 0
+                except sqlite3.Error as error:
+                    # Most likely a lock timeout; the spool is still there
+                    failures += 1
+                    delay = self.retry_delay_for(failures)
+                    logger.warning("Print spool unavailable, retrying in %.1f s: %s", delay, error)
+                    with self._condition:
+                        if not self._stopped:
+                            self._condition.wait(delay)
+        finally:
+            connection_manager.close_thread_connections()
+
+    def _work(self):
+        if not self._recovered:
+            self.spool.recover()
+            self._recovered = True
+        if self._unrecorded is not None:
+            self._record_outcome()
+        job = self.spool.next_due(time.time())
+        if job is not None:
+            self._print(job)
+            return
+        timeout = self.spool.seconds_until_next(time.time())
+        with self._condition:
+            if not self._submitted and not self._stopped:
+                self._condition.wait(timeout)
+            self._submitted = False
+
+    def _print(self, job):
+        now = time.time()
+        if not self.spool.claim(job, now, now + self.claim_timeout):
+            # Another terminal got to it first
+            return
+        self._notify(job)
+        try:
+            with timings.span("PrintQueue.print_ticket"):
+                self.printer.print_ticket(job)
+        except Exception as error:
+            if job.attempts >= self.max_attempts:
+                outcome = functools.partial(self.spool.mark_failed, job, str(error))
+            else:
+                next_attempt_at = time.time() + self.retry_delay_for(job.attempts)
+                outcome = functools.partial(self.spool.mark_retry, job, str(error), next_attempt_at)
+        else:
+            outcome = functools.partial(self.spool.mark_printed, job)
+        # Kept until it is written, so a printed ticket is not printed again
+        self._unrecorded = (job, outcome)
+        self._record_outcome()
+
+    def _record_outcome(self):
+        job, outcome = self._unrecorded
+        outcome()
+        self._unrecorded = None
+        self._notify(job)
+
+    def _notify(self, job):
+        # Listeners may read the job on another thread after it moved on
+        job = copy.copy(job)
+        for listener in list(self._listeners):
+            try:
+                listener(job)
+            except Exception:
+                logger.exception("Print job listener %r failed", listener)
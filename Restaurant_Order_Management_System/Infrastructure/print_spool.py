@@ -0,0 +1,148 @@
+import sqlite3
+from datetime import datetime, timedelta
+from Infrastructure.connection_manager import get_connection
+from Infrastructure.migrations import ensure_schema
+
+PENDING = "pending"
+PRINTING = "printing"
+PRINTED = "printed"
+FAILED = "failed"
+EXPIRED = "expired"
+
+
+class PrintJob:
+    def __init__(self, id, order_id, payload, status=PENDING, attempts=0,
+                 next_attempt_at=0.0, last_error="", created_at="", printed_at=""):
+        self.id = id
+        self.order_id = order_id
+        self.payload = payload
+        self.status = status
+        self.attempts = attempts
+        self.next_attempt_at = next_attempt_at
+        self.last_error = last_error
+        self.created_at = created_at
+        self.printed_at = printed_at
+
+
+class PrintSpool:
+    """Ticket print jobs kept in the print_jobs table until they are printed."""
+
+    def __init__(self, db_path="orders.db"):
+        self.db_path = db_path
+        ensure_schema(self.db_path)
+
+    def connect(self):
+        return get_connection(self.db_path)
+
+    def add(self, order_id, payload):
+        created_at = datetime.now().isoformat()
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO print_jobs (order_id, payload, status, created_at) VALUES (?, ?, ?, ?)",
+                (order_id, payload, PENDING, created_at),
+            )
+            job_id = cursor.lastrowid
+        return PrintJob(job_id, order_id, payload, created_at=created_at)
+
+    # While a job is printing, next_attempt_at is when its claim runs out.
+    # A job whose printer thread died (crash, or another terminal closed
+    # mid-print) is due again once that time has passed.
+
+    def next_due(self, now):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(
+                """
+                SELECT * FROM print_jobs
+                WHERE status IN ('pending', 'printing') AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, id
+                LIMIT 1
+                """,
+                (now,),
+            )
+            row = cursor.fetchone()
+        return None if row is None else PrintJob(**dict(row))
+
+    def seconds_until_next(self, now):
+        """Seconds until the next job is due, or None without pending or printing jobs."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT MIN(next_attempt_at) FROM print_jobs WHERE status IN ('pending', 'printing')"
+            )
+            next_attempt_at = cursor.fetchone()[0]
+        if next_attempt_at is None:
+            return None
+        return max(0.0, next_attempt_at - now)
+
+    def claim(self, job, now, claimed_until):
+        """Mark job as printing until claimed_until. False if someone else claimed it first.
+
+        A single conditional UPDATE, so two terminals sharing the database
+        never both print the same job.
+        """
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE print_jobs SET status = 'printing', attempts = attempts + 1, next_attempt_at = ?
+                WHERE id = ? AND status IN ('pending', 'printing') AND next_attempt_at <= ?
+                """,
+                (claimed_until, job.id, now),
+            )
+            claimed = cursor.rowcount == 1
+        if claimed:
+            job.status = PRINTING
+            job.attempts += 1
+            job.next_attempt_at = claimed_until
+        return claimed
+
+    def mark_printed(self, job):
+        job.status = PRINTED
+        job.last_error = ""
+        job.printed_at = datetime.now().isoformat()
+        self._update(job)
+
+    def mark_retry(self, job, error, next_attempt_at):
+        job.status = PENDING
+        job.last_error = error
+        job.next_attempt_at = next_attempt_at
+        self._update(job)
+
+    def mark_failed(self, job, error):
+        job.status = FAILED
+        job.last_error = error
+        self._update(job)
+
+    def _update(self, job):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE print_jobs
+                SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, printed_at = ?
+                WHERE id = ?
+                """,
+                (job.status, job.attempts, job.next_attempt_at, job.last_error, job.printed_at, job.id),
+            )
+
+    def recover(self, expire_after=timedelta(hours=6), keep_for=timedelta(days=30)):
+        """Expire stale jobs and prune old history.
+
+        Jobs a crash left printing are printed again once their claim runs
+        out, so one may come out twice; a lost ticket is worse.
+        """
+        now = datetime.now()
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE print_jobs SET status = 'expired' "
+                "WHERE status IN ('pending', 'printing') AND created_at < ?",
+                ((now - expire_after).isoformat(),),
+            )
+            cursor.execute(
+                "DELETE FROM print_jobs WHERE status != 'pending' AND created_at < ?",
+                ((now - keep_for).isoformat(),),
+            )
@@ -0,0 +1,351 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+_THIS_FILE = os.path.abspath(__file__)
+_INFRASTRUCTURE_DIR = os.path.dirname(_THIS_FILE)
+_APP_DIR = os.path.dirname(_INFRASTRUCTURE_DIR)
+# Statements the trace callback reports for one execute, triggers included
+_MAX_TRACE_LINES = 20
+# Rows of executemany parameters written with a slow statement
+_MAX_LOGGED_ROWS = 20
+
+
+class TraceRecord:
+    def __init__(self, sql, parameters, site, caller, many=False):
+        self.sql = sql
+        self.parameters = parameters
+        self.many = many
+        self.site = site
+        self.caller = caller
+        self.thread = threading.current_thread().name
+        self.recorded_at = datetime.now().isoformat()
+        self.duration = 0.0
+        self.rows = 0
+        self.trace = []
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Times execute plus the fetches that follow it, and counts the rows returned.
+
+    A statement's record is finished once its rows run out, or when the
+    cursor runs another statement, is closed or is garbage collected.
+    """
+
+    _record = None
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        record = self.connection.start_record(sql, parameters)
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        finally:
+            record.duration += time.perf_counter() - started
+            record.trace = self.connection.take_trace()
+        self._record = record
+        if self.description is None:
+            record.rows = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        seq_of_parameters = list(seq_of_parameters)
+        record = self.connection.start_record(sql, seq_of_parameters, many=True)
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        finally:
+            record.duration += time.perf_counter() - started
+            record.trace = self.connection.take_trace()
+        record.rows = max(self.rowcount, 0)
+        self._record = record
+        self._finish()
+        return self
+
+    def fetchone(self):
+        if self._record is None:
+            return super().fetchone()
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._record.duration += time.perf_counter() - started
+        if row is None:
+            self._finish()
+        else:
+            self._record.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        if self._record is None:
+            return super().fetchmany(size)
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._record.duration += time.perf_counter() - started
+        self._record.rows += len(rows)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        if self._record is None:
+            return super().fetchall()
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._record.duration += time.perf_counter() - started
+        self._record.rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        if self._record is None:
+            return super().__next__()
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._record.duration += time.perf_counter() - started
+            self._finish()
+            raise
+        self._record.duration += time.perf_counter() - started
+        self._record.rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+    def _finish(self):
+        record = self._record
+        if record is not None:
+            self._record = None
+            self.connection.finish_record(record)
+
+
+class TracedConnection(sqlite3.Connection):
+    """A connection whose statements are reported to the tracer.
+
+    The sqlite3 trace callback collects the statements SQLite actually
+    runs for each execute, with their parameters expanded, including the
+    ones in triggers and the implicit BEGIN.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tracer = None
+        self.database_path = None
+        self._trace = []
+        self.set_trace_callback(self._statement_started)
+
+    def _statement_started(self, statement):
+        if len(self._trace) < _MAX_TRACE_LINES:
+            self._trace.append(statement)
+
+    def take_trace(self):
+        trace, self._trace = self._trace, []
+        return trace
+
+    def start_record(self, sql, parameters, many=False):
+        self._trace = []
+        site, caller = _call_site()
+        return TraceRecord(sql, parameters, site, caller, many)
+
+    def finish_record(self, record):
+        if self.tracer is not None:
+            self.tracer.finish(self.database_path, record)
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        self._timed_end_of_transaction("COMMIT", super().commit)
+
+    def rollback(self):
+        self._timed_end_of_transaction("ROLLBACK", super().rollback)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        statement = "COMMIT" if exc_type is None else "ROLLBACK"
+        return self._timed_end_of_transaction(
+            statement,
+            lambda: super(TracedConnection, self).__exit__(exc_type, exc_value, traceback),
+        )
+
+    def _timed_end_of_transaction(self, statement, end):
+        if not self.in_transaction:
+            return end()
+        record = self.start_record(statement, ())
+        started = time.perf_counter()
+        try:
+            return end()
+        finally:
+            record.duration = time.perf_counter() - started
+            record.trace = self.take_trace()
+            self.finish_record(record)
+
+
+def _call_site():
+    """(where the statement ran, the first frame outside Infrastructure) as "path:line in function"."""
+    frame = sys._getframe(2)
+    site = caller = ""
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename != _THIS_FILE:
+            location = f"{os.path.relpath(filename, _APP_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+            if not site:
+                site = location
+            if not filename.startswith(_INFRASTRUCTURE_DIR + os.sep):
+                caller = location
+                break
+        frame = frame.f_back
+    return site, caller
+
+
+class SqlTracer:
+    """Opt-in record of every SQL statement run through the application's connections.
+
+    Keeps the last history records in memory. Statements that take at
+    least slow_ms are also written, with their EXPLAIN QUERY PLAN, to the
+    slow_queries table of the database they ran on. That happens on a
+    background thread with its own connection, so a slow statement inside
+    a transaction is never written into it. Connections opened while the
+    tracer is disabled are plain sqlite3 connections and cost nothing.
+    """
+
+    def __init__(self, enabled=False, slow_ms=100.0, history=2000, keep_for=timedelta(days=30)):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.keep_for = keep_for
+        self.records = deque(maxlen=history)
+        self._slow = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def connect(self, database, **kwargs):
+        if not self.enabled:
+            return sqlite3.connect(database, **kwargs)
+        conn = sqlite3.connect(database, factory=TracedConnection, **kwargs)
+        conn.tracer = self
+        conn.database_path = database
+        return conn
+
+    def finish(self, database, record):
+        self.records.append(record)
+        if record.duration_ms < self.slow_ms or database in (None, ":memory:"):
+            return
+        self._slow.put((database, record))
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="sql-tracer", daemon=True)
+                    self._thread.start()
+
+    def flush(self, timeout=None):
+        """Wait until the slow statements recorded so far are in slow_queries."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._slow.put((None, done))
+        return done.wait(timeout)
+
+    def _run(self):
+        connections = {}
+        try:
+            while True:
+                database, record = self._slow.get()
+                if database is None:
+                    record.set()
+                    continue
+                try:
+                    conn = connections.get(database)
+                    if conn is None:
+                        conn = connections[database] = self._open(database)
+                    self._write(conn, record)
+                except sqlite3.Error:
+                    pass
+        finally:
+            for conn in connections.values():
+                conn.close()
+
+    def _open(self, database):
+        conn = sqlite3.connect(database, timeout=30)
+        with conn:
+            conn.execute(
+                "DELETE FROM slow_queries WHERE recorded_at < ?",
+                ((datetime.now() - self.keep_for).isoformat(),),
+            )
+        return conn
+
+    def _write(self, conn, record):
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO slow_queries (
+                    recorded_at, duration_ms, rows, statement, parameters, site, caller, thread, trace, query_plan
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    record.recorded_at,
+                    record.duration_ms,
+                    record.rows,
+                    record.sql,
+                    self._parameters(record),
+                    record.site,
+                    record.caller,
+                    record.thread,
+                    "\n".join(record.trace),
+                    self._query_plan(conn, record),
+                ),
+            )
+
+    def _parameters(self, record):
+        parameters = record.parameters
+        if record.many:
+            parameters = list(parameters[:_MAX_LOGGED_ROWS])
+        return json.dumps(parameters, default=str)
+
+    def _query_plan(self, conn, record):
+        parameters = record.parameters
+        if record.many:
+            # The plan is the same for every row of parameters
+            parameters = parameters[0] if parameters else ()
+        try:
+            rows = conn.execute("EXPLAIN QUERY PLAN " + record.sql, parameters).fetchall()
+        except sqlite3.Error as exc:
+            return f"(no plan: {exc})"
+        # Indent each step under its parent, like the sqlite3 shell
+        depth = {0: -1}
+        lines = []
+        for step_id, parent_id, _unused, detail in rows:
+            depth[step_id] = depth.get(parent_id, -1) + 1
+            lines.append("  " * depth[step_id] + detail)
+        return "\n".join(lines)
+
+
+# Off unless SQL_TRACE is set; SQL_SLOW_MS sets the slow statement threshold
+sql_tracer = SqlTracer(
+    enabled=os.getenv("SQL_TRACE", "").strip().lower() in {"1", "true", "yes", "on"},
+    slow_ms=float(os.getenv("SQL_SLOW_MS", "").strip() or 100.0),
+)
+atexit.register(sql_tracer.flush, 2.0)
@@ -0,0 +1,230 @@
+import ctypes
+import html
+import os
+import sys
+from ctypes import wintypes
+from PyQt6.QtGui import QFont, QTextDocument
+from PyQt6.QtPrintSupport import QPrinter, QPrinterInfo
+
+DEFAULT_PRINTER_NAME = "BlueTooth Printer"
+DEFAULT_LOGO_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "logo_tacos_el_padrino.jpeg",
+)
+
+
+class PrinterError(Exception):
+    pass
+
+
+def ticket_printer_from_env():
+    """Printer backend chosen by TICKET_PRINTER_BACKEND: "system" (default) or "file".
+
+    "file" writes ESC/POS files to TICKET_PRINTER_DIR, for machines without
+    the thermal printer.
+    """
+    backend = os.getenv("TICKET_PRINTER_BACKEND", "").strip().lower() or "system"
+    if backend == "file":
+        return FilePrinter(os.getenv("TICKET_PRINTER_DIR", "").strip() or "printed_tickets")
+    if backend != "system":
+        raise ValueError(f"Unknown ticket printer backend: {backend}")
+    printer_name = os.getenv("TICKET_PRINTER_NAME", "").strip() or DEFAULT_PRINTER_NAME
+    return FallbackPrinter([RawWindowsPrinter(printer_name), QtDocumentPrinter(printer_name)])
+
+
+def is_emphasized_line(line):
+    normalized = line.strip().upper()
+    return normalized == "TAQUERIA EL PADRINO" or normalized.startswith("TOTAL:")
+
+
+def ticket_html(ticket_text, logo_path=DEFAULT_LOGO_PATH):
+    logo_html = ""
+    if logo_path and os.path.exists(logo_path):
+        logo_src = logo_path.replace("\\", "/")
+        logo_html = (
+            "<div style='text-align:center; margin-bottom:8px;'>"
+            f"<img src='{logo_src}' style='max-width:220px;' />"
+            "</div>"
+        )
+    rendered_lines = []
+    for raw_line in ticket_text.splitlines():
+        escaped_line = html.escape(raw_line)
+        weight = "700" if is_emphasized_line(raw_line) else "400"
+        rendered_lines.append(
+            f"<div style='white-space:pre; font-weight:{weight};'>{escaped_line}</div>"
+        )
+    rendered_ticket = "".join(rendered_lines)
+    return (
+        "<html><body style='font-family:Consolas, \"Courier New\", monospace; font-size:10pt;'>"
+        f"{logo_html}<div>{rendered_ticket}</div>"
+        "</body></html>"
+    )
+
+
+def escpos_payload(ticket_text, encoding="cp437"):
+    """ESC/POS bytes for a ticket: initialise, bold headline and total, feed and cut."""
+    payload = bytearray(b"\x1b@")
+    for line in ticket_text.splitlines():
+        encoded = line.encode(encoding, errors="replace")
+        if is_emphasized_line(line):
+            payload += b"\x1bE\x01" + encoded + b"\x1bE\x00\n"
+        else:
+            payload += encoded + b"\n"
+    payload += b"\x1bd\x04\x1dV\x01"
+    return bytes(payload)
+
+
+class FallbackPrinter:
+    """Tries each printer in turn; fails with the last error if none prints."""
+
+    def __init__(self, printers):
+        self.printers = list(printers)
+
+    def print_ticket(self, job):
+        errors = []
+        for printer in self.printers:
+            try:
+                printer.print_ticket(job)
+                return
+            except Exception as exc:
+                errors.append(str(exc))
+        raise PrinterError("; ".join(errors) or "No printer configured")
+
+
+class FilePrinter:
+    """Writes every ticket to its own file in directory instead of printing it."""
+
+    def __init__(self, directory, escpos=True):
+        self.directory = directory
+        self.escpos = escpos
+
+    def print_ticket(self, job):
+        if self.escpos:
+            data, extension = escpos_payload(job.payload), ".bin"
+        else:
+            data, extension = job.payload.encode("utf-8"), ".txt"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"ticket-{int(job.id):06d}-{job.order_id}{extension}")
+            with open(path + ".part", "wb") as handle:
+                handle.write(data)
+            os.replace(path + ".part", path)
+        except OSError as exc:
+            raise PrinterError(f"Could not write {self.directory}: {exc}") from exc
+
+
+class QtDocumentPrinter:
+    """Prints the ticket and its logo as a rich text document on a QPrinter."""
+
+    def __init__(self, printer_name="", logo_path=DEFAULT_LOGO_PATH):
+        self.printer_name = printer_name
+        self.logo_path = logo_path
+
+    def print_ticket(self, job):
+        # Qt supports painting on a QPrinter outside the GUI thread
+        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+        if self.printer_name:
+            printer.setPrinterName(self.printer_name)
+            if not printer.isValid():
+                available = ", ".join(QPrinterInfo.availablePrinterNames()) or "No printers detectadas"
+                raise PrinterError(f"Printer '{self.printer_name}' was not found. Available: {available}")
+        else:
+            default_printer = QPrinterInfo.defaultPrinter()
+            if default_printer.isNull():
+                raise PrinterError("No default printer is configured.")
+            printer.setPrinterName(default_printer.printerName())
+            if not printer.isValid():
+                available = ", ".join(QPrinterInfo.availablePrinterNames()) or "No printers detectadas"
+                raise PrinterError(f"The default printer is not valid. Available: {available}")
+
+        document = QTextDocument()
+        document.setDefaultFont(QFont("Consolas", 10))
+        document.setHtml(ticket_html(job.payload, self.logo_path))
+        document.print(printer)
+        if printer.printerState() == QPrinter.PrinterState.Error:
+            raise PrinterError(f"Printer '{printer.printerName()}' could not print the ticket.")
+
+
+class RawWindowsPrinter:
+    """Sends the plain ticket text straight to the spooler as a RAW document."""
+
+    def __init__(self, printer_name=""):
+        self.printer_name = printer_name
+
+    def print_ticket(self, job):
+        if not sys.platform.startswith("win"):
+            raise PrinterError("Raw printing is only available on Windows.")
+
+        class DOC_INFO_1(ctypes.Structure):
+            _fields_ = [
+                ("pDocName", wintypes.LPWSTR),
+                ("pOutputFile", wintypes.LPWSTR),
+                ("pDatatype", wintypes.LPWSTR),
+            ]
+
+        printer_name = self.printer_name.strip()
+        if not printer_name:
+            default_printer = QPrinterInfo.defaultPrinter()
+            if default_printer.isNull():
+                raise PrinterError("No default printer is configured.")
+            printer_name = default_printer.printerName()
+
+        if printer_name not in QPrinterInfo.availablePrinterNames():
+            raise PrinterError(f"Printer '{printer_name}' was not found.")
+
+        winspool = ctypes.WinDLL("winspool.drv", use_last_error=True)
+        open_printer = winspool.OpenPrinterW
+        open_printer.argtypes = [wintypes.LPWSTR, ctypes.POINTER(wintypes.HANDLE), wintypes.LPVOID]
+        open_printer.restype = wintypes.BOOL
+        close_printer = winspool.ClosePrinter
+        close_printer.argtypes = [wintypes.HANDLE]
+        close_printer.restype = wintypes.BOOL
+        start_doc = winspool.StartDocPrinterW
+        start_doc.argtypes = [wintypes.HANDLE, wintypes.DWORD, ctypes.c_void_p]
+        start_doc.restype = wintypes.DWORD
+        end_doc = winspool.EndDocPrinter
+        end_doc.argtypes = [wintypes.HANDLE]
+        end_doc.restype = wintypes.BOOL
+        start_page = winspool.StartPagePrinter
+        start_page.argtypes = [wintypes.HANDLE]
+        start_page.restype = wintypes.BOOL
+        end_page = winspool.EndPagePrinter
+        end_page.argtypes = [wintypes.HANDLE]
+        end_page.restype = wintypes.BOOL
+        write_printer = winspool.WritePrinter
+        write_printer.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
+        write_printer.restype = wintypes.BOOL
+
+        printer_handle = wintypes.HANDLE()
+        payload = job.payload.replace("\n", "\r\n").encode("cp1252", errors="replace")
+
+        try:
+            if not open_printer(printer_name, ctypes.byref(printer_handle), None):
+                raise PrinterError(f"Could not open printer '{printer_name}'.")
+
+            doc_info = DOC_INFO_1("Ticket", None, "RAW")
+            if start_doc(printer_handle, 1, ctypes.byref(doc_info)) == 0:
+                raise PrinterError(f"Printer '{printer_name}' rejected the document.")
+            try:
+                if not start_page(printer_handle):
+                    raise PrinterError(f"Printer '{printer_name}' could not start a page.")
+                try:
+                    written = wintypes.DWORD(0)
+                    if not write_printer(
+                        printer_handle,
+                        ctypes.c_char_p(payload),
+                        len(payload),
+                        ctypes.byref(written),
+                    ) or written.value <= 0:
+                        raise PrinterError(f"Could not write to printer '{printer_name}'.")
+                finally:
+                    end_page(printer_handle)
+            finally:
+                end_doc(printer_handle)
+        except PrinterError:
+            raise
+        except Exception as exc:
+            raise PrinterError(str(exc)) from exc
+        finally:
+            if printer_handle:
+                close_printer(printer_handle)
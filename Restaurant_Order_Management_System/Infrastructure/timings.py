@@ -0,0 +1,135 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+
+class _Span:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Timings:
+    """Rolling wall-clock timings of named spans, kept in memory.
+
+    Each name keeps its last window durations, so percentiles follow the
+    current service rather than the whole day. While disabled, span()
+    returns a shared no-op and timed functions call straight through.
+    """
+
+    def __init__(self, enabled=False, window=1024):
+        self.enabled = enabled
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, seconds):
+        samples = self._samples.get(name)
+        if samples is None:
+            with self._lock:
+                samples = self._samples.setdefault(name, deque(maxlen=self.window))
+        # deque.append is atomic; the count may miss a racing increment
+        samples.append(seconds)
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}
+            self._counts = {}
+
+    def snapshot(self):
+        """{name: statistics in milliseconds} over each span's rolling window."""
+        with self._lock:
+            names = list(self._samples.items())
+        stats = {}
+        for name, samples in sorted(names):
+            durations = sorted(samples)
+            if not durations:
+                continue
+            stats[name] = {
+                "count": self._counts.get(name, len(durations)),
+                "window": len(durations),
+                "p50_ms": _percentile(durations, 50) * 1000,
+                "p95_ms": _percentile(durations, 95) * 1000,
+                "p99_ms": _percentile(durations, 99) * 1000,
+                "max_ms": durations[-1] * 1000,
+                "mean_ms": sum(durations) / len(durations) * 1000,
+            }
+        return stats
+
+    def export_json(self, path):
+        data = {
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+            "window": self.window,
+            "spans": self.snapshot(),
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+            handle.write("\n")
+
+
+def _percentile(sorted_values, percent):
+    # Nearest rank
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[int(index)]
+
+
+# Off unless APP_TIMINGS is set; the Diagnostics page can switch it on
+timings = Timings(enabled=os.getenv("APP_TIMINGS", "").strip().lower() in {"1", "true", "yes", "on"})
+
+
+def timed(function=None, name=None):
+    """Record every call of function as a span named after it (or name).
+
+    Use as @timed or @timed(name="..."). Not for methods connected straight
+    to Qt signals, which pass the slot only the arguments it declares; use
+    timings.span() inside those.
+    """
+    if function is None:
+        return functools.partial(timed, name=name)
+    span_name = name or function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not timings.enabled:
+            return function(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings.record(span_name, time.perf_counter() - started)
+
+    return wrapper
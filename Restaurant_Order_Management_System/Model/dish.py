@@ -1,5 +1,8 @@
 from Model.product import Product
 class Dish():
+    # Names of the values in persistent_state(), in the same order
+    STATE_FIELDS = ("display_name", "status", "sent_count", "to_go", "total_amount")
+
     def __init__(self, dish_id: str):
         self.id = dish_id
         self.name = ""
@@ -11,6 +14,8 @@ class Dish():
         self.sent_count = 0
         self.to_go = False
         self.to_go_overridden = False
+        self._clean_state = None
+        self.persisted_item_ids = set()
 
 
     def remove_product(self, product_name):
@@ -64,3 +69,60 @@ class Dish():
         self.to_go = to_go
         if overridden:
             self.to_go_overridden = True
+
+    def persistent_state(self):
+        return (
+            self.display_name,
+            self.status,
+            int(self.sent_count),
+            bool(self.to_go),
+            float(self.total_amount),
+        )
+
+    def is_dirty(self):
+        return self.persistent_state() != self._clean_state
+
+    def changed_fields(self):
+        """Names of the fields edited since the dish was loaded or last saved."""
+        if self._clean_state is None:
+            return list(self.STATE_FIELDS)
+        return [
+            name
+            for name, value, clean_value in zip(self.STATE_FIELDS, self.persistent_state(), self._clean_state)
+            if value != clean_value
+        ]
+
+    def has_changes(self):
+        """True if the dish or any of its products changed since it was loaded or last saved."""
+        if self.is_dirty():
+            return True
+        current_item_ids = {product.row_id for product in self.products.values() if product.row_id is not None}
+        if self.persisted_item_ids - current_item_ids:
+            return True
+        return any(
+            product.row_id not in self.persisted_item_ids or product.is_dirty()
+            for product in self.products.values()
+        )
+
+    def mark_clean(self, state=None):
+        self._clean_state = state if state is not None else self.persistent_state()
+
+    def adopt_clean_state(self, saved):
+        self._clean_state = saved._clean_state
+        self.persisted_item_ids = set(saved.persisted_item_ids)
+        saved_by_row_id = {
+            product.row_id: product for product in saved.products.values() if product.row_id is not None
+        }
+        claimed_row_ids = {product.row_id for product in self.products.values() if product.row_id is not None}
+        for name, product in self.products.items():
+            if product.row_id is not None:
+                saved_product = saved_by_row_id.get(product.row_id)
+            else:
+                # Inserted by the copy; products are keyed by name within a dish
+                saved_product = saved.products.get(name)
+                if saved_product is None or saved_product.row_id in claimed_row_ids:
+                    continue
+                product.row_id = saved_product.row_id
+                claimed_row_ids.add(product.row_id)
+            if saved_product is not None:
+                product._clean_state = saved_product._clean_state
@@ -2,6 +2,12 @@
 from datetime import datetime
 from Model.dish import Dish
 class Order():
+    # Names of the values in persistent_state(), in the same order
+    STATE_FIELDS = (
+        "created_at", "closed_at", "service_date", "status", "sent_status", "name", "table",
+        "to_go", "additional_notes", "include_additional_notes_in_ticket", "amount_paid", "total_amount",
+    )
+
     def __init__(self, order_id: str):
         self.id = order_id
         self.created_at = datetime.now()
@@ -18,6 +24,12 @@ class Order():
         self.sent_status = False
         self.table = ""
         self.amount_paid = 0.0
+        self.closed_at = ""
+        self._clean_state = None
+        self._clean_token = None
+        self.persisted_dish_ids = set()
+        # Version of the stored row this order was loaded or last saved as; 0 if never saved
+        self.version = 0
 
     def add_dish(self):
         dish_id = str(uuid.uuid4())
@@ -76,5 +88,45 @@ class Order():
 
     def created_time_text(self):
         return self.created_at.strftime("%H:%M")
-
-
+
+    def persistent_state(self):
+        return (
+            self.created_at.isoformat(),
+            self.closed_at,
+            self.service_date or self.created_at.date().isoformat(),
+            self.status,
+            bool(self.sent_status),
+            self.name,
+            self.table,
+            bool(self.to_go),
+            str(self.additional_notes or ""),
+            bool(self.include_additional_notes_in_ticket),
+            float(self.amount_paid),
+            float(self.total_amount),
+        )
+
+    def is_dirty(self):
+        return self.persistent_state() != self._clean_state
+
+    def changed_fields(self):
+        """Names of the fields edited since the order was loaded or last saved."""
+        if self._clean_state is None:
+            return list(self.STATE_FIELDS)
+        return [
+            name
+            for name, value, clean_value in zip(self.STATE_FIELDS, self.persistent_state(), self._clean_state)
+            if value != clean_value
+        ]
+
+    def mark_clean(self, state=None):
+        self._clean_state = state if state is not None else self.persistent_state()
+
+    def adopt_clean_state(self, saved):
+        """Take over what a persisted copy of this order knows about the database rows."""
+        self._clean_state = saved._clean_state
+        self.version = saved.version
+        self.persisted_dish_ids = set(saved.persisted_dish_ids)
+        for dish_id, dish in self.dishes.items():
+            saved_dish = saved.dishes.get(dish_id)
+            if saved_dish is not None:
+                dish.adopt_clean_state(saved_dish)
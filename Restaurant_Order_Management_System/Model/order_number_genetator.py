@@ -1,27 +1,16 @@
 from datetime import datetime
-import re
 
 class OrderNumberGenerator:
-    def __init__(self):
-        self.last_date = None
-        self.counter = 0
+    """Hands out folios O<yyyymmdd><nnnn> numbered by the shared order sequence.
 
-    def seed_from_order_id(self, order_id: str | None):
-        if not order_id:
-            return
-        match = re.fullmatch(r"O(\d{8})(\d{4})", str(order_id).strip())
-        if not match:
-            return
-        self.last_date = match.group(1)
-        self.counter = int(match.group(2))
+    sequence.next_order_number(day) reserves the number, so folios stay
+    unique across terminals and restarts. Past 9999 orders a day the number
+    simply grows a digit.
+    """
+
+    def __init__(self, sequence):
+        self.sequence = sequence
 
     def next(self) -> str:
         today = datetime.now().strftime("%Y%m%d")
-
-        if self.last_date != today:
-            self.last_date = today
-            self.counter = 1
-        else:
-            self.counter += 1
-
-        return f"O{today}{self.counter:04d}"
+        return f"O{today}{self.sequence.next_order_number(today):04d}"
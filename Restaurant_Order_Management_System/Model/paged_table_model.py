@@ -0,0 +1,300 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class PagedTableModel(QAbstractTableModel):
+    """Table model that pulls rows page by page through keyset pagination.
+
+    fetch_page(after_key, limit) returns rows ordered by their first column,
+    starting strictly after after_key (None for the first page).
+    count_rows() returns the total number of rows for the same query.
+    fetch_rows(keys), when given, returns the rows among keys that match the
+    query, so refresh_keys() can patch single rows instead of reloading.
+    Only the key range and size of every loaded page are kept; the rows
+    themselves live in a small LRU of pages, so memory stays flat while
+    scrolling through the whole history.
+    """
+
+    def __init__(self, headers, fetch_page=None, count_rows=None, page_size=200, cached_pages=10,
+                 fetch_rows=None):
+        super().__init__()
+        self._headers = headers
+        self._page_size = page_size
+        self._cached_pages = max(2, cached_pages)
+        self._fetch_page = fetch_page
+        self._count_rows = count_rows
+        self._fetch_rows = fetch_rows
+        self._reset_state()
+        if fetch_page is not None:
+            self._load_first_page()
+
+    def _reset_state(self):
+        # Page n holds the keys in (_page_after_keys[n], _page_last_keys[n]]
+        self._page_after_keys = []
+        self._page_last_keys = []
+        self._page_sizes = []
+        self._page_starts = None
+        self._pages = OrderedDict()
+        self._loaded_rows = 0
+        self._total_rows = 0
+        self._exhausted = True
+
+    def set_query(self, fetch_page, count_rows, fetch_rows=None):
+        self.beginResetModel()
+        self._fetch_page = fetch_page
+        self._count_rows = count_rows
+        self._fetch_rows = fetch_rows
+        self._reset_state()
+        self._load_first_page()
+        self.endResetModel()
+
+    def refresh(self):
+        if self._fetch_page is not None:
+            self.set_query(self._fetch_page, self._count_rows, self._fetch_rows)
+
+    def refresh_keys(self, keys):
+        """Re-read the rows for keys and patch, insert or remove just those rows.
+
+        Keys past the last loaded page are left for fetchMore unless every
+        row is already loaded.
+        """
+        if self._fetch_page is None:
+            return
+        if self._fetch_rows is None:
+            self.refresh()
+            return
+        keys = sorted(set(keys))
+        if not keys:
+            return
+        current = {row[0]: row for row in self._fetch_rows(keys)}
+        keys_by_page = {}
+        for key in keys:
+            page_number = bisect_left(self._page_last_keys, key)
+            if page_number == len(self._page_last_keys):
+                if key in current:
+                    self._append_row(key, current[key])
+                continue
+            keys_by_page.setdefault(page_number, []).append(key)
+        for page_number, page_keys in keys_by_page.items():
+            self._patch_page(page_number, page_keys, current)
+
+    def _patch_page(self, page_number, keys, current):
+        if page_number not in self._pages:
+            self._reload_page(page_number)
+            return
+        rows = self._page(page_number)
+        for key in keys:
+            row = current.get(key)
+            offset = bisect_left([values[0] for values, _display in rows], key)
+            first_row = self._starts()[page_number] + offset
+            found = offset < len(rows) and rows[offset][0][0] == key
+            if found and row is not None:
+                rows[offset] = self._entry_for(row)
+                self.dataChanged.emit(
+                    self.index(first_row, 0), self.index(first_row, len(self._headers) - 1)
+                )
+            elif found:
+                self._resize_rows(page_number, first_row, -1, lambda: rows.pop(offset))
+            elif row is not None:
+                self._resize_rows(page_number, first_row, 1,
+                                  lambda: rows.insert(offset, self._entry_for(row)))
+
+    def _reload_page(self, page_number):
+        # Only the size of an evicted page was kept, not its rows, so there
+        # is no telling which of them changed: the page read back is shown
+        # whole, growing or shrinking at its end
+        rows = self._page(page_number)
+        first_row = self._starts()[page_number]
+        kept_rows = min(len(rows), self._page_sizes[page_number])
+        delta = len(rows) - self._page_sizes[page_number]
+        if delta:
+            self._resize_rows(page_number, first_row + kept_rows, delta)
+        if kept_rows:
+            self.dataChanged.emit(
+                self.index(first_row, 0), self.index(first_row + kept_rows - 1, len(self._headers) - 1)
+            )
+
+    def _resize_rows(self, page_number, first_row, delta, apply=None):
+        if delta > 0:
+            self.beginInsertRows(QModelIndex(), first_row, first_row + delta - 1)
+        else:
+            self.beginRemoveRows(QModelIndex(), first_row, first_row - delta - 1)
+        if apply is not None:
+            apply()
+        self._page_sizes[page_number] += delta
+        self._loaded_rows += delta
+        self._total_rows = max(self._total_rows + delta, self._loaded_rows)
+        self._page_starts = None
+        if delta > 0:
+            self.endInsertRows()
+        else:
+            self.endRemoveRows()
+
+    def _append_row(self, key, row):
+        if not self._exhausted:
+            # fetchMore reaches it with the next page
+            self._total_rows += 1
+            return
+        if not self._page_after_keys:
+            first_row = self._loaded_rows
+            self.beginInsertRows(QModelIndex(), first_row, first_row)
+            self._add_page(None, [self._entry_for(row)])
+            self.endInsertRows()
+            return
+        page_number = len(self._page_after_keys) - 1
+        rows = self._page(page_number)
+        self._page_last_keys[page_number] = key
+        self._resize_rows(page_number, self._loaded_rows, 1, lambda: rows.append(self._entry_for(row)))
+
+    def _starts(self):
+        if self._page_starts is None:
+            starts = []
+            total = 0
+            for size in self._page_sizes:
+                starts.append(total)
+                total += size
+            self._page_starts = starts
+        return self._page_starts
+
+    def _load_first_page(self):
+        self._total_rows = int(self._count_rows()) if self._count_rows else 0
+        self._exhausted = False
+        after_key, rows = self._next_page()
+        self._add_page(after_key, rows)
+
+    def _next_page(self):
+        after_key = self._page_last_keys[-1] if self._page_last_keys else None
+        rows = self._fetch_entries(after_key, self._page_size)
+        if len(rows) < self._page_size:
+            self._exhausted = True
+        return after_key, rows
+
+    def _add_page(self, after_key, rows):
+        if not rows:
+            return
+        page_number = len(self._page_after_keys)
+        self._page_after_keys.append(after_key)
+        self._page_last_keys.append(rows[-1][0][0])
+        self._page_sizes.append(len(rows))
+        self._page_starts = None
+        self._store_page(page_number, rows)
+        self._loaded_rows += len(rows)
+        # The cached count can lag behind inserts made since the last refresh
+        self._total_rows = max(self._total_rows, self._loaded_rows)
+
+    def _fetch_entries(self, after_key, limit):
+        return [self._entry_for(row) for row in self._fetch_page(after_key, limit)]
+
+    def _entry_for(self, row):
+        return (tuple(row), tuple("" if value is None else str(value) for value in row))
+
+    def _load_page(self, page_number):
+        # Patched pages can be larger than page_size; the last key bounds the page
+        last_key = self._page_last_keys[page_number]
+        after_key = self._page_after_keys[page_number]
+        limit = max(self._page_size, self._page_sizes[page_number])
+        rows = []
+        while True:
+            batch = self._fetch_entries(after_key, limit)
+            rows.extend(entry for entry in batch if entry[0][0] <= last_key)
+            if len(batch) < limit or batch[-1][0][0] >= last_key:
+                return rows
+            after_key = batch[-1][0][0]
+
+    def _store_page(self, page_number, rows):
+        self._pages[page_number] = rows
+        self._pages.move_to_end(page_number)
+        while len(self._pages) > self._cached_pages:
+            self._pages.popitem(last=False)
+
+    def _page(self, page_number):
+        rows = self._pages.get(page_number)
+        if rows is None:
+            rows = self._load_page(page_number)
+            self._store_page(page_number, rows)
+        else:
+            self._pages.move_to_end(page_number)
+        return rows
+
+    def _entry(self, row):
+        if row < 0 or row >= self._loaded_rows:
+            return None
+        page_number = bisect_right(self._starts(), row) - 1
+        rows = self._page(page_number)
+        offset = row - self._starts()[page_number]
+        if offset >= len(rows):
+            return None
+        return rows[offset]
+
+    def row_data(self, row):
+        entry = self._entry(row)
+        return entry[0] if entry else None
+
+    def row_for_key(self, key):
+        """Row number of key, fetching further pages if needed. -1 if missing."""
+        while True:
+            page_number = bisect_left(self._page_last_keys, key)
+            if page_number < len(self._page_last_keys):
+                break
+            if not self.canFetchMore(QModelIndex()):
+                return -1
+            loaded_pages = len(self._page_last_keys)
+            self.fetchMore(QModelIndex())
+            if len(self._page_last_keys) == loaded_pages:
+                return -1
+        for offset, (values, _display) in enumerate(self._page(page_number)):
+            if values[0] == key:
+                return self._starts()[page_number] + offset
+        return -1
+
+    def total_rows(self):
+        return self._total_rows
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return self._loaded_rows
+
+    def columnCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._headers)
+
+    def canFetchMore(self, parent):
+        if parent.isValid():
+            return False
+        return not self._exhausted and self._loaded_rows < self._total_rows
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self._fetch_page is None or self._exhausted:
+            return
+        after_key, rows = self._next_page()
+        if not rows:
+            return
+        first_row = self._loaded_rows
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(rows) - 1)
+        self._add_page(after_key, rows)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if not index.isValid():
+            return None
+        entry = self._entry(index.row())
+        if entry is None:
+            return None
+        display = entry[1]
+        column = index.column()
+        if column < 0:
+            return None
+        if column >= len(display):
+            return ""
+        return display[column]
+
+    def headerData(self, section, orientation, role):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self._headers[section]
+            return section + 1
@@ -9,3 +9,21 @@ class Product:
         self.notes = notes
         self.notes_shortcuts = notes_shortcuts or []
         self.is_custom = is_custom
+        self.row_id = None
+        self._clean_state = None
+
+    def persistent_state(self):
+        return (
+            self.name,
+            self.display_name,
+            float(self.price),
+            int(self.quantity),
+            self.notes,
+            bool(self.is_custom),
+        )
+
+    def is_dirty(self):
+        return self.persistent_state() != self._clean_state
+
+    def mark_clean(self, state=None):
+        self._clean_state = state if state is not None else self.persistent_state()
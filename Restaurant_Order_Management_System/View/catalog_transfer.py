@@ -0,0 +1,60 @@
+import os
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox, QProgressDialog
+
+from Infrastructure.catalog_io import FILE_FILTER
+
+
+def _progress_dialog(parent, title):
+    # Row counts only: the file is streamed, so the total is not known up front
+    dialog = QProgressDialog(title, "Cancel", 0, 0, parent)
+    dialog.setWindowTitle(title)
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(300)
+    return dialog
+
+
+def run_import(parent, title, import_file):
+    path, _selected_filter = QFileDialog.getOpenFileName(parent, title, "", FILE_FILTER)
+    if not path:
+        return None
+    dialog = _progress_dialog(parent, title)
+
+    def progress(processed):
+        dialog.setLabelText(f"{processed} rows read")
+        QApplication.processEvents()
+        return not dialog.wasCanceled()
+
+    try:
+        report = import_file(path, progress)
+    except (OSError, ValueError) as exc:
+        dialog.close()
+        QMessageBox.warning(parent, title, f"Could not import the file.\n\nDetails: {exc}")
+        return None
+    dialog.close()
+    QMessageBox.information(parent, title, report.summary())
+    return report
+
+
+def run_export(parent, title, export_file):
+    path, selected_filter = QFileDialog.getSaveFileName(parent, title, "", FILE_FILTER)
+    if not path:
+        return None
+    if not os.path.splitext(path)[1]:
+        path += ".csv" if selected_filter.startswith("CSV") else ".jsonl"
+    dialog = _progress_dialog(parent, title)
+
+    def progress(written):
+        dialog.setLabelText(f"{written} rows written")
+        QApplication.processEvents()
+
+    try:
+        count = export_file(path, progress)
+    except (OSError, ValueError) as exc:
+        dialog.close()
+        QMessageBox.warning(parent, title, f"Could not export the file.\n\nDetails: {exc}")
+        return None
+    dialog.close()
+    QMessageBox.information(parent, title, f"Exported: {count}")
+    return count
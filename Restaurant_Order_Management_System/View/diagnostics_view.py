@@ -0,0 +1,112 @@
+import os
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (
+    QCheckBox,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from Infrastructure.timings import timings
+from Model.table_model import TableModel
+
+
+class DiagnosticsView(QWidget):
+    """Rolling percentiles of the timed spans, refreshed while the page is shown."""
+
+    HEADERS = ["Span", "Calls", "p50 ms", "p95 ms", "p99 ms", "Max ms"]
+
+    def __init__(self, refresh_interval_ms=1000):
+        super().__init__()
+        self.enabled_checkbox = QCheckBox("Record timings")
+        self.enabled_checkbox.setChecked(timings.enabled)
+        self.enabled_checkbox.toggled.connect(self.enabled_toggled)
+        self.status_label = QLabel()
+
+        self.spans_table = QTableView()
+        self.spans_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.spans_model = TableModel([], self.HEADERS)
+        self.spans_table.setModel(self.spans_model)
+        self.spans_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset_clicked)
+        self.export_button = QPushButton("Export JSON")
+        self.export_button.clicked.connect(self.export_clicked)
+
+        # ACTION BUTTONS
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.enabled_checkbox)
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(self.refresh_button)
+        buttons_layout.addWidget(self.reset_button)
+        buttons_layout.addWidget(self.export_button)
+
+        # MAIN LAYOUT
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(buttons_layout)
+        main_layout.addWidget(self.status_label)
+        main_layout.addWidget(self.spans_table)
+        self.setLayout(main_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(refresh_interval_ms)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        rows = [
+            [
+                name,
+                stats["count"],
+                f"{stats['p50_ms']:.2f}",
+                f"{stats['p95_ms']:.2f}",
+                f"{stats['p99_ms']:.2f}",
+                f"{stats['max_ms']:.2f}",
+            ]
+            for name, stats in timings.snapshot().items()
+        ]
+        self.spans_model.update_data(rows)
+        if timings.enabled:
+            self.status_label.setText(f"Percentiles over the last {timings.window} calls of each span.")
+        else:
+            self.status_label.setText("Timings are off. Set APP_TIMINGS=1 to record them from start-up.")
+
+    def enabled_toggled(self, checked):
+        timings.enabled = bool(checked)
+        self.refresh()
+
+    def reset_clicked(self):
+        timings.reset()
+        self.refresh()
+
+    def export_clicked(self):
+        path, _selected_filter = QFileDialog.getSaveFileName(self, "Export timings", "timings.json", "JSON (*.json)")
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += ".json"
+        try:
+            timings.export_json(path)
+        except OSError as exc:
+            QMessageBox.critical(self, "Export failed", f"Could not write the timings.\n\nDetails: {exc}")
+            return
+        QMessageBox.information(self, "Exported", f"Timings written to {path}")
@@ -5,6 +5,7 @@
 from PyQt6.QtGui import QPixmap, QFont
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QMouseEvent
+from View import theme
 
 class DishCard(QWidget):
     remove_button_signal = pyqtSignal(str)
@@ -29,28 +30,24 @@ class DishCard(QWidget):
     def init_ui(self):
         
         #-------------- NAME --------------
-        name_label = QLabel(self.name)
-        name_label.setStyleSheet("color: #1f1f1f;")
-        name_label.setFont(QFont("Segoe UI", 10, QFont.Weight.DemiBold))
-        status_label = QLabel(f"- {self._display_status()}")
-        status_label.setFont(QFont("Segoe UI", 9))
-        status_label.setStyleSheet("color: #6b7280;")
+        name_label = theme.set_role(QLabel(self.name), "title")
+        name_label.setFont(theme.font(10, QFont.Weight.DemiBold))
+        status_label = theme.set_role(QLabel(f"- {self._display_status()}"), "muted")
+        status_label.setFont(theme.font(9))
         #-------------- TOTAL / STATUS --------------
-        total_label = QLabel(f"Total: ${float(self.dish.total_amount):.2f}")
-        total_label.setFont(QFont("Segoe UI", 9))
-        total_label.setStyleSheet("color: #6b7280;")
-        self.to_go_checkbox = QCheckBox("")
+        total_label = theme.set_role(QLabel(f"Total: ${float(self.dish.total_amount):.2f}"), "muted")
+        total_label.setFont(theme.font(9))
+        self.to_go_checkbox = theme.set_role(QCheckBox(""), "plain")
         self.to_go_checkbox.setChecked(self.dish.to_go)
-        self.to_go_checkbox.setStyleSheet("color: #111111;")
         self.to_go_checkbox.toggled.connect(self.to_go_checkbox_toggled)
-        to_go_text_label = QLabel("To go")
-        to_go_text_label.setStyleSheet("color: #111111;")
-        to_go_text_label.setFont(QFont("Segoe UI", 9))
+        to_go_text_label = theme.set_role(QLabel("To go"), "plain")
+        to_go_text_label.setFont(theme.font(9))
         #-------------- ADD --------------
         self.send_button = QPushButton("Send")
         self.send_button.clicked.connect(self.send_button_clicked)
         self.send_button.setFixedHeight(22)
         self.remove_button = QPushButton("Remove")
+        self.remove_button.setObjectName("removeButton")
         self.remove_button.clicked.connect(self.remove_button_clicked)
         self.remove_button.setFixedHeight(22)
 
@@ -92,63 +89,11 @@ class DishCard(QWidget):
         main_layout.setSpacing(4)
 
         self.setLayout(main_layout)
-        self.setObjectName("card")
-        self.setStyleSheet("""
-            QWidget#card {
-                background-color: #f9fafb;
-                border: 1px solid #e5e7eb;
-                border-radius: 6px;
-            }
-            QWidget#card[selected="true"] {
-                background-color: #d1d5db;
-                border: 1px solid #6b7280;
-            }
-            QWidget#card[selected="false"]:hover {
-                background-color: #f1f5f9;
-                border: 1px solid #cbd5e1;
-            }
-
-            QPushButton {
-                background-color: #f3f4f6;
-                color: #374151;
-                border: 1px solid #e5e7eb;
-                border-radius: 4px;
-                font-size: 9pt;
-            }
-
-            QPushButton:hover {
-                background-color: #e5e7eb;
-            }
-
-            QPushButton:pressed {
-                background-color: #d1d5db;
-            }
-        """)
-        self.remove_button.setStyleSheet(
-            "QPushButton {"
-            "  background-color: #fee2e2;"
-            "  color: #991b1b;"
-            "  border: 1px solid #fecaca;"
-            "  border-radius: 4px;"
-            "  font-size: 9pt;"
-            "}"
-            "QPushButton:hover {"
-            "  background-color: #fecaca;"
-            "}"
-            "QPushButton:pressed {"
-            "  background-color: #fca5a5;"
-            "}"
-            "QPushButton:disabled {"
-            "  background-color: #f3f4f6;"
-            "  color: #9ca3af;"
-            "  border: 1px solid #e5e7eb;"
-            "}"
-        )
+        self.setObjectName("dishCard")
+        self.setProperty("selected", False)
 
     def set_selected(self, selected: bool):
-        self.setProperty("selected", selected)
-        self.style().unpolish(self)
-        self.style().polish(self)
+        theme.set_selected(self, selected)
 
     def remove_button_clicked(self):
         self.remove_button_signal.emit(self.id)
@@ -7,13 +7,16 @@ from PyQt6.QtWidgets import (QWidget, QLabel, QVBoxLayout,
                             QDialog, QPlainTextEdit, QCalendarWidget, QGridLayout, QFrame)
 from PyQt6.QtGui import QFont, QFontMetrics, QPainter, QColor
 from PyQt6.QtCore import Qt, QDate, pyqtSignal
-from Infrastructure.connection_db import Database, MenuDatabase
 from Infrastructure.order_repository import OrderRepository
+from Infrastructure.analytics_repository import AnalyticsRepository
 from Model.table_model import TableModel
+from Model.paged_table_model import PagedTableModel
 from Model.ticket_body import TicketBody
 from Controller.order_crud_controller import OrderCrudController
 from Controller.order_controller import OrderController
 from View.order_management_view import OrderManagementView
+from View.order_history_export import OrderHistoryExportDialog
+from View.order_event_signals import order_event_signals
 
 
 class RevenueCalendarWidget(QCalendarWidget):
@@ -570,11 +573,12 @@ class RevenueWeekdayWidget(QWidget):
 
 
 class OrderCrudView(QWidget):
-    def __init__(self):
+    def __init__(self, print_queue=None):
         super().__init__()
 
+        self.print_queue = print_queue
         self.controller = OrderCrudController(self)
-        self._orders_rows_cache = []
+        self.analytics = AnalyticsRepository("orders.db")
         self._selected_analysis_date = QDate.currentDate()
 
         tittle = QLabel("Page 1")
@@ -638,12 +642,15 @@ class OrderCrudView(QWidget):
         self.table_view = QTableView()
         self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.table_view.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
-        current_database = Database("orders.db","orders")
-        data = current_database.fetch_all()
         headers = ["ID", "Created at", "Closed at", "Service date", "Name", "Table name", "Status", "To go", "Amount paid", "Total amount"]
 
-        #
-        self.main_model = TableModel(data, headers)
+        # Rows are pulled in pages while scrolling instead of all at once
+        self.main_model = PagedTableModel(
+            headers,
+            self.controller.db.fetch_page,
+            self.controller.db.count,
+            fetch_rows=lambda ids: self.controller.db.search_by_ids({}, ids),
+        )
         self.table_view.setModel(self.main_model)
 
         #model = TableModel(data, headers)
@@ -685,6 +692,8 @@ class OrderCrudView(QWidget):
         self.tab2_form_line_date.setEnabled(False)
         self.tab2_form_date_enabled.toggled.connect(self.tab2_form_line_date.setEnabled)
         self.tab2_form_line_name = QLineEdit()
+        self.tab2_form_line_product = QLineEdit()
+        self.tab2_form_line_product.setPlaceholderText("Dish or drink in the order")
         self.tab2_form_service_date_enabled = QCheckBox("Use date")
         self.tab2_form_line_service_date = QDateEdit()
         self.tab2_form_line_service_date.setCalendarPopup(True)
@@ -725,6 +734,7 @@ class OrderCrudView(QWidget):
         service_date_row.addWidget(self.tab2_form_line_service_date)
         tab2_form.addRow("Service date: ", service_date_row)
         tab2_form.addRow("Name: ", self.tab2_form_line_name)
+        tab2_form.addRow("Product: ", self.tab2_form_line_product)
         tab2_form.addRow("Table: ", self.tab2_form_line_table)
         tab2_form.addRow("Status: ", self.tab2_form_line_status)
         tab2_form.addRow("To go: ", self.tab2_form_line_to_go)
@@ -755,10 +765,14 @@ class OrderCrudView(QWidget):
         tab2_layout_buttons = QHBoxLayout()
         button_edit = QPushButton("Edit")
         button_edit.clicked.connect(self.button_edit_clicked)
+        self.export_history_dialog = None
+        button_export_history = QPushButton("Export history")
+        button_export_history.clicked.connect(self.button_export_history_clicked)
         tab2_layout_search.addWidget(button_search)
         tab2_layout_buttons.addWidget(button_add_registry)
         tab2_layout_buttons.addWidget(button_delete)
         tab2_layout_buttons.addWidget(button_edit)
+        tab2_layout_buttons.addWidget(button_export_history)
 
         preview_group = QGroupBox("Ticket preview")
         preview_group_layout = QVBoxLayout()
@@ -1001,19 +1015,28 @@ class OrderCrudView(QWidget):
         main_layout = QVBoxLayout()
         main_layout.addWidget(tabs)
         self.setLayout(main_layout)
+        self._calendar_stale = False
+        order_event_signals().changed.connect(self.orders_changed)
 
     def showEvent(self, event):
         super().showEvent(event)
-        # Refresh data each time the view is shown to keep the calendar in sync
-        # with orders created elsewhere in the app.
+        # Order changes patch the table as they are published; the calendar
+        # catches up here if they arrived while the view was hidden.
+        if self._calendar_stale:
+            self._calendar_stale = False
+            self.load_calendar_revenue()
+
+    def orders_changed(self, change):
+        if change.db_path != self.controller.db.database:
+            return
         try:
-            self.controller.refresh_table()
+            self.controller.orders_changed(change.order_ids)
         except Exception:
             pass
-        try:
+        if self.isVisible():
             self.load_calendar_revenue()
-        except Exception:
-            pass
+        else:
+            self._calendar_stale = True
  
     def button_add_registry_clicked(self):
         self.open_new_ticket_modal()
@@ -1034,6 +1057,7 @@ class OrderCrudView(QWidget):
             "service_date": service_date_filter,
             "table_name": self.tab2_form_line_table.currentText(),
             "name": self.tab2_form_line_name.text(),
+            "products": self.tab2_form_line_product.text(),
             "status": self.tab2_form_line_status.currentText(),
             "to_go": self.tab2_form_line_to_go.currentText(),
             "total_amount_op": self.tab2_form_total_amount_operator.currentText(),
@@ -1052,37 +1076,15 @@ class OrderCrudView(QWidget):
         
         #row = index.row()
         #self.controller.button_delete_clicked(row)
+        # The table, calendar and open orders follow through orders_changed
         self.controller.delete_selected()
-        self.load_calendar_revenue()
-        # Notify main order management view (if present) to reload open orders
-        try:
-            top = self.window()
-            if top is not None and hasattr(top, "order_management_view"):
-                # Refresh orders from database to get updated data
-                if hasattr(top.order_management_view, "refresh_orders_from_database"):
-                    top.order_management_view.refresh_orders_from_database()
-                else:
-                    # Fallback to manual refresh
-                    main_repo = OrderRepository("orders.db")
-                    open_orders = main_repo.load_open_orders()
-                    # Check if active order was deleted
-                    active_order = top.order_management_view.controller.get_active_order()
-                    if active_order and active_order.id not in open_orders:
-                        # Order was deleted, clear everything like remove_order_clicked does
-                        top.order_management_view.controller.clear_active_selection()
-                        top.order_management_view.orders_list_widget.set_active(None)
-                        top.order_management_view.in_progress_orders_list_widget.set_active(None)
-                        top.order_management_view.dish_list_widget.clear()
-                        top.order_management_view.selected_products_list.clear()
-                        top.order_management_view.update_active_dish_total_label()
-                        top.order_management_view.update_active_order_total_label()
-                        top.order_management_view.update_ticket_management_visibility()
-                        top.order_management_view.clear_form()
-                    # Update orders from database
-                    top.order_management_view.controller.set_orders(open_orders)
-                    top.order_management_view.render_orders()
-        except Exception:
-            pass
+
+    def button_export_history_clicked(self):
+        # Modeless, so orders can still be edited while a long export runs
+        if self.export_history_dialog is None:
+            self.export_history_dialog = OrderHistoryExportDialog(parent=self)
+        self.export_history_dialog.show()
+        self.export_history_dialog.raise_()
 
     def button_edit_clicked(self):
         index = self.table_view.currentIndex()
@@ -1093,7 +1095,7 @@ class OrderCrudView(QWidget):
         
         row = index.row()
         model = self.table_view.model()
-        order_id = str(model._data[row][0])
+        order_id = str(model.row_data(row)[0])
         self.open_ticket_modal(order_id)
     
     def update_selection_table(self, selected=None, deselected=None):
@@ -1141,7 +1143,7 @@ class OrderCrudView(QWidget):
         modal.resize(1200, 760)
         modal_layout = QVBoxLayout(modal)
 
-        order_controller = OrderController(repository)
+        order_controller = OrderController(repository, print_queue=self.print_queue)
         order_management_view = OrderManagementView(order_controller, show_orders_panel=False)
         order_management_view.set_single_order(order)
         modal_layout.addWidget(order_management_view)
@@ -1160,30 +1162,22 @@ class OrderCrudView(QWidget):
                 QMessageBox.warning(modal, "No ticket", "There is no active ticket to save.")
                 return
             try:
-                repository.save_order(active_order)
+                saved_order = order_controller.save_order(active_order)
             except Exception as exc:
                 QMessageBox.critical(modal, "Error saving", f"Could not save the ticket.\n\nDetails: {exc}")
                 return
-            self.controller.refresh_table()
-            self.load_calendar_revenue()
-            # Notify main order management view (if present) to reload open orders
-            try:
-                top = self.window()
-                if top is not None and hasattr(top, "order_management_view"):
-                    # Refresh orders from database to get updated data
-                    if hasattr(top.order_management_view, "refresh_orders_from_database"):
-                        top.order_management_view.refresh_orders_from_database()
-                    else:
-                        # Fallback to manual refresh if method doesn't exist
-                        main_repo = OrderRepository("orders.db")
-                        open_orders = main_repo.load_open_orders()
-                        top.order_management_view.controller.set_orders(open_orders)
-                        top.order_management_view.render_orders()
-                        # Re-select the updated order if it still exists
-                        if active_order.id in open_orders:
-                            top.order_management_view.order_selected(active_order.id)
-            except Exception:
-                pass
+            if saved_order is None:
+                QMessageBox.warning(modal, "Ticket deleted", "This ticket was deleted on another terminal.")
+                modal.accept()
+                return
+            if saved_order is not active_order:
+                order_management_view.set_single_order(saved_order)
+                QMessageBox.information(
+                    modal,
+                    "Saved",
+                    "This ticket was also changed on another terminal. Both sets of changes were kept and saved.",
+                )
+                return
             QMessageBox.information(modal, "Saved", "Changes saved successfully.")
 
         save_button.clicked.connect(save_changes)
@@ -1192,7 +1186,7 @@ class OrderCrudView(QWidget):
 
     def open_new_ticket_modal(self):
         repository = OrderRepository("orders.db")
-        order_controller = OrderController(repository)
+        order_controller = OrderController(repository, print_queue=self.print_queue)
         order_management_view = OrderManagementView(order_controller, show_orders_panel=False)
 
         new_order = order_controller.new_order_button_clicked()
@@ -1218,22 +1212,10 @@ class OrderCrudView(QWidget):
                 QMessageBox.warning(modal, "No ticket", "There is no active ticket to save.")
                 return
             try:
-                repository.save_order(active_order)
+                order_controller.save_order(active_order)
             except Exception as exc:
                 QMessageBox.critical(modal, "Error saving", f"Could not save the order.\n\nDetails: {exc}")
                 return
-            self.controller.refresh_table()
-            self.load_calendar_revenue()
-            # Notify main order management view (if present) to reload open orders
-            try:
-                top = self.window()
-                if top is not None and hasattr(top, "order_management_view"):
-                    main_repo = OrderRepository("orders.db")
-                    open_orders = main_repo.load_open_orders()
-                    top.order_management_view.controller.set_orders(open_orders)
-                    top.order_management_view.render_orders()
-            except Exception:
-                pass
             QMessageBox.information(modal, "Saved", "Order created successfully.")
             modal.accept()
 
@@ -1249,7 +1231,11 @@ class OrderCrudView(QWidget):
 
         row = index.row()
         model = self.table_view.model()
-        order_id = str(model._data[row][0])
+        row_data = model.row_data(row)
+        if row_data is None:
+            self.ticket_preview.clear()
+            return
+        order_id = str(row_data[0])
 
         repository = OrderRepository("orders.db")
         order = repository.load_order(order_id)
@@ -1267,29 +1253,16 @@ class OrderCrudView(QWidget):
     def refresh_all_orders(self):
         """Refresh the orders table with all database records"""
         try:
-            rows = Database("orders.db", "orders").fetch_all()
-            headers = ["ID", "Created at", "Closed at", "Service date", "Name", "Table name", "Status", "To go", "Amount paid", "Total amount"]
-            self.main_model.update_data(rows)
+            self.controller.refresh_table()
         except Exception:
             pass
 
     def load_calendar_revenue(self):
         try:
-            rows = Database("orders.db", "orders").fetch_all()
+            revenue_map = self.analytics.revenue_by_date()
         except Exception:
-            rows = []
+            revenue_map = {}
 
-        revenue_map = {}
-        for row in rows:
-            date_key = self._calendar_date_from_order_row(row)
-            if not date_key:
-                continue
-            amount_paid = self._to_float(row[8]) if len(row) > 8 else 0.0
-            total_amount = self._to_float(row[9]) if len(row) > 9 else 0.0
-            amount = amount_paid if amount_paid > 0 else total_amount
-            revenue_map[date_key] = revenue_map.get(date_key, 0.0) + amount
-
-        self._orders_rows_cache = rows
         if hasattr(self, "calendar_view") and hasattr(self.calendar_view, "set_revenue_map"):
             self.calendar_view.set_revenue_map(revenue_map)
         if hasattr(self, "calendar_cards_view") and hasattr(self.calendar_cards_view, "set_revenue_map"):
@@ -1301,28 +1274,6 @@ class OrderCrudView(QWidget):
         self.refresh_weekday_view()
         self.update_day_analysis(self._selected_analysis_date)
 
-    def _calendar_date_from_order_row(self, row):
-        candidates = []
-        if len(row) > 3:
-            candidates.append(row[3])  # service_date
-        if len(row) > 1:
-            candidates.append(row[1])  # created_at
-        if len(row) > 2:
-            candidates.append(row[2])  # closed_at
-        for value in candidates:
-            text = str(value or "").strip()
-            if len(text) >= 10:
-                date_text = text[:10]
-                if QDate.fromString(date_text, "yyyy-MM-dd").isValid():
-                    return date_text
-        return ""
-
-    def _to_float(self, value):
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return 0.0
-
     def on_calendar_date_clicked(self, date):
         if not isinstance(date, QDate):
             return
@@ -1355,12 +1306,9 @@ class OrderCrudView(QWidget):
         if not hasattr(self, "day_analysis_text"):
             return
         date_key = date.toString("yyyy-MM-dd")
-        rows = []
-        for row in self._orders_rows_cache:
-            if self._calendar_date_from_order_row(row) == date_key:
-                rows.append(row)
+        stats = self._range_analysis(date_key, date_key)
 
-        if not rows:
+        if stats is None:
             self.day_analysis_title.setText(f"Day: {date_key}")
             self.day_analysis_text.setPlainText("No records for this day.")
             if hasattr(self, "day_analysis_title_cards"):
@@ -1369,50 +1317,16 @@ class OrderCrudView(QWidget):
                 self.day_analysis_text_cards.setPlainText("No records for this day.")
             return
 
-        total_revenue = 0.0
-        paid_revenue = 0.0
-        closed_count = 0
-        to_go_count = 0
-        tables = {}
-        for row in rows:
-            amount_paid = self._to_float(row[8]) if len(row) > 8 else 0.0
-            total_amount = self._to_float(row[9]) if len(row) > 9 else 0.0
-            total_revenue += (amount_paid if amount_paid > 0 else total_amount)
-            paid_revenue += amount_paid
-            status = str(row[6]).strip().lower() if len(row) > 6 else ""
-            if status == "closed":
-                closed_count += 1
-            to_go_raw = str(row[7]).strip().lower() if len(row) > 7 else ""
-            if to_go_raw in {"1", "true", "yes"}:
-                to_go_count += 1
-            table_name = str(row[5]).strip() if len(row) > 5 else ""
-            if table_name:
-                tables[table_name] = tables.get(table_name, 0) + 1
-
-        orders_count = len(rows)
-        avg_ticket = (total_revenue / orders_count) if orders_count else 0.0
-        avg_total = total_revenue
-        top_table = "-"
-        if tables:
-            top_table = max(tables.items(), key=lambda kv: kv[1])[0]
-        top_dish_name, top_dish_qty = self._top_dish_for_rows(rows)
-        top_food_name, top_food_qty, top_drink_name, top_drink_qty = self._top_food_and_drink_for_rows(rows)
-        peak_hours_text = self._peak_hours_text_for_rows(rows)
-
         self.day_analysis_title.setText(f"Day: {date_key}")
         analysis_text = (
-            f"Orders: {orders_count}\n"
-            f"Total: ${total_revenue:,.2f}\n"
-            f"Average total (day): ${avg_total:,.2f}\n"
-            f"Paid: ${paid_revenue:,.2f}\n"
-            f"Average ticket: ${avg_ticket:,.2f}\n"
-            f"Closed: {closed_count}\n"
-            f"To go: {to_go_count}\n"
-            f"Most used table: {top_table}\n"
-            f"Most purchased dish: {top_dish_name} ({top_dish_qty})\n"
-            f"Most ordered food: {top_food_name} ({top_food_qty})\n"
-            f"Most ordered drink: {top_drink_name} ({top_drink_qty})\n"
-            f"Peak hours: {peak_hours_text}"
+            f"Orders: {stats['orders']}\n"
+            f"Total: ${stats['revenue']:,.2f}\n"
+            f"Average total (day): ${stats['revenue']:,.2f}\n"
+            f"Paid: ${stats['paid']:,.2f}\n"
+            f"Average ticket: ${stats['avg_ticket']:,.2f}\n"
+            f"Closed: {stats['closed']}\n"
+            f"To go: {stats['to_go']}\n"
+            + self._ranking_lines(stats)
         )
         self.day_analysis_text.setPlainText(analysis_text)
         if hasattr(self, "day_analysis_title_cards"):
@@ -1420,238 +1334,90 @@ class OrderCrudView(QWidget):
         if hasattr(self, "day_analysis_text_cards"):
             self.day_analysis_text_cards.setPlainText(analysis_text)
 
-    def _top_dish_for_rows(self, rows):
-        counts = {}
-        repository = OrderRepository("orders.db")
-        for row in rows:
-            order_id = str(row[0]).strip() if len(row) > 0 else ""
-            if not order_id:
-                continue
-            order = repository.load_order(order_id)
-            if not order:
-                continue
-            for dish in order.dishes.values():
-                for product in dish.products.values():
-                    display_name = (getattr(product, "display_name", None) or product.name or "").strip()
-                    if not display_name:
-                        continue
-                    qty = int(getattr(product, "quantity", 0) or 0)
-                    counts[display_name] = counts.get(display_name, 0) + max(qty, 0)
-        if not counts:
-            return "-", 0
-        name, qty = max(counts.items(), key=lambda kv: kv[1])
-        return name, qty
-
-    def _top_food_and_drink_for_rows(self, rows):
-        type_map = self._menu_product_type_map()
-        food_counts = {}
-        drink_counts = {}
-        repository = OrderRepository("orders.db")
-        for row in rows:
-            order_id = str(row[0]).strip() if len(row) > 0 else ""
-            if not order_id:
-                continue
-            order = repository.load_order(order_id)
-            if not order:
-                continue
-            for dish in order.dishes.values():
-                for product in dish.products.values():
-                    product_name = (product.name or "").strip()
-                    display_name = (getattr(product, "display_name", None) or product_name).strip()
-                    if not display_name:
-                        continue
-                    qty = int(getattr(product, "quantity", 0) or 0)
-                    if qty <= 0:
-                        continue
-                    product_type = type_map.get(product_name.lower(), "")
-                    if product_type in {"food", "comida"}:
-                        food_counts[display_name] = food_counts.get(display_name, 0) + qty
-                    elif product_type in {"drink", "bebida"}:
-                        drink_counts[display_name] = drink_counts.get(display_name, 0) + qty
-
-        food_name, food_qty = ("-", 0)
-        drink_name, drink_qty = ("-", 0)
-        if food_counts:
-            food_name, food_qty = max(food_counts.items(), key=lambda kv: kv[1])
-        if drink_counts:
-            drink_name, drink_qty = max(drink_counts.items(), key=lambda kv: kv[1])
-        return food_name, food_qty, drink_name, drink_qty
-
-    def _menu_product_type_map(self):
+    def _range_analysis(self, start_key, end_key, weekday=None):
+        """Figures shared by the day, week, month and weekday panels, or None without orders."""
         try:
-            menu_rows = MenuDatabase("orders.db", "menu").fetch_all()
+            stats = self.analytics.summary(start_key, end_key, weekday)
         except Exception:
-            menu_rows = []
-        product_type_map = {}
-        for row in menu_rows:
-            if len(row) < 8:
-                continue
-            name = str(row[1] or "").strip().lower()
-            product_type = str(row[7] or "").strip().lower()
-            if not name:
-                continue
-            if product_type not in {"food", "drink", "comida", "bebida"}:
-                product_type = "food"
-            product_type_map[name] = product_type
-        return product_type_map
-
-    def _extract_order_hour(self, row):
-        text = str(row[1] if len(row) > 1 else "").strip()  # created_at
-        if len(text) >= 13 and text[10] in {"T", " "}:
-            hour_text = text[11:13]
-        elif len(text) >= 2:
-            hour_text = text[:2]
-        else:
-            return -1
-        try:
-            hour = int(hour_text)
-            if 0 <= hour <= 23:
-                return hour
-        except ValueError:
-            return -1
-        return -1
-
-    def _peak_hours_text_for_rows(self, rows, top_n=3):
-        hour_counts = {}
-        for row in rows:
-            hour = self._extract_order_hour(row)
-            if hour < 0:
-                continue
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
-        if not hour_counts:
-            return "-"
-        ranked = sorted(hour_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:top_n]
-        return ", ".join([f"{hour:02d}:00 ({count})" for hour, count in ranked])
+            return None
+        if stats["orders"] <= 0:
+            return None
+        stats["avg_ticket"] = stats["revenue"] / stats["orders"]
+        stats["top_table"] = self.analytics.top_table(start_key, end_key, weekday)
+        top_dish = self.analytics.top_products(start_key, end_key, weekday)
+        top_food = self.analytics.top_products(start_key, end_key, weekday, ("food", "comida"))
+        top_drink = self.analytics.top_products(start_key, end_key, weekday, ("drink", "bebida"))
+        stats["top_dish"] = top_dish[0] if top_dish else ("-", 0)
+        stats["top_food_and_drink"] = (
+            (top_food[0] if top_food else ("-", 0))
+            + (top_drink[0] if top_drink else ("-", 0))
+        )
+        peak_hours = self.analytics.peak_hours(start_key, end_key, weekday)
+        stats["peak_hours"] = (
+            ", ".join([f"{hour:02d}:00 ({count})" for hour, count in peak_hours])
+            if peak_hours
+            else "-"
+        )
+        return stats
+
+    def _ranking_lines(self, stats):
+        top_dish_name, top_dish_qty = stats["top_dish"]
+        top_food_name, top_food_qty, top_drink_name, top_drink_qty = stats["top_food_and_drink"]
+        return (
+            f"Most used table: {stats['top_table']}\n"
+            f"Most purchased dish: {top_dish_name} ({top_dish_qty})\n"
+            f"Most ordered food: {top_food_name} ({top_food_qty})\n"
+            f"Most ordered drink: {top_drink_name} ({top_drink_qty})\n"
+            f"Peak hours: {stats['peak_hours']}"
+        )
 
     def update_week_analysis(self, week_start, week_end):
         if not hasattr(self, "week_analysis_text"):
             return
-        rows = []
-        for row in self._orders_rows_cache:
-            date_text = self._calendar_date_from_order_row(row)
-            if not date_text:
-                continue
-            date_value = QDate.fromString(date_text, "yyyy-MM-dd")
-            if not date_value.isValid():
-                continue
-            if week_start <= date_value <= week_end:
-                rows.append(row)
+        stats = self._range_analysis(week_start.toString("yyyy-MM-dd"), week_end.toString("yyyy-MM-dd"))
 
         range_text = f"{week_start.toString('yyyy-MM-dd')} to {week_end.toString('yyyy-MM-dd')}"
         self.week_analysis_title.setText(f"Week: {range_text}")
-        if not rows:
+        if stats is None:
             self.week_analysis_text.setPlainText("No records for this week.")
             return
 
-        total_revenue = 0.0
-        paid_revenue = 0.0
-        closed_count = 0
-        to_go_count = 0
-        tables = {}
-        for row in rows:
-            amount_paid = self._to_float(row[8]) if len(row) > 8 else 0.0
-            total_amount = self._to_float(row[9]) if len(row) > 9 else 0.0
-            total_revenue += (amount_paid if amount_paid > 0 else total_amount)
-            paid_revenue += amount_paid
-            status = str(row[6]).strip().lower() if len(row) > 6 else ""
-            if status == "closed":
-                closed_count += 1
-            to_go_raw = str(row[7]).strip().lower() if len(row) > 7 else ""
-            if to_go_raw in {"1", "true", "yes"}:
-                to_go_count += 1
-            table_name = str(row[5]).strip() if len(row) > 5 else ""
-            if table_name:
-                tables[table_name] = tables.get(table_name, 0) + 1
-
-        orders_count = len(rows)
-        avg_ticket = (total_revenue / orders_count) if orders_count else 0.0
         day_count = max(1, week_start.daysTo(week_end) + 1)
-        avg_total = total_revenue / day_count
-        top_table = "-"
-        if tables:
-            top_table = max(tables.items(), key=lambda kv: kv[1])[0]
-        top_dish_name, top_dish_qty = self._top_dish_for_rows(rows)
-        top_food_name, top_food_qty, top_drink_name, top_drink_qty = self._top_food_and_drink_for_rows(rows)
-        peak_hours_text = self._peak_hours_text_for_rows(rows)
+        avg_total = stats["revenue"] / day_count
         analysis_text = (
-            f"Orders: {orders_count}\n"
-            f"Total: ${total_revenue:,.2f}\n"
+            f"Orders: {stats['orders']}\n"
+            f"Total: ${stats['revenue']:,.2f}\n"
             f"Average total (week): ${avg_total:,.2f}\n"
-            f"Paid: ${paid_revenue:,.2f}\n"
-            f"Average ticket: ${avg_ticket:,.2f}\n"
-            f"Closed: {closed_count}\n"
-            f"To go: {to_go_count}\n"
-            f"Most used table: {top_table}\n"
-            f"Most purchased dish: {top_dish_name} ({top_dish_qty})\n"
-            f"Most ordered food: {top_food_name} ({top_food_qty})\n"
-            f"Most ordered drink: {top_drink_name} ({top_drink_qty})\n"
-            f"Peak hours: {peak_hours_text}"
+            f"Paid: ${stats['paid']:,.2f}\n"
+            f"Average ticket: ${stats['avg_ticket']:,.2f}\n"
+            f"Closed: {stats['closed']}\n"
+            f"To go: {stats['to_go']}\n"
+            + self._ranking_lines(stats)
         )
         self.week_analysis_text.setPlainText(analysis_text)
 
     def update_month_analysis(self, month_start, month_end):
         if not hasattr(self, "month_analysis_text"):
             return
-        rows = []
-        for row in self._orders_rows_cache:
-            date_text = self._calendar_date_from_order_row(row)
-            if not date_text:
-                continue
-            date_value = QDate.fromString(date_text, "yyyy-MM-dd")
-            if not date_value.isValid():
-                continue
-            if month_start <= date_value <= month_end:
-                rows.append(row)
+        stats = self._range_analysis(month_start.toString("yyyy-MM-dd"), month_end.toString("yyyy-MM-dd"))
 
         range_text = f"{month_start.toString('yyyy-MM-dd')} to {month_end.toString('yyyy-MM-dd')}"
         self.month_analysis_title.setText(f"Month: {range_text}")
-        if not rows:
+        if stats is None:
             self.month_analysis_text.setPlainText("No records for this month.")
             return
 
-        total_revenue = 0.0
-        paid_revenue = 0.0
-        closed_count = 0
-        to_go_count = 0
-        tables = {}
-        for row in rows:
-            amount_paid = self._to_float(row[8]) if len(row) > 8 else 0.0
-            total_amount = self._to_float(row[9]) if len(row) > 9 else 0.0
-            total_revenue += (amount_paid if amount_paid > 0 else total_amount)
-            paid_revenue += amount_paid
-            status = str(row[6]).strip().lower() if len(row) > 6 else ""
-            if status == "closed":
-                closed_count += 1
-            to_go_raw = str(row[7]).strip().lower() if len(row) > 7 else ""
-            if to_go_raw in {"1", "true", "yes"}:
-                to_go_count += 1
-            table_name = str(row[5]).strip() if len(row) > 5 else ""
-            if table_name:
-                tables[table_name] = tables.get(table_name, 0) + 1
-
-        orders_count = len(rows)
-        avg_ticket = (total_revenue / orders_count) if orders_count else 0.0
         day_count = max(1, month_start.daysTo(month_end) + 1)
-        avg_total = total_revenue / day_count
-        top_table = "-"
-        if tables:
-            top_table = max(tables.items(), key=lambda kv: kv[1])[0]
-        top_dish_name, top_dish_qty = self._top_dish_for_rows(rows)
-        top_food_name, top_food_qty, top_drink_name, top_drink_qty = self._top_food_and_drink_for_rows(rows)
-        peak_hours_text = self._peak_hours_text_for_rows(rows)
+        avg_total = stats["revenue"] / day_count
         analysis_text = (
-            f"Orders: {orders_count}\n"
-            f"Total: ${total_revenue:,.2f}\n"
+            f"Orders: {stats['orders']}\n"
+            f"Total: ${stats['revenue']:,.2f}\n"
             f"Average total (month): ${avg_total:,.2f}\n"
-            f"Paid: ${paid_revenue:,.2f}\n"
-            f"Average ticket: ${avg_ticket:,.2f}\n"
-            f"Closed: {closed_count}\n"
-            f"To go: {to_go_count}\n"
-            f"Most used table: {top_table}\n"
-            f"Most purchased dish: {top_dish_name} ({top_dish_qty})\n"
-            f"Most ordered food: {top_food_name} ({top_food_qty})\n"
-            f"Most ordered drink: {top_drink_name} ({top_drink_qty})\n"
-            f"Peak hours: {peak_hours_text}"
+            f"Paid: ${stats['paid']:,.2f}\n"
+            f"Average ticket: ${stats['avg_ticket']:,.2f}\n"
+            f"Closed: {stats['closed']}\n"
+            f"To go: {stats['to_go']}\n"
+            + self._ranking_lines(stats)
         )
         self.month_analysis_text.setPlainText(analysis_text)
 
@@ -1659,7 +1425,8 @@ class OrderCrudView(QWidget):
         if not hasattr(self, "weekday_analysis_text"):
             return
         weekday_names = {1: "Monday", 2: "Tuesday", 3: "Wednesday", 4: "Thursday", 5: "Friday", 6: "Saturday", 7: "Sunday"}
-        rows = self._rows_for_weekday_in_selected_range(weekday_number)
+        start, end, _ = self._selected_weekday_range()
+        stats = self._range_analysis(start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd"), weekday_number)
 
         day_name = weekday_names.get(weekday_number, str(weekday_number))
         range_label = getattr(self, "_weekday_range_label", "")
@@ -1667,57 +1434,25 @@ class OrderCrudView(QWidget):
         if range_label:
             title += f" ({range_label})"
         self.weekday_analysis_title.setText(title)
-        if not rows:
+        if stats is None:
             self.weekday_analysis_text.setPlainText("No records for this weekday.")
             return
 
-        total_revenue = 0.0
-        paid_revenue = 0.0
-        closed_count = 0
-        to_go_count = 0
-        tables = {}
-        for row in rows:
-            amount_paid = self._to_float(row[8]) if len(row) > 8 else 0.0
-            total_amount = self._to_float(row[9]) if len(row) > 9 else 0.0
-            total_revenue += (amount_paid if amount_paid > 0 else total_amount)
-            paid_revenue += amount_paid
-            status = str(row[6]).strip().lower() if len(row) > 6 else ""
-            if status == "closed":
-                closed_count += 1
-            to_go_raw = str(row[7]).strip().lower() if len(row) > 7 else ""
-            if to_go_raw in {"1", "true", "yes"}:
-                to_go_count += 1
-            table_name = str(row[5]).strip() if len(row) > 5 else ""
-            if table_name:
-                tables[table_name] = tables.get(table_name, 0) + 1
-
-        orders_count = len(rows)
-        avg_ticket = (total_revenue / orders_count) if orders_count else 0.0
-        top_table = "-"
-        if tables:
-            top_table = max(tables.items(), key=lambda kv: kv[1])[0]
-        top_dish_name, top_dish_qty = self._top_dish_for_rows(rows)
-        top_food_name, top_food_qty, top_drink_name, top_drink_qty = self._top_food_and_drink_for_rows(rows)
-        peak_hours_text = self._peak_hours_text_for_rows(rows)
-        stats = getattr(self, "_weekday_stats_cache", {}).get(weekday_number, {})
-        day_count = int(stats.get("day_count", 0) or 0)
-        avg_total = float(stats.get("avg_total", 0.0) or 0.0)
-        avg_orders = float(stats.get("avg_orders", 0.0) or 0.0)
+        weekday_stats = getattr(self, "_weekday_stats_cache", {}).get(weekday_number, {})
+        day_count = int(weekday_stats.get("day_count", 0) or 0)
+        avg_total = float(weekday_stats.get("avg_total", 0.0) or 0.0)
+        avg_orders = float(weekday_stats.get("avg_orders", 0.0) or 0.0)
         analysis_text = (
             f"Calendar repeats: {day_count}\n"
-            f"Orders: {orders_count}\n"
-            f"Total: ${total_revenue:,.2f}\n"
+            f"Orders: {stats['orders']}\n"
+            f"Total: ${stats['revenue']:,.2f}\n"
             f"Average total ({day_name}): ${avg_total:,.2f}\n"
-            f"Paid: ${paid_revenue:,.2f}\n"
+            f"Paid: ${stats['paid']:,.2f}\n"
             f"Average orders ({day_name}): {avg_orders:.2f}\n"
-            f"Average ticket: ${avg_ticket:,.2f}\n"
-            f"Closed: {closed_count}\n"
-            f"To go: {to_go_count}\n"
-            f"Most used table: {top_table}\n"
-            f"Most purchased dish: {top_dish_name} ({top_dish_qty})\n"
-            f"Most ordered food: {top_food_name} ({top_food_qty})\n"
-            f"Most ordered drink: {top_drink_name} ({top_drink_qty})\n"
-            f"Peak hours: {peak_hours_text}"
+            f"Average ticket: ${stats['avg_ticket']:,.2f}\n"
+            f"Closed: {stats['closed']}\n"
+            f"To go: {stats['to_go']}\n"
+            + self._ranking_lines(stats)
         )
         self.weekday_analysis_text.setPlainText(analysis_text)
 
@@ -1734,20 +1469,6 @@ class OrderCrudView(QWidget):
         label = start.toString("yyyy-MM")
         return start, end, label
 
-    def _rows_for_weekday_in_selected_range(self, weekday_number):
-        start, end, _ = self._selected_weekday_range()
-        rows = []
-        for row in self._orders_rows_cache:
-            date_text = self._calendar_date_from_order_row(row)
-            if not date_text:
-                continue
-            date_value = QDate.fromString(date_text, "yyyy-MM-dd")
-            if not date_value.isValid():
-                continue
-            if start <= date_value <= end and date_value.dayOfWeek() == int(weekday_number):
-                rows.append(row)
-        return rows
-
     def _compute_weekday_stats_for_selected_range(self):
         start, end, label = self._selected_weekday_range()
         stats = {
@@ -1760,19 +1481,17 @@ class OrderCrudView(QWidget):
             stats[cursor.dayOfWeek()]["day_count"] += 1
             cursor = cursor.addDays(1)
 
-        for row in self._orders_rows_cache:
-            date_text = self._calendar_date_from_order_row(row)
-            if not date_text:
-                continue
+        try:
+            daily_totals = self.analytics.daily_totals(start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd"))
+        except Exception:
+            daily_totals = {}
+        for date_text, (amount, orders) in daily_totals.items():
             date_value = QDate.fromString(date_text, "yyyy-MM-dd")
-            if not date_value.isValid() or not (start <= date_value <= end):
+            if not date_value.isValid():
                 continue
             wd = date_value.dayOfWeek()
-            amount_paid = self._to_float(row[8]) if len(row) > 8 else 0.0
-            total_amount = self._to_float(row[9]) if len(row) > 9 else 0.0
-            amount = amount_paid if amount_paid > 0 else total_amount
             stats[wd]["sum_total"] += amount
-            stats[wd]["orders"] += 1
+            stats[wd]["orders"] += orders
 
         for wd in range(1, 8):
             days = max(1, stats[wd]["day_count"])
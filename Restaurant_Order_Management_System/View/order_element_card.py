@@ -4,6 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont, QMouseEvent, QDoubleValidator
 from PyQt6.QtCore import Qt, pyqtSignal
+from View import theme
 
 
 class GuardedWheelSpinBox(QSpinBox):
@@ -40,33 +41,25 @@ class OrderElementCard(QWidget):
     def init_ui(self):
         # -------- TOP ROW --------
         display_name = getattr(self.product, "display_name", self.product.name)
-        self.name_label = QLabel(display_name)
-        self.name_label.setFont(QFont("Segoe UI", 10, QFont.Weight.DemiBold))
-        self.name_label.setStyleSheet("color: #1f1f1f;")
+        self.name_label = theme.set_role(QLabel(display_name), "title")
+        self.name_label.setFont(theme.font(10, QFont.Weight.DemiBold))
         self.name_input = QLineEdit(display_name)
         self.name_input.editingFinished.connect(self.on_name_edited)
 
-        self.price_label = QLabel(f"${self.product.price}")
-        self.price_label.setFont(QFont("Segoe UI", 9, QFont.Weight.DemiBold))
-        self.price_label.setStyleSheet("color: #111827;")
-        self.price_prefix_label = QLabel("Price:")
-        self.price_prefix_label.setFont(QFont("Segoe UI", 9))
-        self.price_prefix_label.setStyleSheet("color: #6b7280;")
+        self.price_label = theme.set_role(QLabel(f"${self.product.price}"), "value")
+        self.price_label.setFont(theme.font(9, QFont.Weight.DemiBold))
+        self.price_prefix_label = theme.set_role(QLabel("Price:"), "muted")
+        self.price_prefix_label.setFont(theme.font(9))
         self.price_input = QLineEdit()
+        self.price_input.setObjectName("priceInput")
         self.price_input.setValidator(QDoubleValidator(0.0, 99999.0, 2))
         self.price_input.editingFinished.connect(self.on_price_edited)
-        self.price_input.setStyleSheet(
-            "font-weight: 600;"
-            "color: #111827;"
-        )
 
-        self.quantity_label = QLabel("Quantity:")
-        self.quantity_label.setFont(QFont("Segoe UI", 9))
-        self.quantity_label.setStyleSheet("color: #6b7280;")
+        self.quantity_label = theme.set_role(QLabel("Quantity:"), "muted")
+        self.quantity_label.setFont(theme.font(9))
 
-        self.total_prefix_label = QLabel("Total:")
-        self.total_prefix_label.setStyleSheet("color: #6b7280;")
-        self.total_prefix_label.setFont(QFont("Segoe UI", 9))
+        self.total_prefix_label = theme.set_role(QLabel("Total:"), "muted")
+        self.total_prefix_label.setFont(theme.font(9))
 
         self.quantity_spinbox = GuardedWheelSpinBox()
         self.quantity_spinbox.setMinimum(1)
@@ -75,11 +68,11 @@ class OrderElementCard(QWidget):
         self.quantity_spinbox.setKeyboardTracking(False)
         self.quantity_spinbox.valueChanged.connect(self.on_quantity_changed)
 
-        self.total_label = QLabel()
-        self.total_label.setStyleSheet("color: #111827;")
-        self.total_label.setFont(QFont("Segoe UI", 9, QFont.Weight.DemiBold))
+        self.total_label = theme.set_role(QLabel(), "value")
+        self.total_label.setFont(theme.font(9, QFont.Weight.DemiBold))
 
         self.remove_button = QPushButton("Remove")
+        self.remove_button.setObjectName("removeButton")
         self.remove_button.clicked.connect(self.remove_button_clicked)
         self.remove_button.setFixedHeight(22)
 
@@ -134,72 +127,8 @@ class OrderElementCard(QWidget):
         layout.setSpacing(6)
 
         self.setLayout(layout)
-        self.setObjectName("card")
-        self.setStyleSheet("""
-            QWidget#card {
-                background-color: #f9fafb;
-                border: 1px solid #e5e7eb;
-                border-radius: 6px;
-            }
-            QWidget#card:hover {
-                background-color: #f1f5f9;
-                border: 1px solid #cbd5e1;
-            }
-            QWidget#card[selected="true"] {
-                background-color: #dbeafe;
-                border: 1px solid #93c5fd;
-            }
-            QLineEdit {
-                border: 1px solid #e5e7eb;
-                border-radius: 4px;
-                padding: 2px 6px;
-                font-size: 9pt;
-                color: #111827;
-                background-color: #ffffff;
-            }
-            QPushButton {
-                background-color: #f3f4f6;
-                color: #374151;
-                border: 1px solid #e5e7eb;
-                border-radius: 4px;
-                font-size: 9pt;
-            }
-            QPushButton:hover {
-                background-color: #e5e7eb;
-            }
-            QPushButton:pressed {
-                background-color: #d1d5db;
-            }
-            QPushButton#shortcut {
-                background-color: #eef2f7;
-                border: 1px solid #cbd5e1;
-                font-size: 8pt;
-                padding: 1px 6px;
-            }
-            QPushButton#shortcut:hover {
-                background-color: #e2e8f0;
-            }
-        """)
-        self.remove_button.setStyleSheet(
-            "QPushButton {"
-            "  background-color: #fee2e2;"
-            "  color: #991b1b;"
-            "  border: 1px solid #fecaca;"
-            "  border-radius: 4px;"
-            "  font-size: 9pt;"
-            "}"
-            "QPushButton:hover {"
-            "  background-color: #fecaca;"
-            "}"
-            "QPushButton:pressed {"
-            "  background-color: #fca5a5;"
-            "}"
-            "QPushButton:disabled {"
-            "  background-color: #f3f4f6;"
-            "  color: #9ca3af;"
-            "  border: 1px solid #e5e7eb;"
-            "}"
-        )
+        self.setObjectName("orderElementCard")
+        self.setProperty("selected", False)
 
     def refresh(self):
         self.quantity_spinbox.blockSignals(True)
@@ -271,9 +200,7 @@ class OrderElementCard(QWidget):
         self.remove_button_signal.emit(self.product.name)
 
     def set_selected(self, selected: bool):
-        self.setProperty("selected", selected)
-        self.style().unpolish(self)
-        self.style().polish(self)
+        theme.set_selected(self, selected)
 
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -0,0 +1,20 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from Infrastructure.order_events import order_events
+
+
+class OrderEventSignals(QObject):
+    # Emitted on the thread that committed the change, delivered on the GUI thread
+    changed = pyqtSignal(object)
+
+
+_signals = None
+
+
+def order_event_signals():
+    """The application's relay of order_events; create it on the GUI thread."""
+    global _signals
+    if _signals is None:
+        _signals = OrderEventSignals()
+        order_events.add_listener(_signals.changed.emit)
+    return _signals
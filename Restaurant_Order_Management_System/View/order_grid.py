@@ -3,6 +3,7 @@ from View.product_card import ProductCard
 from View.order_element_card import OrderElementCard
 from PyQt6.QtCore import Qt
 from Model.order import Order
+from View import theme
 
 class OrderGrid(QWidget):
     def __init__(self, parent=None):
@@ -16,6 +17,8 @@ class OrderGrid(QWidget):
         self.layout.setContentsMargins(8, 8, 8, 8)
         self.layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.active_dish = None
+        self.active_item = None
+        self.active_item_id = None
 
         self.columns = 1  # ðŸ‘ˆ nÃºmero de columnas
 
@@ -69,17 +72,20 @@ class OrderGrid(QWidget):
         # Clear internal state
         self.items.clear()
         self.active_item = None
+        self.active_item_id = None
 
     def set_active(self, item_id: str | None):
+        # Only the previous and the new selection change, so only they are repolished
+        previous = self.items.get(self.active_item_id)
         self.active_item = self.items.get(item_id)
-        for key, widget in self.items.items():
-            is_selected = key == item_id
+        self.active_item_id = item_id
+        for widget in (previous, self.active_item):
+            if widget is None:
+                continue
             if hasattr(widget, "set_selected"):
-                widget.set_selected(is_selected)
+                widget.set_selected(widget is self.active_item)
             else:
-                widget.setProperty("selected", is_selected)
-                widget.style().unpolish(widget)
-                widget.style().polish(widget)
+                theme.set_selected(widget, widget is self.active_item)
 
     def show_order(self, order: Order):
         self.clear()
@@ -0,0 +1,153 @@
+import os
+import threading
+
+from PyQt6.QtCore import QDate, QThread, pyqtSignal
+from PyQt6.QtWidgets import (QCheckBox, QDateEdit, QDialog, QFileDialog, QFormLayout,
+                             QHBoxLayout, QLabel, QMessageBox, QPushButton, QVBoxLayout)
+
+from Infrastructure.connection_manager import connection_manager
+from Infrastructure.order_export import FILE_FILTER, ExportCancelled, export_order_history
+from Infrastructure.order_repository import OrderRepository
+
+
+class OrderExportThread(QThread):
+    progressed = pyqtSignal(int)
+    completed = pyqtSignal(int)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_path, path, start_date, end_date, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.path = path
+        self.start_date = start_date
+        self.end_date = end_date
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            count = export_order_history(
+                OrderRepository(self.db_path),
+                self.path,
+                self.start_date,
+                self.end_date,
+                progress=self.progressed.emit,
+                is_cancelled=self._cancel.is_set,
+            )
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as exc:
+            self.failed.emit(str(exc))
+        else:
+            self.completed.emit(count)
+        finally:
+            connection_manager.close_thread_connections()
+
+
+class OrderHistoryExportDialog(QDialog):
+    """Pick a service date range and export the matching order lines in the background."""
+
+    def __init__(self, db_path="orders.db", parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.export_thread = None
+        self.setWindowTitle("Export order history")
+
+        self.range_enabled = QCheckBox("Only service dates in range")
+        self.range_enabled.setChecked(True)
+        self.start_date = QDateEdit()
+        self.end_date = QDateEdit()
+        for date_edit, date in ((self.start_date, QDate.currentDate().addMonths(-1)),
+                                (self.end_date, QDate.currentDate())):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("yyyy-MM-dd")
+            date_edit.setDate(date)
+            self.range_enabled.toggled.connect(date_edit.setEnabled)
+        self.status_label = QLabel("")
+
+        form = QFormLayout()
+        form.addRow(self.range_enabled)
+        form.addRow("From: ", self.start_date)
+        form.addRow("To: ", self.end_date)
+
+        self.export_button = QPushButton("Export...")
+        self.export_button.clicked.connect(self.export_button_clicked)
+        self.cancel_button = QPushButton("Close")
+        self.cancel_button.clicked.connect(self.cancel_button_clicked)
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        buttons.addWidget(self.export_button)
+        buttons.addWidget(self.cancel_button)
+
+        layout = QVBoxLayout()
+        layout.addLayout(form)
+        layout.addWidget(self.status_label)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+    def export_button_clicked(self):
+        start_date = end_date = None
+        if self.range_enabled.isChecked():
+            start_date = self.start_date.date().toString("yyyy-MM-dd")
+            end_date = self.end_date.date().toString("yyyy-MM-dd")
+            if start_date > end_date:
+                QMessageBox.warning(self, "Export order history", "The start date is after the end date.")
+                return
+        path, selected_filter = QFileDialog.getSaveFileName(self, "Export order history", "", FILE_FILTER)
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            if selected_filter.startswith("CSV"):
+                path += ".csv"
+            elif selected_filter.startswith("JSON Lines"):
+                path += ".jsonl"
+            else:
+                path += ".json"
+        self.start_export(path, start_date, end_date)
+
+    def start_export(self, path, start_date=None, end_date=None):
+        self.export_thread = OrderExportThread(self.db_path, path, start_date, end_date, self)
+        self.export_thread.progressed.connect(self.export_progressed)
+        self.export_thread.completed.connect(self.export_completed)
+        self.export_thread.cancelled.connect(self.export_cancelled)
+        self.export_thread.failed.connect(self.export_failed)
+        self.export_thread.finished.connect(self.export_finished)
+        self.export_button.setEnabled(False)
+        self.cancel_button.setText("Cancel")
+        self.status_label.setText("Exporting...")
+        self.export_thread.start()
+
+    def cancel_button_clicked(self):
+        if self.export_thread is not None and self.export_thread.isRunning():
+            self.export_thread.cancel()
+            self.status_label.setText("Cancelling...")
+            return
+        self.close()
+
+    def export_progressed(self, count):
+        self.status_label.setText(f"{count} lines written")
+
+    def export_completed(self, count):
+        self.status_label.setText(f"Exported {count} lines.")
+
+    def export_cancelled(self):
+        self.status_label.setText("Export cancelled.")
+
+    def export_failed(self, message):
+        self.status_label.setText("Export failed.")
+        QMessageBox.warning(self, "Export order history", f"Could not export the orders.\n\nDetails: {message}")
+
+    def export_finished(self):
+        self.export_thread = None
+        self.export_button.setEnabled(True)
+        self.cancel_button.setText("Close")
+
+    def closeEvent(self, event):
+        # Never leave a thread writing after its dialog is gone
+        if self.export_thread is not None:
+            self.export_thread.cancel()
+            self.export_thread.wait()
+        super().closeEvent(event)
@@ -0,0 +1,357 @@
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt6.QtGui import QFont, QFontMetrics, QColor, QPen
+from PyQt6.QtCore import (Qt, QAbstractListModel, QSortFilterProxyModel, QModelIndex,
+                          QItemSelectionModel, QRect, QSize, pyqtSignal)
+from Infrastructure.print_spool import FAILED, PENDING, PRINTED, PRINTING
+from View import theme
+
+ORDER_ROLE = Qt.ItemDataRole.UserRole + 1
+PRINT_JOB_ROLE = Qt.ItemDataRole.UserRole + 2
+
+
+class OrderListModel(QAbstractListModel):
+    """Open orders shown in the orders panels, one row per order.
+
+    Rows hold the live Order objects; call update_order after changing one
+    so the panels repaint, refilter and resort it.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._orders = []
+        self._rows = {}
+        # Latest print job per order id, kept across resets
+        self._print_jobs = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._orders)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._orders):
+            return None
+        order = self._orders[index.row()]
+        if role == ORDER_ROLE:
+            return order
+        if role == Qt.ItemDataRole.DisplayRole:
+            return order.id
+        if role == PRINT_JOB_ROLE:
+            return self._print_jobs.get(order.id)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            job = self._print_jobs.get(order.id)
+            return job.last_error if job is not None and job.last_error else None
+        return None
+
+    def order_at(self, row):
+        return self._orders[row]
+
+    def contains(self, order_id):
+        return order_id in self._rows
+
+    def index_for_id(self, order_id):
+        row = self._rows.get(order_id)
+        return QModelIndex() if row is None else self.index(row)
+
+    def set_orders(self, orders):
+        self.beginResetModel()
+        self._orders = [order for order in orders if order.status != "Closed"]
+        self._rows = {order.id: row for row, order in enumerate(self._orders)}
+        self.endResetModel()
+
+    def clear(self):
+        self.set_orders([])
+
+    def update_order(self, order):
+        """Add order, refresh its row, or drop it once it is closed."""
+        if order.status == "Closed":
+            self.remove_order(order.id)
+            return
+        row = self._rows.get(order.id)
+        if row is None:
+            row = len(self._orders)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._orders.append(order)
+            self._rows[order.id] = row
+            self.endInsertRows()
+            return
+        self._orders[row] = order
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def set_print_job(self, job):
+        self._print_jobs[job.order_id] = job
+        index = self.index_for_id(job.order_id)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    def remove_order(self, order_id):
+        row = self._rows.get(order_id)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._orders[row]
+        del self._rows[order_id]
+        for order in self._orders[row:]:
+            self._rows[order.id] -= 1
+        self.endRemoveRows()
+
+
+class OrderPanelProxyModel(QSortFilterProxyModel):
+    """One panel: the orders with the given status, dine-in first, then to go, oldest first."""
+
+    def __init__(self, status, parent=None):
+        super().__init__(parent)
+        self.status = status
+        self.setDynamicSortFilter(True)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        order = self.sourceModel().order_at(source_row)
+        if self.status == "In progress":
+            return order.status == "In progress"
+        return order.status not in ("In progress", "Closed")
+
+    def lessThan(self, left, right):
+        return self._sort_key(left) < self._sort_key(right)
+
+    def _sort_key(self, index):
+        order = self.sourceModel().order_at(index.row())
+        return (1 if bool(order.to_go) else 0, order.created_at, order.id)
+
+
+class OrderCardDelegate(QStyledItemDelegate):
+    """Paints an order as a card with its two buttons, without any widgets."""
+
+    CARD_HEIGHT = 96
+    SEPARATOR_HEIGHT = 34
+    MARGIN = 4
+    PADDING_X = 10
+    PADDING_Y = 8
+    BUTTON_HEIGHT = 22
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.id_font = theme.font(11, QFont.Weight.DemiBold)
+        self.small_font = theme.font(9)
+        self.time_font = theme.font(11, QFont.Weight.DemiBold)
+        self.small_metrics = QFontMetrics(self.small_font)
+        self.id_metrics = QFontMetrics(self.id_font)
+        # Wide enough for the header of the widest order; narrower panels scroll
+        self.minimum_width = (
+            2 * (self.MARGIN + 4 + self.PADDING_X)
+            + self.id_metrics.horizontalAdvance("O000000000000")
+            + self.small_metrics.horizontalAdvance("- In progress") + 6
+            + self.small_metrics.horizontalAdvance("Move to in progress") + 16 + 8
+            + self.small_metrics.horizontalAdvance("Remove") + 16 + 8
+        )
+
+    def sizeHint(self, option, index):
+        height = self.CARD_HEIGHT + 2 * self.MARGIN
+        if self.starts_to_go_group(index):
+            height += self.SEPARATOR_HEIGHT
+        return QSize(self.minimum_width, height)
+
+    def starts_to_go_group(self, index):
+        order = index.data(ORDER_ROLE)
+        if order is None or not bool(order.to_go):
+            return False
+        if index.row() == 0:
+            return True
+        previous = index.model().index(index.row() - 1, 0).data(ORDER_ROLE)
+        return previous is None or not bool(previous.to_go)
+
+    def card_rect(self, option_rect, index):
+        rect = option_rect.adjusted(self.MARGIN + 4, self.MARGIN, -self.MARGIN - 4, -self.MARGIN)
+        if self.starts_to_go_group(index):
+            rect.setTop(rect.top() + self.SEPARATOR_HEIGHT)
+        return rect
+
+    def button_rects(self, option_rect, index):
+        """(toggle status, remove) button rects inside the card."""
+        card = self.card_rect(option_rect, index)
+        order = index.data(ORDER_ROLE)
+        top = card.top() + self.PADDING_Y
+        remove_width = self.small_metrics.horizontalAdvance("Remove") + 16
+        toggle_width = self.small_metrics.horizontalAdvance(toggle_status_text(order)) + 16
+        remove = QRect(card.right() - self.PADDING_X - remove_width, top, remove_width, self.BUTTON_HEIGHT)
+        toggle = QRect(remove.left() - 8 - toggle_width, top, toggle_width, self.BUTTON_HEIGHT)
+        return toggle, remove
+
+    def paint(self, painter, option, index):
+        order = index.data(ORDER_ROLE)
+        if order is None:
+            return
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing, True)
+
+        if self.starts_to_go_group(index):
+            self._paint_separator(painter, option.rect)
+
+        card = self.card_rect(option.rect, index)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        if selected:
+            background, border = "#d1d5db", "#6b7280"
+        elif hovered:
+            background, border = "#f1f5f9", "#cbd5e1"
+        else:
+            background, border = "#f9fafb", "#e5e7eb"
+        painter.setPen(QPen(QColor(border), 1))
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(card.adjusted(0, 0, -1, -1), 6, 6)
+
+        toggle, remove = self.button_rects(option.rect, index)
+        enabled = order.status != "Closed"
+        self._paint_button(painter, toggle, toggle_status_text(order), "#f3f4f6", "#374151", "#e5e7eb", enabled)
+        self._paint_button(painter, remove, "Remove", "#fee2e2", "#991b1b", "#fecaca", enabled)
+
+        left = card.left() + self.PADDING_X
+        right = card.right() - self.PADDING_X
+        header = QRect(left, card.top() + self.PADDING_Y, toggle.left() - 8 - left, self.BUTTON_HEIGHT)
+        painter.setFont(self.id_font)
+        painter.setPen(QColor("#1f1f1f"))
+        painter.drawText(header, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, order.id)
+        status_rect = header.adjusted(self.id_metrics.horizontalAdvance(order.id) + 6, 0, 0, 0)
+        painter.setFont(self.small_font)
+        painter.setPen(QColor("#6b7280"))
+        painter.drawText(status_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, f"- {order.status}")
+
+        line_height = (card.bottom() - self.PADDING_Y - header.bottom()) // 2
+        sent_rect = QRect(left, header.bottom() + 2, right - left, line_height)
+        painter.drawText(sent_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, sent_status_text(order))
+
+        job = index.data(PRINT_JOB_ROLE)
+        if job is not None:
+            painter.setPen(QColor(print_status_color(job)))
+            painter.drawText(sent_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, print_status_text(job))
+            painter.setPen(QColor("#6b7280"))
+
+        info_rect = QRect(left, sent_rect.bottom(), right - left, line_height)
+        painter.drawText(info_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, to_go_text(order))
+        painter.setFont(self.time_font)
+        painter.setPen(QColor("#111827"))
+        painter.drawText(info_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, time_table_text(order))
+        painter.restore()
+
+    def _paint_separator(self, painter, rect):
+        band = QRect(rect.left() + 6, rect.top() + self.MARGIN, rect.width() - 12, self.SEPARATOR_HEIGHT)
+        label = "To go"
+        label_width = self.small_metrics.horizontalAdvance(label)
+        center_x = band.center().x()
+        center_y = band.center().y()
+        painter.setPen(QPen(QColor("#d1d5db"), 1))
+        painter.drawLine(band.left(), center_y, center_x - label_width // 2 - 8, center_y)
+        painter.drawLine(center_x + label_width // 2 + 8, center_y, band.right(), center_y)
+        painter.setFont(self.small_font)
+        painter.setPen(QColor("#6b7280"))
+        painter.drawText(band, Qt.AlignmentFlag.AlignCenter, label)
+
+    def _paint_button(self, painter, rect, text, background, color, border, enabled):
+        if not enabled:
+            background, color, border = "#f3f4f6", "#9ca3af", "#e5e7eb"
+        painter.setPen(QPen(QColor(border), 1))
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 4, 4)
+        painter.setFont(self.small_font)
+        painter.setPen(QColor(color))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+
+
+class OrderListView(QListView):
+    """One orders panel over a shared OrderListModel."""
+
+    clicked_order = pyqtSignal(str)
+    remove_button_signal = pyqtSignal(str)
+    toggle_status_button_signal = pyqtSignal(str)
+
+    def __init__(self, source_model, status, parent=None):
+        super().__init__(parent)
+        self.source_model = source_model
+        self.proxy = OrderPanelProxyModel(status, self)
+        self.proxy.setSourceModel(source_model)
+        self.proxy.sort(0)
+        self.setModel(self.proxy)
+        self.delegate = OrderCardDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setMouseTracking(True)
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
+        # A changed to_go flag can move the "To go" separator without moving rows
+        self.proxy.dataChanged.connect(lambda *args: self.scheduleDelayedItemsLayout())
+
+    def contains(self, order_id):
+        return self._proxy_index(order_id).isValid()
+
+    def set_active(self, order_id):
+        index = self._proxy_index(order_id) if order_id else QModelIndex()
+        if not index.isValid():
+            self.clearSelection()
+            return
+        self.selectionModel().setCurrentIndex(index, QItemSelectionModel.SelectionFlag.ClearAndSelect)
+
+    def _proxy_index(self, order_id):
+        return self.proxy.mapFromSource(self.source_model.index_for_id(order_id))
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.position().toPoint())
+        if not index.isValid() or event.button() != Qt.MouseButton.LeftButton:
+            super().mousePressEvent(event)
+            return
+        order = index.data(ORDER_ROLE)
+        toggle, remove = self.delegate.button_rects(self.visualRect(index), index)
+        position = event.position().toPoint()
+        # Buttons act on their order without selecting it
+        if order.status != "Closed" and remove.contains(position):
+            self.remove_button_signal.emit(order.id)
+            return
+        if order.status != "Closed" and toggle.contains(position):
+            self.toggle_status_button_signal.emit(order.id)
+            return
+        super().mousePressEvent(event)
+        self.clicked_order.emit(order.id)
+
+
+def time_table_text(order):
+    created = str(order.created_time_text()).upper() if hasattr(order, "created_time_text") else "--:--"
+    table = (order.table or "").strip().upper()
+    return f"{created} - {table}" if table else created
+
+
+def to_go_text(order):
+    if not bool(order.to_go):
+        return ""
+    customer_name = (order.name or "").strip().upper()
+    return f"TO GO - {customer_name}" if customer_name else "TO GO"
+
+
+def sent_status_text(order):
+    return "Sent" if bool(getattr(order, "sent_status", False)) else "Not sent"
+
+
+def toggle_status_text(order):
+    return "Move to new" if order.status == "In progress" else "Move to in progress"
+
+
+def print_status_text(job):
+    if job.status == PRINTING:
+        return "Printing ticket..."
+    if job.status == PRINTED:
+        return "Ticket printed"
+    if job.status == FAILED:
+        return "Print failed"
+    if job.status == PENDING and job.attempts:
+        return f"Print retry {job.attempts}"
+    if job.status == PENDING:
+        return "Ticket queued"
+    return ""
+
+
+def print_status_color(job):
+    if job.status == FAILED:
+        return "#b91c1c"
+    if job.status == PENDING and job.attempts:
+        return "#b45309"
+    return "#6b7280"
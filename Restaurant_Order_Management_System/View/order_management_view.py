@@ -3,65 +3,65 @@
                             QVBoxLayout, QTabWidget, QTableView, QDateEdit,
                             QFormLayout, QMessageBox, QGroupBox, QCheckBox, QStackedLayout,
                             QDialog, QPlainTextEdit, QFrame, QComboBox)
-from PyQt6.QtGui import QFont, QTextDocument, QFontMetrics
-from PyQt6.QtCore import Qt, QTimer, QDate
+from PyQt6.QtGui import QFont, QFontMetrics
+from PyQt6.QtCore import Qt, QTimer, QDate, QObject, pyqtSignal
 from PyQt6.QtWidgets import QListWidgetItem
-from PyQt6.QtPrintSupport import QPrinter, QPrinterInfo
 from View.product_card import ProductCard
-from View.order_card import OrderCard
 from View.dish_card import DishCard
 from PyQt6.QtWidgets import QScrollArea
 from View.product_grid import ProductsGrid
 from View.order_grid import OrderGrid
 from Model.order import Order
 from View.items_list import ItemsList
+from View.order_list_view import OrderListModel, OrderListView
+from View.order_event_signals import order_event_signals
+from Infrastructure.order_events import DELETED
+from Infrastructure.timings import timings
 from Model.dish import Dish
 from View.order_element_card import OrderElementCard
 from Model.ticket_body import TicketBody
-import os
-import html
-import ctypes
 from datetime import date
-from ctypes import wintypes
 from types import SimpleNamespace
 
 
+class OrderWriteSignals(QObject):
+    # Emitted from the writer thread, delivered on the GUI thread
+    written = pyqtSignal(list)
+
+
+class PrintJobSignals(QObject):
+    # Emitted from the printer thread, delivered on the GUI thread
+    job_changed = pyqtSignal(object)
+
+
 class OrderManagementView(QWidget):
     def __init__(self, controller, show_orders_panel=True):
         super().__init__()
         self.controller = controller
         self.show_orders_panel = show_orders_panel
         self._loading_order_form = False
-        # PRINTER CONNECTION
-        self.ticket_printer_name = (
-            os.getenv("TICKET_PRINTER_NAME", "").strip() or "BlueTooth Printer"
-        )
-        self.ticket_logo_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            "logo_tacos_el_padrino.jpeg",
-        )
         self.unlocked_closed_order_ids = set()
         main_layout = QHBoxLayout()
 
+        # OPEN ORDERS, shared by both panels; each panel filters and sorts it
+        self.order_list_model = OrderListModel(self)
+
         # NEW ORDERS LIST WIDGET
-        self.orders_list_widget = ItemsList()
+        self.orders_list_widget = OrderListView(self.order_list_model, "New")
+        self._connect_order_list(self.orders_list_widget)
         
         # ORDERS IN PROGRES LIST WIDGET
-        self.in_progress_orders_list_widget = ItemsList()
+        self.in_progress_orders_list_widget = OrderListView(self.order_list_model, "In progress")
+        self._connect_order_list(self.in_progress_orders_list_widget)
         self.orders_lists_tabs = None
         if self.show_orders_panel:
             self.orders_lists_tabs = QTabWidget()
-            self.scroll_orders_list = QScrollArea()
-            self.scroll_orders_list.setWidgetResizable(True)
-            self.scroll_orders_list.setWidget(self.orders_list_widget)
-            self.scroll_in_progress_orders_list = QScrollArea()
-            self.scroll_in_progress_orders_list.setWidgetResizable(True)
-            self.scroll_in_progress_orders_list.setWidget(self.in_progress_orders_list_widget)
-            self.orders_lists_tabs.addTab(self.scroll_orders_list, "New")
-            self.orders_lists_tabs.addTab(self.scroll_in_progress_orders_list, "In progress")
+            self.orders_lists_tabs.addTab(self.orders_list_widget, "New")
+            self.orders_lists_tabs.addTab(self.in_progress_orders_list_widget, "In progress")
 
         # MENU
         self.products_grid = ProductsGrid()
+        self._loaded_menu_products = None
         scroll_products_grid = QScrollArea()
         scroll_products_grid.setWidgetResizable(True)
         scroll_products_grid.setWidget(self.products_grid)
@@ -267,6 +267,18 @@ class OrderManagementView(QWidget):
         self.autosave_timer.setSingleShot(True)
         self.autosave_timer.setInterval(800)
         self.autosave_timer.timeout.connect(self.persist_active_order)
+        self.write_signals = OrderWriteSignals(self)
+        self.write_signals.written.connect(self.orders_written)
+        self.write_failure_shown = False
+        if self.controller.write_queue is not None:
+            self.controller.write_queue.add_listener(self.write_signals.written.emit)
+        if self.show_orders_panel:
+            order_event_signals().changed.connect(self.orders_changed)
+        # Only the orders panel shows print progress on the cards
+        self.print_signals = PrintJobSignals(self)
+        self.print_signals.job_changed.connect(self.print_job_changed)
+        if self.show_orders_panel and self.controller.print_queue is not None:
+            self.controller.print_queue.add_listener(self.print_signals.job_changed.emit)
         self.update_ticket_management_visibility()
 
     # METHODS
@@ -298,14 +310,9 @@ class OrderManagementView(QWidget):
 
     def set_single_order(self, order):
         self.controller.set_single_order(order)
-        self.orders_list_widget.clear()
-        self.in_progress_orders_list_widget.clear()
+        self.order_list_model.clear()
         if self.show_orders_panel and order is not None:
-            card = OrderCard(order)
-            card.remove_button_signal.connect(self.remove_order_clicked)
-            card.toggle_status_button_signal.connect(self.toggle_order_status_from_card)
-            card.clicked.connect(self.order_selected)
-            self._place_order_card(order, card)
+            self._place_order_card(order)
         order = self.controller.get_active_order()
         self.set_selected_order_card(order.id if order else "")
         self.update_ticket_management_visibility()
@@ -323,11 +330,7 @@ class OrderManagementView(QWidget):
     def new_order_button_clicked(self): 
         self.register_form_data()
         new_order = self.controller.new_order_button_clicked()
-        new_order_card = OrderCard(new_order)
-        new_order_card.remove_button_signal.connect(self.remove_order_clicked)
-        new_order_card.toggle_status_button_signal.connect(self.toggle_order_status_from_card)
-        new_order_card.clicked.connect(self.order_selected)
-        self.orders_list_widget.add_item(new_order.id, new_order_card)
+        self._place_order_card(new_order)
         self.selected_products_list.clear()
         self.dish_list_widget.clear()
         self.set_selected_order_card(new_order.id)
@@ -357,8 +360,7 @@ class OrderManagementView(QWidget):
         was_active = active_before is not None and active_before.id == order_id
         self.unlocked_closed_order_ids.discard(order_id)
         self.controller.remove_order_clicked(order_id)
-        self.orders_list_widget.remove_item(order_id)
-        self.in_progress_orders_list_widget.remove_item(order_id)
+        self.order_list_model.remove_order(order_id)
         active_order = self.controller.get_active_order()
         if was_active or active_order is None:
             self.controller.clear_active_selection()
@@ -373,10 +375,6 @@ class OrderManagementView(QWidget):
         self.update_ticket_management_visibility()
         self.clear_form()
         self.schedule_autosave()
-        # Notify CRUD view to refresh table if linked
-        if hasattr(self, "order_crud_view") and self.order_crud_view:
-            if hasattr(self.order_crud_view, "refresh_all_orders"):
-                self.order_crud_view.refresh_all_orders()
 
         
     def remove_dish_clicked(self, dish_id): 
@@ -426,48 +424,41 @@ class OrderManagementView(QWidget):
 
     
     def render_dishes(self, order):
-        self.dish_list_widget.clear()
-        if not order:
-            return
-        for dish in order.dishes.values():
-            card = DishCard(dish)
-            card.remove_button_signal.connect(self.remove_dish_button_clicked)
-            card.send_button_signal.connect(self.send_dish_button_clicked)
-            card.to_go_changed_signal.connect(self.dish_to_go_changed)
-            if hasattr(card, "set_interaction_enabled"):
-                card.set_interaction_enabled(self.is_active_order_editable())
-            self.dish_list_widget.add_item(dish.id, card)
-            card.clicked.connect(lambda _, d_id=dish.id: self.dish_selected(d_id))
+        with timings.span("OrderManagementView.render_dishes"):
+            self.dish_list_widget.clear()
+            if not order:
+                return
+            for dish in order.dishes.values():
+                card = DishCard(dish)
+                card.remove_button_signal.connect(self.remove_dish_button_clicked)
+                card.send_button_signal.connect(self.send_dish_button_clicked)
+                card.to_go_changed_signal.connect(self.dish_to_go_changed)
+                if hasattr(card, "set_interaction_enabled"):
+                    card.set_interaction_enabled(self.is_active_order_editable())
+                self.dish_list_widget.add_item(dish.id, card)
+                card.clicked.connect(lambda _, d_id=dish.id: self.dish_selected(d_id))
 
     def render_products(self, dish):
-        self.selected_products_list.clear()
-        for product in dish.products.values():
-            card = OrderElementCard(product)
-            card.remove_button_signal.connect(self.remove_product_button_clicked)
-            if hasattr(card, "quantity_changed_signal"):
-                card.quantity_changed_signal.connect(self.product_quantity_changed)
-            if hasattr(card, "price_changed_signal"):
-                card.price_changed_signal.connect(self.product_price_changed)
-            if hasattr(card, "name_changed_signal"):
-                card.name_changed_signal.connect(self.product_name_changed)
-            if hasattr(card, "set_interaction_enabled"):
-                card.set_interaction_enabled(self.is_active_order_editable())
-            self.selected_products_list.add_element(card)
+        with timings.span("OrderManagementView.render_products"):
+            self.selected_products_list.clear()
+            for product in dish.products.values():
+                card = OrderElementCard(product)
+                card.remove_button_signal.connect(self.remove_product_button_clicked)
+                if hasattr(card, "quantity_changed_signal"):
+                    card.quantity_changed_signal.connect(self.product_quantity_changed)
+                if hasattr(card, "price_changed_signal"):
+                    card.price_changed_signal.connect(self.product_price_changed)
+                if hasattr(card, "name_changed_signal"):
+                    card.name_changed_signal.connect(self.product_name_changed)
+                if hasattr(card, "set_interaction_enabled"):
+                    card.set_interaction_enabled(self.is_active_order_editable())
+                self.selected_products_list.add_element(card)
 
     def render_orders(self):
-        # Clear existing orders before rendering new ones
-        self.orders_list_widget.clear()
-        self.in_progress_orders_list_widget.clear()
-        
-        orders = self.controller.get_orders()
-        for order in orders.values():
-            card = OrderCard(order)
-            card.remove_button_signal.connect(self.remove_order_clicked)
-            card.toggle_status_button_signal.connect(self.toggle_order_status_from_card)
-            card.clicked.connect(self.order_selected)
-            self._place_order_card(order, card)
-        self._sort_items_list_by_created_at(self.orders_list_widget)
-        self._sort_items_list_by_created_at(self.in_progress_orders_list_widget)
+        with timings.span("OrderManagementView.render_orders"):
+            # Rows are painted on demand, so resetting the model costs no widgets
+            self.order_list_model.set_orders(self.controller.get_orders().values())
+            self.set_selected_order_card(self.controller.active_order_id or "")
 
     
 
@@ -546,10 +537,7 @@ class OrderManagementView(QWidget):
         else:
             self.selected_products_list.clear()
         if order:
-            card = self.orders_list_widget.items.get(order.id) or self.in_progress_orders_list_widget.items.get(order.id)
-            if card and hasattr(card, "update_from_order"):
-                card.update_from_order(order)
-            self._place_order_card(order, card)
+            self._place_order_card(order)
         self.update_active_dish_total_label()
         self.update_active_order_total_label()
         self.persist_active_order()
@@ -674,11 +662,7 @@ class OrderManagementView(QWidget):
             return
         if active_order:
             self.unlocked_closed_order_ids.discard(active_order.id)
-            card = self.orders_list_widget.items.get(active_order.id) or self.in_progress_orders_list_widget.items.get(active_order.id)
-            if card and hasattr(card, "update_from_order"):
-                card.update_from_order(active_order)
-            self.orders_list_widget.take_item(active_order.id)
-            self.in_progress_orders_list_widget.take_item(active_order.id)
+            self.order_list_model.remove_order(active_order.id)
         self.controller.clear_active_selection()
         self.orders_list_widget.set_active(None)
         self.in_progress_orders_list_widget.set_active(None)
@@ -698,17 +682,8 @@ class OrderManagementView(QWidget):
             return
         self.unlocked_closed_order_ids.discard(reopened.id)
         if self.show_orders_panel:
-            card = self.orders_list_widget.items.get(reopened.id) or self.in_progress_orders_list_widget.items.get(reopened.id)
-            if card and hasattr(card, "update_from_order"):
-                card.update_from_order(reopened)
-            # If the card was removed when the order was closed, recreate it so
-            # the reopened order appears again in the orders panel.
-            if card is None:
-                card = OrderCard(reopened)
-                card.remove_button_signal.connect(self.remove_order_clicked)
-                card.toggle_status_button_signal.connect(self.toggle_order_status_from_card)
-                card.clicked.connect(self.order_selected)
-            self._place_order_card(reopened, card)
+            # The row was removed when the order was closed; this adds it back
+            self._place_order_card(reopened)
             self.set_selected_order_card(reopened.id)
             self.fill_order_form(reopened)
             self.render_dishes(reopened)
@@ -775,10 +750,7 @@ class OrderManagementView(QWidget):
         updated = self.controller.set_active_order_status(target_status)
         if not updated:
             return
-        card = self.orders_list_widget.items.get(updated.id) or self.in_progress_orders_list_widget.items.get(updated.id)
-        if card and hasattr(card, "update_from_order"):
-            card.update_from_order(updated)
-        self._place_order_card(updated, card)
+        self._place_order_card(updated)
         self.set_selected_order_card(updated.id)
         self.update_ticket_management_visibility()
         self.fill_order_form(updated)
@@ -801,9 +773,7 @@ class OrderManagementView(QWidget):
         updated = self.controller.get_active_order()
         if not updated:
             return
-        card = self.orders_list_widget.items.get(updated.id) or self.in_progress_orders_list_widget.items.get(updated.id)
-        if card and hasattr(card, "update_from_order"):
-            card.update_from_order(updated)
+        self._place_order_card(updated)
         self.render_dishes(updated)
         active_dish = self.controller.get_active_dish()
         if active_dish:
@@ -816,126 +786,20 @@ class OrderManagementView(QWidget):
         self.persist_active_order()
 
     def print_active_ticket(self):
-        order = self.controller.get_active_order()
+        # Message boxes stay outside the span; they wait for the user
+        with timings.span("OrderManagementView.print_active_ticket"):
+            order = self.controller.get_active_order()
+            # Printed on the printer thread; progress shows on the order card
+            job = self.controller.print_ticket(order) if order else None
         if not order:
             QMessageBox.information(self, "No order", "There is no active order to print.")
             return
+        if job is None:
+            QMessageBox.warning(self, "No printer", "Ticket printing is not available here.")
 
-        ticket_text = TicketBody.build(order, use_print_time=True)
-        if self._print_ticket_raw_windows(ticket_text):
-            return
-
-        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-
-        if self.ticket_printer_name:
-            printer.setPrinterName(self.ticket_printer_name)
-            if not printer.isValid():
-                available = ", ".join(QPrinterInfo.availablePrinterNames()) or "No printers detectadas"
-                QMessageBox.warning(
-                    self,
-                    "Printer not available",
-                    f"Printer '{self.ticket_printer_name}' was not found.\nAvailable: {available}",
-                )
-                return
-        else:
-            default_printer = QPrinterInfo.defaultPrinter()
-            if default_printer.isNull():
-                QMessageBox.warning(
-                    self,
-                    "No printer",
-                    "No default printer is configured.",
-                )
-                return
-            printer.setPrinterName(default_printer.printerName())
-            if not printer.isValid():
-                available = ", ".join(QPrinterInfo.availablePrinterNames()) or "No printers detectadas"
-                QMessageBox.warning(
-                    self,
-                    "Printer not available",
-                    f"The default printer is not valid.\nAvailable: {available}",
-                )
-                return
-
-        document = QTextDocument()
-        document.setDefaultFont(QFont("Consolas", 10))
-        document.setHtml(self._ticket_html_with_logo(ticket_text))
-        document.print(printer)
-
-    def _print_ticket_raw_windows(self, ticket_text: str) -> bool:
-        class DOC_INFO_1(ctypes.Structure):
-            _fields_ = [
-                ("pDocName", wintypes.LPWSTR),
-                ("pOutputFile", wintypes.LPWSTR),
-                ("pDatatype", wintypes.LPWSTR),
-            ]
-
-        printer_name = self.ticket_printer_name.strip()
-        if not printer_name:
-            default_printer = QPrinterInfo.defaultPrinter()
-            if default_printer.isNull():
-                return False
-            printer_name = default_printer.printerName()
-
-        if printer_name not in QPrinterInfo.availablePrinterNames():
-            return False
-
-        winspool = ctypes.WinDLL("winspool.drv", use_last_error=True)
-        open_printer = winspool.OpenPrinterW
-        open_printer.argtypes = [wintypes.LPWSTR, ctypes.POINTER(wintypes.HANDLE), wintypes.LPVOID]
-        open_printer.restype = wintypes.BOOL
-        close_printer = winspool.ClosePrinter
-        close_printer.argtypes = [wintypes.HANDLE]
-        close_printer.restype = wintypes.BOOL
-        start_doc = winspool.StartDocPrinterW
-        start_doc.argtypes = [wintypes.HANDLE, wintypes.DWORD, ctypes.c_void_p]
-        start_doc.restype = wintypes.DWORD
-        end_doc = winspool.EndDocPrinter
-        end_doc.argtypes = [wintypes.HANDLE]
-        end_doc.restype = wintypes.BOOL
-        start_page = winspool.StartPagePrinter
-        start_page.argtypes = [wintypes.HANDLE]
-        start_page.restype = wintypes.BOOL
-        end_page = winspool.EndPagePrinter
-        end_page.argtypes = [wintypes.HANDLE]
-        end_page.restype = wintypes.BOOL
-        write_printer = winspool.WritePrinter
-        write_printer.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
-        write_printer.restype = wintypes.BOOL
-
-        printer_handle = wintypes.HANDLE()
-        payload = ticket_text.replace("\n", "\r\n").encode("cp1252", errors="replace")
+    def print_job_changed(self, job):
+        self.order_list_model.set_print_job(job)
 
-        try:
-            if not open_printer(printer_name, ctypes.byref(printer_handle), None):
-                return False
-
-            doc_info = DOC_INFO_1("Ticket", None, "RAW")
-            if start_doc(printer_handle, 1, ctypes.byref(doc_info)) == 0:
-                return False
-            try:
-                if not start_page(printer_handle):
-                    return False
-                try:
-                    written = wintypes.DWORD(0)
-                    if not write_printer(
-                        printer_handle,
-                        ctypes.c_char_p(payload),
-                        len(payload),
-                        ctypes.byref(written),
-                    ):
-                        return False
-                    return written.value > 0
-                finally:
-                    end_page(printer_handle)
-            finally:
-                end_doc(printer_handle)
-        except Exception:
-            return False
-        finally:
-            if printer_handle:
-                close_printer(printer_handle)
-    
-    
     def clear_form(self):
         self.selected_order_folio_label.setText("ID: -")
         self.order_form_name.clear()
@@ -1021,32 +885,6 @@ class OrderManagementView(QWidget):
 
         dialog.exec()
 
-    def _ticket_html_with_logo(self, ticket_text: str) -> str:
-        logo_html = ""
-        if os.path.exists(self.ticket_logo_path):
-            logo_src = self.ticket_logo_path.replace("\\", "/")
-            logo_html = (
-                "<div style='text-align:center; margin-bottom:8px;'>"
-                f"<img src='{logo_src}' style='max-width:220px;' />"
-                "</div>"
-            )
-        rendered_lines = []
-        for raw_line in ticket_text.splitlines():
-            escaped_line = html.escape(raw_line)
-            normalized = raw_line.strip().upper()
-            is_brand = normalized == "TAQUERIA EL PADRINO"
-            is_total = normalized.startswith("TOTAL:")
-            weight = "700" if (is_brand or is_total) else "400"
-            rendered_lines.append(
-                f"<div style='white-space:pre; font-weight:{weight};'>{escaped_line}</div>"
-            )
-        rendered_ticket = "".join(rendered_lines)
-        return (
-            "<html><body style='font-family:Consolas, \"Courier New\", monospace; font-size:10pt;'>"
-            f"{logo_html}<div>{rendered_ticket}</div>"
-            "</body></html>"
-        )
-
     def _ticket_preview_width(self, font: QFont) -> int:
         metrics = QFontMetrics(font)
         text_width = metrics.horizontalAdvance("M" * TicketBody.WIDTH)
@@ -1110,124 +948,100 @@ class OrderManagementView(QWidget):
 
     def persist_active_order(self):
         try:
-            self.controller.persist_active_order()
-            # Notify CRUD view to refresh table if linked
-            if hasattr(self, "order_crud_view") and self.order_crud_view:
-                if hasattr(self.order_crud_view, "refresh_all_orders"):
-                    self.order_crud_view.refresh_all_orders()
+            order = self.controller.get_active_order()
+            saved_order = self.controller.persist_active_order()
+            # Saved over a change from another terminal: show the merged order
+            if saved_order is not order and not self.show_orders_panel:
+                self.set_single_order(saved_order)
         except Exception:
             pass
 
-    def refresh_active_order_card(self):
-        order = self.controller.get_active_order()
-        if not order:
-            return
-        card = self.orders_list_widget.items.get(order.id) or self.in_progress_orders_list_widget.items.get(order.id)
-        if card and hasattr(card, "update_from_order"):
-            card.update_from_order(order)
-        self._place_order_card(order, card)
-
-    def set_selected_order_card(self, order_id: str):
-        if order_id in self.orders_list_widget.items:
-            self.orders_list_widget.set_active(order_id)
-            self.in_progress_orders_list_widget.set_active(None)
+    def orders_written(self, results):
+        active_order_id = self.controller.active_order_id
+        updated, removed = self.controller.orders_written(results)
+        if updated or removed:
+            order_ids = [order.id for order in updated] + removed
+            self._show_reloaded_orders(active_order_id, order_ids, updated, removed)
+        self.show_write_failures(results)
+
+    def show_write_failures(self, results):
+        failures = self.controller.failed_writes(results)
+        if not failures:
+            if any(result.error is None for result in results):
+                self.write_failure_shown = False
             return
-        if order_id in self.in_progress_orders_list_widget.items:
-            self.in_progress_orders_list_widget.set_active(order_id)
-            self.orders_list_widget.set_active(None)
+        # Once per run of failed retries, not on every retry
+        if self.write_failure_shown:
             return
-        self.orders_list_widget.set_active(None)
-        self.in_progress_orders_list_widget.set_active(None)
+        self.write_failure_shown = True
+        order_ids = ", ".join(result.order_id for result in failures)
+        if all(result.retrying for result in failures):
+            outcome = "The changes are kept and will be saved again automatically."
+        else:
+            outcome = "The changes could not be saved."
+        QMessageBox.warning(
+            self,
+            "Orders not saved",
+            f"Could not save orders {order_ids}. {outcome}\n\nDetails: {failures[0].error}",
+        )
 
-    def _place_order_card(self, order, card):
-        if not order:
+    def orders_changed(self, change):
+        # Orders saved or deleted elsewhere; our own writes are already on screen
+        if self.controller.is_own_change(change):
             return
-        if card is None:
-            card = self.orders_list_widget.items.get(order.id) or self.in_progress_orders_list_widget.items.get(order.id)
-        if card is None:
+        if change.db_path != self.controller.order_repository.db_path:
             return
+        try:
+            self.apply_order_changes(change.order_ids, change.change_type == DELETED)
+        except Exception:
+            pass
 
-        target_list = self._target_list_for_order(order)
-        in_active = order.id in self.orders_list_widget.items
-        in_progress = order.id in self.in_progress_orders_list_widget.items
-
-        if order.status == "Closed":
-            self.orders_list_widget.take_item(order.id)
-            self.in_progress_orders_list_widget.take_item(order.id)
+    def apply_order_changes(self, order_ids, deleted=False):
+        """Patch the cards of order_ids instead of reloading every open order."""
+        active_order_id = self.controller.active_order_id
+        updated, removed = self.controller.reload_orders(order_ids, deleted)
+        self._show_reloaded_orders(active_order_id, order_ids, updated, removed)
+
+    def _show_reloaded_orders(self, active_order_id, order_ids, updated, removed):
+        for order_id in removed:
+            self.unlocked_closed_order_ids.discard(order_id)
+            self.order_list_model.remove_order(order_id)
+        for order in updated:
+            self.order_list_model.update_order(order)
+        if active_order_id not in order_ids:
+            return
+        if active_order_id in self.controller.orders:
+            self.order_selected(active_order_id)
             return
+        self.orders_list_widget.set_active(None)
+        self.in_progress_orders_list_widget.set_active(None)
+        self.dish_list_widget.clear()
+        self.selected_products_list.clear()
+        self.update_active_dish_total_label()
+        self.update_active_order_total_label()
+        self.update_ticket_management_visibility()
+        self.clear_form()
 
-        # Keep stable order: avoid removing/re-adding when card is already
-        # in the correct list.
-        already_in_target = (
-            (target_list is self.orders_list_widget and in_active and not in_progress) or
-            (target_list is self.in_progress_orders_list_widget and in_progress and not in_active)
-        )
-        if already_in_target:
-            # Re-sort even if the card stays in the same list, because
-            # to_go changes can alter group position.
-            self._sort_items_list_by_created_at(target_list)
+    def refresh_active_order_card(self):
+        order = self.controller.get_active_order()
+        if not order:
             return
+        self._place_order_card(order)
 
-        self.orders_list_widget.take_item(order.id)
-        self.in_progress_orders_list_widget.take_item(order.id)
-        target_list.add_item(order.id, card)
-        self._sort_items_list_by_created_at(target_list)
+    def set_selected_order_card(self, order_id: str):
+        # Each panel selects the order only if it shows it
+        self.orders_list_widget.set_active(order_id)
+        self.in_progress_orders_list_widget.set_active(order_id)
 
-    def _target_list_for_order(self, order):
-        if order.status == "In progress":
-            return self.in_progress_orders_list_widget
-        return self.orders_list_widget
+    def _place_order_card(self, order):
+        # The panels' proxy models refilter and resort the row by status and to_go
+        if order:
+            self.order_list_model.update_order(order)
 
-    def _sort_items_list_by_created_at(self, items_list):
-        if not getattr(items_list, "items", None):
-            return
-        ordered = sorted(
-            items_list.items.items(),
-            key=lambda pair: (
-                1 if bool(getattr(getattr(pair[1], "order", None), "to_go", False)) else 0,
-                getattr(getattr(pair[1], "order", None), "created_at", None),
-            ),
-        )
-        # Rebuild layout and dict in sorted order.
-        items_list.items = dict(ordered)
-        while items_list.layout.count():
-            layout_item = items_list.layout.takeAt(0)
-            widget = layout_item.widget()
-            if widget is not None:
-                widget.setParent(None)
-        inserted_separator = False
-        has_non_to_go = any(not bool(getattr(getattr(w, "order", None), "to_go", False)) for _, w in ordered)
-        has_to_go = any(bool(getattr(getattr(w, "order", None), "to_go", False)) for _, w in ordered)
-        for _, widget in ordered:
-            is_to_go = bool(getattr(getattr(widget, "order", None), "to_go", False))
-            if has_to_go and is_to_go and not inserted_separator:
-                items_list.layout.addWidget(self._build_to_go_separator())
-                inserted_separator = True
-            items_list.layout.addWidget(widget)
-        if not inserted_separator:
-            items_list.layout.addWidget(self._build_to_go_separator())
-
-    def _build_to_go_separator(self):
-        separator_container = QWidget()
-        separator_layout = QHBoxLayout(separator_container)
-        separator_layout.setContentsMargins(6, 8, 6, 8)
-        separator_layout.setSpacing(8)
-
-        left_line = QFrame()
-        left_line.setFrameShape(QFrame.Shape.HLine)
-        left_line.setFrameShadow(QFrame.Shadow.Sunken)
-
-        label = QLabel("To go")
-        label.setStyleSheet("color: #6b7280; font-size: 9pt;")
-
-        right_line = QFrame()
-        right_line.setFrameShape(QFrame.Shape.HLine)
-        right_line.setFrameShadow(QFrame.Shadow.Sunken)
-
-        separator_layout.addWidget(left_line, 1)
-        separator_layout.addWidget(label)
-        separator_layout.addWidget(right_line, 1)
-        return separator_container
+    def _connect_order_list(self, order_list):
+        order_list.remove_button_signal.connect(self.remove_order_clicked)
+        order_list.toggle_status_button_signal.connect(self.toggle_order_status_from_card)
+        order_list.clicked_order.connect(self.order_selected)
 
     def _build_section_line(self):
         line = QFrame()
@@ -1310,19 +1124,17 @@ class OrderManagementView(QWidget):
                 widget.setEnabled(enabled)
 
     def load_products_from_menu_database(self):
-        self._clear_products_grid()
-        for data in self.controller.get_menu_products_for_view("orders.db"):
-            product = ProductCard(data)
-            product.add_button_signal.connect(self.product_add_button_clicked)
-            self.products_grid.add_card(product)
-
-    def _clear_products_grid(self):
-        grid = self.products_grid.grid
-        while grid.count():
-            item = grid.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
+        products = self.controller.get_menu_products_for_view("orders.db")
+        # The controller hands back the same list until the menu changes
+        if products is self._loaded_menu_products:
+            return
+        self._loaded_menu_products = products
+        self.products_grid.set_products(products, self._create_product_card)
+
+    def _create_product_card(self, data):
+        product = ProductCard(data)
+        product.add_button_signal.connect(self.product_add_button_clicked)
+        return product
 
     def load_tables_from_database(self):
         current_value = ""
@@ -1353,8 +1165,8 @@ class OrderManagementView(QWidget):
             # Get the currently active order ID before refresh
             active_order_id = self.controller.active_order_id
             
-            # Load all open orders from database
-            open_orders = self.controller.order_repository.load_open_orders()
+            # Load all open orders from database; orders with queued writes keep their live state
+            open_orders = self.controller.load_open_orders()
             self.controller.set_orders(open_orders)
             
             # Re-render all orders
@@ -6,6 +6,7 @@ from PyQt6.QtGui import QPixmap, QFont, QColor
 from PyQt6.QtCore import Qt, pyqtSignal, QPropertyAnimation, QSequentialAnimationGroup, QEasingCurve
 from PyQt6.QtGui import QMouseEvent
 from PyQt6.QtWidgets import QGraphicsOpacityEffect
+from View import theme
 
 class ProductCard(QWidget):
     add_button_signal = pyqtSignal(object)
@@ -29,47 +30,73 @@ class ProductCard(QWidget):
         self.init_ui()
 
     def init_ui(self):
-        palette = self._build_palette()
-        width, height, radius = self._shape_style_values()
-        self.setFixedSize(width, height)
-        
         #-------------- NAME --------------
-        name_label = QLabel(self.name)
-        name_label.setStyleSheet(f"color: {palette['text']};")
-        name_label.setFont(QFont("Segoe UI", 10, QFont.Weight.DemiBold))
-        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.name_label = theme.set_role(QLabel(self.name), "title")
+        self.name_label.setFont(theme.font(10, QFont.Weight.DemiBold))
+        self.name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         #-------------- PRICE --------------
-        price_label = QLabel(f"{self.price}")
-        price_label.setFont(QFont("Segoe UI", 9))
-        price_label.setStyleSheet(f"color: {palette['subtext']};")
-        price_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.price_label = theme.set_role(QLabel(f"{self.price}"), "subtle")
+        self.price_label.setFont(theme.font(9))
+        self.price_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         #-------------- Layout --------------
         main_layout = QVBoxLayout()
         main_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        main_layout.addWidget(name_label)
-        main_layout.addWidget(price_label)
+        main_layout.addWidget(self.name_label)
+        main_layout.addWidget(self.price_label)
         main_layout.setContentsMargins(12, 10, 12, 10)
         main_layout.setSpacing(4)
 
         self.setLayout(main_layout)
-        self.setObjectName("card")
+        self.setObjectName("productCard")
+        self._apply_style()
+
+    def set_data(self, data):
+        """Show another menu item on this card, restyling only if colour or shape changed."""
+        color = data.get("color", "")
+        shape = self._normalize_shape(data.get("shape", "Rectangle"))
+        restyle = color != self.color or shape != self.shape
+        self.name = data["name"]
+        self.price = data["price"]
+        self.color = color
+        self.shape = shape
+        self.notes_shortcuts = data.get("notes_shortcuts", [])
+        self.is_custom = data.get("is_custom", False)
+        self.name_label.setText(self.name)
+        self.price_label.setText(f"{self.price}")
+        if restyle:
+            self._apply_style()
+
+    def _apply_style(self):
+        width, height, radius = self._shape_style_values()
+        self.setFixedSize(width, height)
+        self.setProperty("shape", self.shape)
+        palette = self._build_palette()
+        if palette is None:
+            # Default colours and the shape's radius come from the application style sheet
+            self.setStyleSheet("")
+            self.style().unpolish(self)
+            self.style().polish(self)
+            return
         self.setStyleSheet("""
-            QWidget#card {
+            QWidget#productCard {
                 background-color: %s;
                 border: 1px solid %s;
                 border-radius: %spx;
             }
-            QWidget#card:hover {
+            QWidget#productCard:hover {
                 background-color: %s;
                 border: 1px solid %s;
             }
-
+            QLabel[role="title"] { color: %s; }
+            QLabel[role="subtle"] { color: %s; }
         """ % (
             palette["background"],
             palette["border"],
             radius,
             palette["hover"],
             palette["hover_border"],
+            palette["text"],
+            palette["subtext"],
         ))
 
     def _normalize_shape(self, shape):
@@ -98,21 +125,14 @@ class ProductCard(QWidget):
         return 196, 88, 0
 
     def _build_palette(self):
-        default_palette = {
-            "background": "#f9fafb",
-            "hover": "#f1f5f9",
-            "border": "#e5e7eb",
-            "hover_border": "#cbd5e1",
-            "text": "#1f1f1f",
-            "subtext": "#4b5563",
-        }
+        # None means the default look from the application style sheet
         color_text = (self.color or "").strip()
         if not color_text:
-            return default_palette
+            return None
 
         color = QColor(color_text)
         if not color.isValid():
-            return default_palette
+            return None
 
         lightness = color.lightness()
         background = color.name()
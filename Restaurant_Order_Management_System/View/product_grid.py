@@ -9,6 +9,11 @@ class ProductsGrid(QWidget):
         self.grid.setSpacing(16)
         self.grid.setContentsMargins(16, 16, 16, 16)
 
+        # Cards in grid order, and hidden cards kept for reuse
+        self.cards = []
+        self.spare_cards = []
+        self.max_spare_cards = 24
+
         self.columns = 3  # ðŸ‘ˆ nÃºmero de columnas
 
     def add_card(self, card):
@@ -16,3 +21,54 @@ class ProductsGrid(QWidget):
         row = count // self.columns
         col = count % self.columns
         self.grid.addWidget(card, row, col)
+        self.cards.append(card)
+
+    def set_products(self, products, create_card):
+        """Show products in order, reusing the cards already in the grid.
+
+        Cards are matched by product name and updated in place; only names
+        that are new get a card, taken from the spare pool when possible and
+        from create_card(data) otherwise. Cards left over go back to the pool.
+        """
+        cards_by_name = {}
+        for card in self.cards:
+            cards_by_name.setdefault(card.name, []).append(card)
+
+        new_cards = []
+        for data in products:
+            matches = cards_by_name.get(data["name"])
+            new_cards.append(matches.pop(0) if matches else None)
+
+        # Cards whose product is gone are reused first for the new products
+        leftovers = [card for matches in cards_by_name.values() for card in matches]
+        for index, data in enumerate(products):
+            card = new_cards[index]
+            if card is None:
+                if leftovers:
+                    card = leftovers.pop()
+                elif self.spare_cards:
+                    card = self.spare_cards.pop()
+                else:
+                    card = create_card(data)
+                    new_cards[index] = card
+                    continue
+                new_cards[index] = card
+            card.set_data(data)
+
+        for card in leftovers:
+            self.grid.removeWidget(card)
+            card.hide()
+            if len(self.spare_cards) < self.max_spare_cards:
+                self.spare_cards.append(card)
+            else:
+                card.deleteLater()
+
+        for index, card in enumerate(new_cards):
+            position = (index // self.columns, index % self.columns)
+            if index < len(self.cards) and self.cards[index] is card:
+                continue
+            # QGridLayout cannot move a widget, so it is taken out and put back
+            self.grid.removeWidget(card)
+            self.grid.addWidget(card, *position)
+            card.show()
+        self.cards = new_cards
@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (QWidget, QLabel, QVBoxLayout,
                             QFormLayout, QMessageBox, QGroupBox, QDateEdit, QCheckBox,
                             QDialog, QPlainTextEdit)
 from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QItemSelectionModel
 from Infrastructure.connection_db import MenuDatabase
 from Infrastructure.order_repository import OrderRepository
 from Model.table_model import TableModel
@@ -14,7 +14,8 @@ from Controller.order_crud_controller import OrderCrudController
 from Controller.order_controller import OrderController
 from View.order_management_view import OrderManagementView
 from Controller.set_menu_controller import SetMenuController
-from View.new_product_view import NewProductView
+from View.new_product_view import NewProductView
+from View.catalog_transfer import run_export, run_import
 
 class SetMenuView(QWidget):
     def __init__(self):
@@ -57,11 +58,23 @@ class SetMenuView(QWidget):
             )
             self.edit_registry_button = QPushButton("Edit registry")
             self.edit_registry_button.clicked.connect(self.edit_registry_button_clicked)
+            self.move_up_button = QPushButton("Move up")
+            self.move_up_button.clicked.connect(lambda: self.controller.move_registry_button_clicked(-1))
+            self.move_down_button = QPushButton("Move down")
+            self.move_down_button.clicked.connect(lambda: self.controller.move_registry_button_clicked(1))
+            self.import_button = QPushButton("Import")
+            self.import_button.clicked.connect(self.import_button_clicked)
+            self.export_button = QPushButton("Export")
+            self.export_button.clicked.connect(self.export_button_clicked)
 
             buttons_layout = QHBoxLayout()
             buttons_layout.addWidget(self.add_registry_button)
             buttons_layout.addWidget(self.remove_registry_button)
             buttons_layout.addWidget(self.edit_registry_button)
+            buttons_layout.addWidget(self.move_up_button)
+            buttons_layout.addWidget(self.move_down_button)
+            buttons_layout.addWidget(self.import_button)
+            buttons_layout.addWidget(self.export_button)
 
             # MAIN LAYOUT
             self.main_layout = QVBoxLayout()
@@ -94,6 +107,12 @@ class SetMenuView(QWidget):
          modal_layout.addWidget(new_product_view)
          modal.exec()
 
+    def import_button_clicked(self):
+        run_import(self, "Import menu", self.controller.import_menu)
+
+    def export_button_clicked(self):
+        run_export(self, "Export menu", self.controller.export_menu)
+
     def refresh_table(self):
         rows = self.controller.get_menu_rows()
         self.main_model.update_data(rows)
@@ -116,6 +135,17 @@ class SetMenuView(QWidget):
                 continue
         return selected_ids
 
+    def select_menu_ids(self, row_ids):
+        wanted = set(row_ids)
+        selection_model = self.menu_table.selectionModel()
+        selection_model.clearSelection()
+        for row_idx, row in enumerate(self.main_model._data):
+            if row and row[0] in wanted:
+                selection_model.select(
+                    self.main_model.index(row_idx, 0),
+                    QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows,
+                )
+
     def show_warning(self, title, message):
         QMessageBox.warning(self, title, message)
          
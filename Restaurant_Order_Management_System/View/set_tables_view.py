@@ -8,9 +8,12 @@
     QDialog,
 )
 
+from PyQt6.QtCore import QItemSelectionModel
+
 from Model.table_model import TableModel
 from Controller.set_tables_controller import SetTablesController
 from View.new_table_view import NewTableView
+from View.catalog_transfer import run_export, run_import
 
 
 class SetTablesView(QWidget):
@@ -53,12 +56,24 @@ class SetTablesView(QWidget):
         )
         self.edit_registry_button = QPushButton("Edit registry")
         self.edit_registry_button.clicked.connect(self.edit_registry_button_clicked)
+        self.move_up_button = QPushButton("Move up")
+        self.move_up_button.clicked.connect(lambda: self.controller.move_registry_button_clicked(-1))
+        self.move_down_button = QPushButton("Move down")
+        self.move_down_button.clicked.connect(lambda: self.controller.move_registry_button_clicked(1))
+        self.import_button = QPushButton("Import")
+        self.import_button.clicked.connect(self.import_button_clicked)
+        self.export_button = QPushButton("Export")
+        self.export_button.clicked.connect(self.export_button_clicked)
 
         # ACTION BUTTONS
         buttons_layout = QHBoxLayout()
         buttons_layout.addWidget(self.add_registry_button)
         buttons_layout.addWidget(self.remove_registry_button)
         buttons_layout.addWidget(self.edit_registry_button)
+        buttons_layout.addWidget(self.move_up_button)
+        buttons_layout.addWidget(self.move_down_button)
+        buttons_layout.addWidget(self.import_button)
+        buttons_layout.addWidget(self.export_button)
 
         # MAIN LAYOUT
         self.main_layout = QVBoxLayout()
@@ -90,6 +105,12 @@ class SetTablesView(QWidget):
         modal_layout.addWidget(new_table_view)
         modal.exec()
 
+    def import_button_clicked(self):
+        run_import(self, "Import tables", self.controller.import_tables)
+
+    def export_button_clicked(self):
+        run_export(self, "Export tables", self.controller.export_tables)
+
     def refresh_table(self):
         rows = self.controller.get_table_rows()
         self.main_model.update_data(rows)
@@ -112,6 +133,17 @@ class SetTablesView(QWidget):
                 continue
         return selected_ids
 
+    def select_table_ids(self, row_ids):
+        wanted = set(row_ids)
+        selection_model = self.tables_table.selectionModel()
+        selection_model.clearSelection()
+        for row_idx, row in enumerate(self.main_model._data):
+            if row and row[0] in wanted:
+                selection_model.select(
+                    self.main_model.index(row_idx, 0),
+                    QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows,
+                )
+
     def show_warning(self, title, message):
         QMessageBox.warning(self, title, message)
 
@@ -6,6 +6,7 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
+from View.diagnostics_view import DiagnosticsView
 from View.set_menu_view import SetMenuView
 from View.set_tables_view import SetTablesView
 
@@ -16,6 +17,7 @@ class SettingsView(QWidget):
         # SETTINGS PAGES
         self.set_menu_view = SetMenuView()
         self.set_tables_view = SetTablesView()
+        self.diagnostics_view = DiagnosticsView()
         self._build_ui()
 
     def _build_ui(self):
@@ -23,6 +25,7 @@ class SettingsView(QWidget):
         self.navigation_list = QListWidget()
         self.navigation_list.addItem("Set Menu")
         self.navigation_list.addItem("Set Tables")
+        self.navigation_list.addItem("Diagnostics")
         self.navigation_list.setMaximumWidth(180)
         self.navigation_list.currentRowChanged.connect(self._on_row_changed)
 
@@ -30,6 +33,7 @@ class SettingsView(QWidget):
         self.content_layout = QStackedLayout()
         self.content_layout.addWidget(self.set_menu_view)
         self.content_layout.addWidget(self.set_tables_view)
+        self.content_layout.addWidget(self.diagnostics_view)
 
         content_container = QWidget()
         content_container.setLayout(self.content_layout)
@@ -0,0 +1,143 @@
+from functools import lru_cache
+
+from PyQt6.QtGui import QFont
+
+FONT_FAMILY = "Segoe UI"
+
+# Cards pick their look through object names and dynamic properties
+# (selected, shape, role) instead of per-instance style sheets, so Qt parses
+# these rules once for the whole application.
+APP_STYLESHEET = """
+QWidget#dishCard, QWidget#orderElementCard {
+    background-color: #f9fafb;
+    border: 1px solid #e5e7eb;
+    border-radius: 6px;
+}
+QWidget#dishCard[selected="true"] {
+    background-color: #d1d5db;
+    border: 1px solid #6b7280;
+}
+QWidget#dishCard[selected="false"]:hover {
+    background-color: #f1f5f9;
+    border: 1px solid #cbd5e1;
+}
+QWidget#orderElementCard:hover {
+    background-color: #f1f5f9;
+    border: 1px solid #cbd5e1;
+}
+QWidget#orderElementCard[selected="true"] {
+    background-color: #dbeafe;
+    border: 1px solid #93c5fd;
+}
+
+#dishCard QPushButton, #orderElementCard QPushButton {
+    background-color: #f3f4f6;
+    color: #374151;
+    border: 1px solid #e5e7eb;
+    border-radius: 4px;
+    font-size: 9pt;
+}
+#dishCard QPushButton:hover, #orderElementCard QPushButton:hover {
+    background-color: #e5e7eb;
+}
+#dishCard QPushButton:pressed, #orderElementCard QPushButton:pressed {
+    background-color: #d1d5db;
+}
+#dishCard QPushButton#removeButton, #orderElementCard QPushButton#removeButton {
+    background-color: #fee2e2;
+    color: #991b1b;
+    border: 1px solid #fecaca;
+}
+#dishCard QPushButton#removeButton:hover, #orderElementCard QPushButton#removeButton:hover {
+    background-color: #fecaca;
+}
+#dishCard QPushButton#removeButton:pressed, #orderElementCard QPushButton#removeButton:pressed {
+    background-color: #fca5a5;
+}
+#dishCard QPushButton#removeButton:disabled, #orderElementCard QPushButton#removeButton:disabled {
+    background-color: #f3f4f6;
+    color: #9ca3af;
+    border: 1px solid #e5e7eb;
+}
+#orderElementCard QPushButton#shortcut {
+    background-color: #eef2f7;
+    border: 1px solid #cbd5e1;
+    font-size: 8pt;
+    padding: 1px 6px;
+}
+#orderElementCard QPushButton#shortcut:hover {
+    background-color: #e2e8f0;
+}
+#orderElementCard QLineEdit {
+    border: 1px solid #e5e7eb;
+    border-radius: 4px;
+    padding: 2px 6px;
+    font-size: 9pt;
+    color: #111827;
+    background-color: #ffffff;
+}
+#orderElementCard QLineEdit#priceInput {
+    font-weight: 600;
+}
+
+QWidget#productCard {
+    background-color: #f9fafb;
+    border: 1px solid #e5e7eb;
+    border-radius: 0px;
+}
+QWidget#productCard:hover {
+    background-color: #f1f5f9;
+    border: 1px solid #cbd5e1;
+}
+QWidget#productCard[shape="Circle"] {
+    border-radius: 56px;
+}
+QWidget#productCard[shape="Ellipse"] {
+    border-radius: 48px;
+}
+QWidget#productCard[shape="Rounded rectangle"] {
+    border-radius: 14px;
+}
+
+QLabel[role="title"] {
+    color: #1f1f1f;
+}
+QLabel[role="muted"] {
+    color: #6b7280;
+}
+QLabel[role="subtle"] {
+    color: #4b5563;
+}
+QLabel[role="value"] {
+    color: #111827;
+}
+QLabel[role="plain"], QCheckBox[role="plain"] {
+    color: #111111;
+}
+"""
+
+
+def install(app):
+    """Set the shared card rules as the application style sheet."""
+    app.setStyleSheet(APP_STYLESHEET)
+
+
+@lru_cache(maxsize=None)
+def font(point_size, weight=QFont.Weight.Normal):
+    """Shared QFont for the given size and weight. setFont copies it, so never modify it."""
+    return QFont(FONT_FAMILY, point_size, weight)
+
+
+def set_role(widget, role):
+    widget.setProperty("role", role)
+    return widget
+
+
+def set_selected(widget, selected):
+    """Repolish widget only when its selected property actually changes."""
+    selected = bool(selected)
+    if widget.property("selected") == selected:
+        return
+    widget.setProperty("selected", selected)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
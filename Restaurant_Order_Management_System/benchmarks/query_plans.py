@@ -0,0 +1,119 @@
+"""Query plans and timings of the hot queries before and after the index migration.
+
+Run from the application directory:
+
+    python -m benchmarks.query_plans --days 1095
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.synthetic_data import create_synthetic_database
+from Infrastructure.migrations import apply_migrations
+
+INDEX_VERSION = 2
+
+
+def hot_queries(conn):
+    sample_order_id = conn.execute(
+        "SELECT id FROM orders WHERE status = 'Closed' ORDER BY id LIMIT 1 OFFSET 1000"
+    ).fetchone()[0]
+    sample_dish_id = conn.execute(
+        "SELECT id FROM order_dishes WHERE order_id = ? LIMIT 1",
+        (sample_order_id,),
+    ).fetchone()[0]
+    service_date = conn.execute(
+        "SELECT service_date FROM orders WHERE id = ?",
+        (sample_order_id,),
+    ).fetchone()[0]
+    return [
+        (
+            "load_open_orders",
+            "SELECT id FROM orders WHERE status != 'Closed' ORDER BY created_at ASC",
+            (),
+        ),
+        (
+            "load_orders dishes",
+            "SELECT * FROM order_dishes WHERE order_id IN (?) ORDER BY rowid",
+            (sample_order_id,),
+        ),
+        (
+            "load_orders items",
+            "SELECT * FROM order_items WHERE dish_id IN (?) ORDER BY id",
+            (sample_dish_id,),
+        ),
+        (
+            "delete cascade lookup",
+            "SELECT 1 FROM order_dishes WHERE order_id = ?",
+            (sample_order_id,),
+        ),
+        (
+            "orders of a service date",
+            "SELECT id FROM orders WHERE service_date = ?",
+            (service_date,),
+        ),
+        (
+            "_seed_from_orders",
+            """
+            SELECT DISTINCT TRIM(table_name) AS table_name
+            FROM orders
+            WHERE COALESCE(TRIM(table_name), '') != ''
+            ORDER BY table_name
+            """,
+            (),
+        ),
+    ]
+
+
+def measure(conn, queries, repeat):
+    results = {}
+    for name, query, params in queries:
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(query, params).fetchall()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+        results[name] = (plan, elapsed_ms)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=1095)
+    parser.add_argument("--orders-per-day", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        started = time.perf_counter()
+        conn = create_synthetic_database(
+            path,
+            days=args.days,
+            orders_per_day=args.orders_per_day,
+            schema_version=INDEX_VERSION - 1,
+        )
+        order_count = conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+        item_count = conn.execute("SELECT COUNT(*) FROM order_items").fetchone()[0]
+        print(
+            f"{order_count} orders, {item_count} items over {args.days} days "
+            f"(generated in {time.perf_counter() - started:.1f}s)"
+        )
+
+        queries = hot_queries(conn)
+        before = measure(conn, queries, args.repeat)
+        apply_migrations(conn, INDEX_VERSION)
+        after = measure(conn, queries, args.repeat)
+        conn.close()
+
+    for name, _query, _params in queries:
+        before_plan, before_ms = before[name]
+        after_plan, after_ms = after[name]
+        print()
+        print(f"{name}: {before_ms:.3f} ms -> {after_ms:.3f} ms")
+        print("  before: " + " | ".join(before_plan))
+        print("  after:  " + " | ".join(after_plan))
+
+
+if __name__ == "__main__":
+    main()
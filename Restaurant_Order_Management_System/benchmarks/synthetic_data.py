@@ -0,0 +1,127 @@
+import random
+import sqlite3
+import uuid
+from datetime import date, datetime, timedelta
+from Infrastructure.migrations import apply_migrations
+
+MENU = [
+    ("Taco al pastor", 25.0, "Food"),
+    ("Taco de suadero", 25.0, "Food"),
+    ("Quesadilla", 35.0, "Food"),
+    ("Gringa", 55.0, "Food"),
+    ("Torta", 60.0, "Food"),
+    ("Pozole", 90.0, "Food"),
+    ("Enchiladas", 85.0, "Food"),
+    ("Agua de horchata", 30.0, "Drink"),
+    ("Agua de jamaica", 30.0, "Drink"),
+    ("Refresco", 28.0, "Drink"),
+    ("Cerveza", 45.0, "Drink"),
+    ("Cafe de olla", 25.0, "Drink"),
+]
+TABLES = [f"Table {number}" for number in range(1, 16)]
+
+
+def create_synthetic_database(
+    path,
+    days=730,
+    orders_per_day=120,
+    open_orders=150,
+    schema_version=None,
+    seed=7,
+):
+    """Fill path with days of closed history plus open_orders open tickets.
+
+    schema_version stops the migrations early, e.g. to compare query plans
+    before the indexes of a later version exist.
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    apply_migrations(conn, schema_version)
+
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO menu (product_name, cost, position, product_type) VALUES (?, ?, ?, ?)",
+        [(name, price, position, product_type) for position, (name, price, product_type) in enumerate(MENU)],
+    )
+    conn.executemany(
+        "INSERT INTO tables (table_name, position) VALUES (?, ?)",
+        [(name, position) for position, name in enumerate(TABLES)],
+    )
+
+    first_day = date.today() - timedelta(days=days)
+    order_rows, dish_rows, item_rows = [], [], []
+    for day_offset in range(days + 1):
+        service_day = first_day + timedelta(days=day_offset)
+        is_today = day_offset == days
+        count = open_orders if is_today else rng.randint(orders_per_day // 2, orders_per_day * 3 // 2)
+        for number in range(1, count + 1):
+            order_id = f"O{service_day.strftime('%Y%m%d')}{number:04d}"
+            created_at = datetime.combine(service_day, datetime.min.time()) + timedelta(
+                hours=rng.randint(8, 22),
+                minutes=rng.randint(0, 59),
+            )
+            order_total = 0.0
+            for dish_number in range(rng.randint(1, 3)):
+                dish_id = str(uuid.uuid4())
+                dish_total = 0.0
+                for name, price, _product_type in rng.sample(MENU, rng.randint(1, 4)):
+                    quantity = rng.randint(1, 3)
+                    dish_total += price * quantity
+                    item_rows.append((dish_id, name, name, price, quantity, "", 0))
+                order_total += dish_total
+                dish_rows.append((dish_id, order_id, f"Dish {dish_number + 1}", "New", 1, 0, dish_total))
+            status = rng.choice(["New", "In progress"]) if is_today else "Closed"
+            to_go = int(rng.random() < 0.25)
+            order_rows.append((
+                order_id,
+                created_at.isoformat(),
+                "" if is_today else (created_at + timedelta(minutes=40)).isoformat(),
+                service_day.isoformat(),
+                int(status == "In progress"),
+                _customer_name(rng),
+                "" if to_go else rng.choice(TABLES),
+                status,
+                to_go,
+                0.0 if is_today else order_total,
+                order_total,
+            ))
+        if len(item_rows) > 50000:
+            _flush(conn, order_rows, dish_rows, item_rows)
+    _flush(conn, order_rows, dish_rows, item_rows)
+    conn.commit()
+    return conn
+
+
+def _customer_name(rng):
+    return rng.choice(["", "", "Ana", "Luis", "Carmen", "Jorge", "Sofia", "Miguel", "Lucia", "Pedro"])
+
+
+def _flush(conn, order_rows, dish_rows, item_rows):
+    conn.executemany(
+        """
+        INSERT INTO orders (
+            id, created_at, closed_at, service_date, in_progress, name, table_name, status,
+            to_go, amount_paid, total_amount
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        order_rows,
+    )
+    conn.executemany(
+        """
+        INSERT INTO order_dishes (id, order_id, display_name, status, sent_count, to_go, total_amount)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        dish_rows,
+    )
+    conn.executemany(
+        """
+        INSERT INTO order_items (dish_id, name, display_name, price, quantity, notes, is_custom)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        item_rows,
+    )
+    order_rows.clear()
+    dish_rows.clear()
+    item_rows.clear()
@@ -0,0 +1,212 @@
+"""Timings of the repository, search, ticket and analytics hot paths at several history sizes, as JSON.
+
+Run from the application directory; no display or printer is needed:
+
+    python -m benchmarks.timings --days 30 365 1095 --output timings.json
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.synthetic_data import MENU, create_synthetic_database
+from Infrastructure.connection_db import Database
+from Infrastructure.connection_manager import connection_manager
+from Infrastructure.order_repository import OrderRepository
+from Model.order import Order
+from Model.product import Product
+from Model.ticket_body import TicketBody
+
+
+def timed(function, repeat):
+    """Run function repeat times; wall-clock statistics in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "repeat": repeat,
+        "mean_ms": statistics.fmean(samples),
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+    }
+
+
+def repository_cases(repository, sample_order_id):
+    counter = iter(range(1, 10**9))
+
+    def save_existing_order():
+        order = repository.load_order(sample_order_id)
+        order.set_amount_paid(float(next(counter)))
+        repository.save_order(order)
+
+    def save_new_order():
+        order = Order(f"B{next(counter):012d}")
+        for name, price, _product_type in MENU[:3]:
+            order.add_dish().add_product(Product(name, price))
+        order.total()
+        repository.save_order(order)
+
+    today = date.today().strftime("%Y%m%d")
+    return [
+        ("OrderRepository.load_open_orders", repository.load_open_orders),
+        ("OrderRepository.load_order", lambda: repository.load_order(sample_order_id)),
+        ("OrderRepository.load_order + save_order (edit)", save_existing_order),
+        ("OrderRepository.save_order (new)", save_new_order),
+        ("OrderRepository.next_order_number", lambda: repository.next_order_number(today)),
+    ]
+
+
+def database_cases(database, sample_order):
+    service_month = sample_order.service_date[:7]
+    return [
+        ("Database.fetch_all", database.fetch_all),
+        ("Database.search (no filters)", lambda: database.search({})),
+        ("Database.search (name)", lambda: database.search({"name": "Ana"})),
+        ("Database.search (products)", lambda: database.search({"products": "Pozole"})),
+        ("Database.search (service month)", lambda: database.search({"service_date": service_month})),
+        (
+            "Database.search (total above)",
+            lambda: database.search({"total_amount": "300", "total_amount_op": ">"}),
+        ),
+        ("Database.search_page", lambda: database.search_page({}, None, 200)),
+    ]
+
+
+def ticket_cases(sample_order):
+    return [
+        ("TicketBody.build", lambda: TicketBody.build(sample_order)),
+        ("TicketBody.build (print time)", lambda: TicketBody.build(sample_order, use_print_time=True)),
+    ]
+
+
+def analytics_cases(crud_view, sample_order):
+    from PyQt6.QtCore import QDate
+
+    day = QDate.fromString(sample_order.service_date, "yyyy-MM-dd")
+    month_start = QDate(day.year(), day.month(), 1)
+    month_end = month_start.addMonths(1).addDays(-1)
+    year_start = QDate(day.year(), 1, 1)
+    year_end = QDate(day.year(), 12, 31)
+    week_start = day.addDays(1 - day.dayOfWeek())
+    week_end = week_start.addDays(6)
+    return [
+        ("OrderCrudView.load_calendar_revenue", crud_view.load_calendar_revenue),
+        ("OrderCrudView.update_day_analysis", lambda: crud_view.update_day_analysis(day)),
+        ("OrderCrudView.update_week_analysis", lambda: crud_view.update_week_analysis(week_start, week_end)),
+        ("OrderCrudView.update_month_analysis", lambda: crud_view.update_month_analysis(month_start, month_end)),
+        ("OrderCrudView.update_weekday_analysis", lambda: crud_view.update_weekday_analysis(day.dayOfWeek())),
+        (
+            "OrderCrudView._range_analysis (year)",
+            lambda: crud_view._range_analysis(year_start.toString("yyyy-MM-dd"), year_end.toString("yyyy-MM-dd")),
+        ),
+        ("OrderCrudView._compute_weekday_stats_for_selected_range", crud_view._compute_weekday_stats_for_selected_range),
+    ]
+
+
+def run_size(days, orders_per_day, open_orders, repeat, include_views):
+    """Time every case against a fresh synthetic orders.db covering days of history."""
+    previous_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # The views open "orders.db" relative to the working directory
+        os.chdir(directory)
+        try:
+            started = time.perf_counter()
+            conn = create_synthetic_database(
+                "orders.db",
+                days=days,
+                orders_per_day=orders_per_day,
+                open_orders=open_orders,
+            )
+            generate_s = time.perf_counter() - started
+            order_count = conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+            item_count = conn.execute("SELECT COUNT(*) FROM order_items").fetchone()[0]
+            sample_order_id = conn.execute(
+                "SELECT id FROM orders WHERE status = 'Closed' ORDER BY id LIMIT 1 OFFSET ?",
+                (order_count // 2,),
+            ).fetchone()[0]
+            conn.close()
+
+            repository = OrderRepository("orders.db")
+            sample_order = repository.load_order(sample_order_id)
+            cases = (
+                repository_cases(repository, sample_order_id)
+                + database_cases(Database("orders.db", "orders"), sample_order)
+                + ticket_cases(sample_order)
+            )
+            if include_views:
+                from View.order_crud_view import OrderCrudView
+
+                crud_view = OrderCrudView()
+                cases += analytics_cases(crud_view, sample_order)
+
+            timings = {}
+            for name, function in cases:
+                function()  # warm the statement cache and page cache
+                timings[name] = timed(function, repeat)
+            if include_views:
+                crud_view.deleteLater()
+        finally:
+            connection_manager.close_thread_connections()
+            os.chdir(previous_directory)
+
+    return {
+        "days": days,
+        "orders": order_count,
+        "items": item_count,
+        "generate_s": generate_s,
+        "timings": timings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 365, 1095])
+    parser.add_argument("--orders-per-day", type=int, default=120)
+    parser.add_argument("--open-orders", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-views", action="store_true", help="skip the OrderCrudView analytics (no PyQt6 widgets)")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    include_views = not args.no_views
+    if include_views:
+        from PyQt6.QtWidgets import QApplication
+
+        app = QApplication.instance() or QApplication([])
+
+    results = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "orders_per_day": args.orders_per_day,
+        "open_orders": args.open_orders,
+        "sizes": [],
+    }
+    for days in args.days:
+        print(f"Timing {days} days of history...", file=sys.stderr)
+        results["sizes"].append(
+            run_size(days, args.orders_per_day, args.open_orders, args.repeat, include_views)
+        )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
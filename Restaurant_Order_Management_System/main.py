@@ -8,8 +8,12 @@ from PyQt6.QtGui import QPixmap, QFont
 from View.order_management_view import OrderManagementView
 from Controller.order_controller import OrderController
 from Infrastructure.order_repository import OrderRepository
+from Infrastructure.order_write_queue import OrderWriteQueue
+from Infrastructure.print_queue import PrintQueue
+from Infrastructure.ticket_printers import ticket_printer_from_env
 from View.order_crud_view import OrderCrudView
 from View.settings_view import SettingsView
+from View import theme
 
 class EmptyWindow(QWidget):
 
@@ -43,14 +47,14 @@ class EmptyWindow(QWidget):
 
         # PAGES CONTENT
         repository = OrderRepository("orders.db")
-        order_management_controller = OrderController(repository)
+        self.order_write_queue = OrderWriteQueue("orders.db")
+        self.print_queue = PrintQueue(ticket_printer_from_env(), "orders.db")
+        order_management_controller = OrderController(repository, self.order_write_queue, self.print_queue)
         self.order_management_view = OrderManagementView(order_management_controller)
         open_orders = repository.load_open_orders()
         order_management_controller.set_orders(open_orders)
         self.order_management_view.render_orders()
-        self.order_crud_view = OrderCrudView()
-        # Link CRUD view to management view so it can trigger refreshes
-        self.order_management_view.order_crud_view = self.order_crud_view
+        self.order_crud_view = OrderCrudView(self.print_queue)
         self.settings_view = SettingsView()
         
         self.stacked_layout = QStackedLayout()
@@ -88,9 +92,8 @@ class EmptyWindow(QWidget):
                 self.order_management_view.refresh_orders_from_database()
             self.stacked_layout.setCurrentIndex(0)
         elif button.text().lower() =='order database':
-            # Refresh the CRUD table when entering the tab
-            if self.order_crud_view and hasattr(self.order_crud_view, "refresh_all_orders"):
-                self.order_crud_view.refresh_all_orders()
+            # Queued autosaves reach the CRUD table through the order change signals
+            self.order_management_view.controller.flush_writes()
             self.stacked_layout.setCurrentIndex(1)
         elif button.text().lower() =='settings':
             self.stacked_layout.setCurrentIndex(2)
@@ -101,6 +104,9 @@ class EmptyWindow(QWidget):
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    theme.install(app)
     window = EmptyWindow()
+    app.aboutToQuit.connect(window.order_write_queue.close)
+    app.aboutToQuit.connect(window.print_queue.close)
     sys.exit(app.exec())
 
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from Infrastructure.connection_db import MenuDatabase, TablesDatabase
+from Infrastructure.connection_manager import connection_manager, get_connection
+
+
+class CatalogRowsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "restaurant.db")
+        self.menu = MenuDatabase(self.db_path, "menu")
+        self.tables = TablesDatabase(self.db_path, "restaurant_tables")
+        # Equal positions are ordered by id
+        for index, position in enumerate((3, 1, 2, 1, 5, 4, 2)):
+            self.menu.insert(f"Product {index}", 10.0, "", "", "", position, "Food")
+            self.tables.insert(f"Mesa {index}", position)
+
+    def tearDown(self):
+        connection_manager.close_thread_connections()
+        self.directory.cleanup()
+
+    def test_batches_return_every_row_in_order(self):
+        self.assertEqual(list(self.menu.iter_rows(batch_size=2)), self.menu.fetch_all())
+        self.assertEqual(list(self.tables.iter_rows(batch_size=3)), self.tables.fetch_all())
+
+    def test_iterating_leaves_the_shared_connection_alone(self):
+        conn = get_connection(self.db_path)
+        rows = self.menu.iter_rows(batch_size=2)
+        next(rows)
+        self.assertFalse(conn.in_transaction)
+
+        # Work of the caller's between rows is neither committed nor rolled back by the generator
+        conn.execute("UPDATE menu SET cost = 99 WHERE position = 5")
+        self.assertTrue(conn.in_transaction)
+        next(rows)
+        rows.close()
+        self.assertTrue(conn.in_transaction)
+        conn.rollback()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM menu WHERE cost = 99").fetchone()[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
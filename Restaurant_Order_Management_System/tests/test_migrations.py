@@ -0,0 +1,127 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from Infrastructure import migrations
+from Infrastructure.connection_manager import connection_manager, get_connection
+from Infrastructure.migrations import LATEST_VERSION, apply_migrations, schema_version
+
+# Everything the backfilled migrations derive from the orders
+DERIVED_TABLES = ("daily_revenue", "daily_revenue_hours", "daily_table_usage", "product_sales", "order_search_keys")
+
+
+class ApplyMigrationsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "orders.db")
+        # Orders written before the rollups existed, so the migrations backfill them
+        self.conn = get_connection(self.db_path)
+        apply_migrations(self.conn, target_version=2)
+        with self.conn:
+            for number, table_name in enumerate(("Mesa 1", "Mesa 2", "Mesa 1"), start=1):
+                order_id = f"O20260115000{number}"
+                self.conn.execute(
+                    "INSERT INTO orders (id, created_at, closed_at, service_date, name, table_name, status, "
+                    "to_go, amount_paid, total_amount) VALUES (?, ?, '', '2026-01-15', 'Ana', ?, 'Closed', 0, 40, 40)",
+                    (order_id, f"2026-01-15T1{number}:00:00", table_name),
+                )
+                self.conn.execute(
+                    "INSERT INTO order_dishes (id, order_id, status, sent_count, to_go, total_amount) "
+                    "VALUES (?, ?, 'New', 0, 0, 40)",
+                    (f"D{number}", order_id),
+                )
+                self.conn.execute(
+                    "INSERT INTO order_items (dish_id, name, price, quantity, is_custom) VALUES (?, 'Agua', 20, 2, 0)",
+                    (f"D{number}",),
+                )
+
+    def tearDown(self):
+        connection_manager.close_thread_connections()
+        self.directory.cleanup()
+
+    def derived_rows(self):
+        return {
+            table: self.conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+            for table in DERIVED_TABLES
+        }
+
+    def search(self, text):
+        return self.conn.execute(
+            "SELECT k.order_id FROM orders_fts JOIN order_search_keys k ON k.key = orders_fts.rowid "
+            "WHERE orders_fts MATCH ? ORDER BY k.order_id",
+            (text,),
+        ).fetchall()
+
+    def test_version_read_before_another_process_migrated(self):
+        apply_migrations(self.conn)
+        expected = self.derived_rows()
+
+        # The second process read version 2 before the first one took the lock
+        real_schema_version = schema_version
+        stale_reads = [2]
+
+        def schema_version_once_stale(conn):
+            return stale_reads.pop() if stale_reads else real_schema_version(conn)
+
+        with mock.patch.object(migrations, "schema_version", schema_version_once_stale):
+            self.assertEqual(apply_migrations(self.conn), LATEST_VERSION)
+        self.assertEqual(schema_version(self.conn), LATEST_VERSION)
+        self.assertEqual(self.derived_rows(), expected)
+
+    def test_two_connections_migrate_at_once(self):
+        start = threading.Barrier(2)
+        errors = []
+
+        def migrate():
+            try:
+                conn = get_connection(self.db_path)
+                start.wait()
+                apply_migrations(conn)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection_manager.close_thread_connections()
+
+        threads = [threading.Thread(target=migrate) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(schema_version(self.conn), LATEST_VERSION)
+        self.assertEqual(self.conn.execute("SELECT order_count FROM daily_revenue").fetchall(), [(3,)])
+        self.assertEqual(len(self.search("agua")), 3)
+
+    def test_migrated_database_can_be_migrated_again(self):
+        apply_migrations(self.conn)
+        expected = self.derived_rows()
+        self.assertEqual(apply_migrations(self.conn), LATEST_VERSION)
+        self.assertEqual(self.derived_rows(), expected)
+
+    def test_backfill_steps_can_run_again(self):
+        apply_migrations(self.conn, target_version=5)
+        rollups = {
+            table: self.conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+            for table in DERIVED_TABLES[:4]
+        }
+        search_rows = self.conn.execute("SELECT rowid, * FROM orders_fts ORDER BY rowid").fetchall()
+        for migrate in (migrations._daily_revenue_rollup, migrations._product_sales_aggregate,
+                        migrations._order_search_index):
+            with self.conn:
+                migrate(self.conn)
+        for table, rows in rollups.items():
+            self.assertEqual(self.conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall(), rows)
+        self.assertEqual(self.conn.execute("SELECT rowid, * FROM orders_fts ORDER BY rowid").fetchall(), search_rows)
+
+        apply_migrations(self.conn)
+        expected = self.derived_rows()
+        with self.conn:
+            migrations._order_search_keys(self.conn)
+        self.assertEqual(self.derived_rows(), expected)
+        self.assertEqual(len(self.search("agua")), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from Controller.order_controller import OrderController
+from Infrastructure.connection_manager import connection_manager
+from Infrastructure.order_repository import OrderRepository
+from Infrastructure.order_write_queue import OrderWriteQueue
+from Model.order import Order
+from Model.product import Product
+
+
+class ReloadWithQueuedWritesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.directory.name, "orders.db")
+        self.repository = OrderRepository(db_path)
+        # A writer stuck retrying, as when another terminal holds the write lock
+        self.queue = OrderWriteQueue(db_path, batch_delay=0, retry_delay=60)
+        self.queue.repository.save_orders = self.locked_save_orders
+        self.controller = OrderController(self.repository, self.queue)
+        for order_id in ("O202601150001", "O202601150002"):
+            order = Order(order_id)
+            order.add_dish().add_product(Product("Agua", 20))
+            order.total()
+            self.repository.save_order(order)
+        self.controller.set_orders(self.repository.load_open_orders())
+
+    def tearDown(self):
+        self.queue.close(0)
+        connection_manager.close_thread_connections()
+        self.directory.cleanup()
+
+    def locked_save_orders(self, *args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    def edit_order(self, order_id, name):
+        order = self.controller.orders[order_id]
+        order.name = name
+        self.controller.save_order(order)
+        return order
+
+    def test_reload_keeps_orders_with_queued_writes(self):
+        edited = self.edit_order("O202601150001", "Ana")
+        self.assertFalse(self.queue.flush(5))
+
+        started = time.monotonic()
+        updated, removed = self.controller.reload_orders(["O202601150001", "O202601150002"])
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual([order.id for order in updated], ["O202601150002"])
+        self.assertEqual(removed, [])
+        self.assertIs(self.controller.orders["O202601150001"], edited)
+
+    def test_open_orders_keep_the_live_state_of_queued_writes(self):
+        edited = self.edit_order("O202601150001", "Ana")
+        closed = self.controller.orders.pop("O202601150002")
+        closed.status = "Closed"
+        self.controller.save_order(closed)
+
+        started = time.monotonic()
+        open_orders = self.controller.load_open_orders()
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(list(open_orders), ["O202601150001"])
+        self.assertIs(open_orders["O202601150001"], edited)
+
+
+if __name__ == "__main__":
+    unittest.main()
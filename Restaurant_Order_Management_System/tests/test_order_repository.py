@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from Infrastructure.connection_manager import connection_manager, get_connection
+from Infrastructure.order_repository import OrderRepository
+from Model.order import Order
+from Model.product import Product
+
+
+class SaveOrderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "orders.db")
+        self.repository = OrderRepository(self.db_path)
+        self.conn = get_connection(self.db_path)
+        order = Order("O202601150001")
+        order.service_date = "2026-01-15"
+        order.table = "Mesa 1"
+        order.add_dish().add_product(Product("Agua", 20))
+        order.total()
+        self.repository.save_order(order)
+        self.order = self.repository.load_order(order.id)
+
+    def tearDown(self):
+        connection_manager.close_thread_connections()
+        self.directory.cleanup()
+
+    def rows_written_by_save(self):
+        # total_changes also counts the rows that triggers write
+        before = self.conn.total_changes
+        self.repository.save_order(self.order)
+        return self.conn.total_changes - before
+
+    def test_unwatched_column_fires_no_triggers(self):
+        self.order.sent_status = True
+        self.assertEqual(self.rows_written_by_save(), 1)
+        self.assertEqual(self.repository.load_order(self.order.id).sent_status, True)
+
+    def test_rollup_follows_changed_amount(self):
+        self.order.set_amount_paid(50.0)
+        self.repository.save_order(self.order)
+
+        revenue = self.conn.execute(
+            "SELECT revenue FROM daily_revenue WHERE service_date = '2026-01-15'"
+        ).fetchone()[0]
+        self.assertEqual(revenue, 50.0)
+
+    def test_item_notes_leave_search_index_alone(self):
+        dish = next(iter(self.order.dishes.values()))
+        dish.products["Agua"].notes = "sin hielo"
+        # The item row, and the version of its order
+        self.assertEqual(self.rows_written_by_save(), 2)
+
+    def test_added_item_is_searchable(self):
+        dish = next(iter(self.order.dishes.values()))
+        dish.add_product(Product("Pozole", 90))
+        self.order.total()
+        self.repository.save_order(self.order)
+
+        products = self.conn.execute("SELECT products FROM orders_fts").fetchone()[0]
+        self.assertEqual(products, "Agua Pozole")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from Infrastructure.connection_db import Database
+from Infrastructure.connection_manager import connection_manager, get_connection
+
+
+class OrderSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "orders.db")
+        self.database = Database(self.db_path, "orders")
+        rows = [
+            ("O202601150001", "Ana", "Mesa 1", "Closed"),
+            ("O202601150002", "Luis", "Mesa 10", "In progress"),
+            ("O202601150003", "Marta", "Barra", "In progress"),
+            ("O202601150004", "Pedro", "Mesa 2", "New"),
+        ]
+        for order_id, name, table_name, status in rows:
+            self.database.insert(
+                order_id, "2026-01-15T12:00:00", "", name, table_name, status, 0, 0.0, 0.0, "2026-01-15"
+            )
+
+    def tearDown(self):
+        connection_manager.close_thread_connections()
+        self.directory.cleanup()
+
+    def found_ids(self, filters):
+        return [row[0] for row in self.database.search(filters)]
+
+    def test_name_search_survives_renumbered_rowids(self):
+        # What VACUUM may do to the implicit rowids of a table with a TEXT key
+        conn = get_connection(self.db_path)
+        with conn:
+            # Reverse them, through negative values to keep them unique
+            conn.execute("UPDATE orders SET rowid = -rowid")
+            conn.execute("UPDATE orders SET rowid = 5 + rowid")
+
+        self.assertEqual(self.found_ids({"name": "Marta"}), ["O202601150003"])
+        self.assertEqual(self.found_ids({"name": "Pedro"}), ["O202601150004"])
+
+    def test_table_and_status_match_substrings(self):
+        self.assertEqual(self.found_ids({"table_name": "Mesa 1"}), ["O202601150001", "O202601150002"])
+        self.assertEqual(self.found_ids({"table_name": "mesa"}), ["O202601150001", "O202601150002", "O202601150004"])
+        self.assertEqual(self.found_ids({"status": "progress"}), ["O202601150002", "O202601150003"])
+
+
+if __name__ == "__main__":
+    unittest.main()
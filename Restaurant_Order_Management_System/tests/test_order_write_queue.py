@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from Infrastructure.connection_manager import connection_manager
+from Infrastructure.order_write_queue import OrderWriteQueue
+from Model.order import Order
+from Model.product import Product
+
+
+class OrderWriteQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.queue = OrderWriteQueue(os.path.join(self.directory.name, "orders.db"), batch_delay=0, retry_delay=0.01)
+        self.results = []
+        self.queue.add_listener(self.results.extend)
+        self.save_orders = self.queue.repository.save_orders
+        self.failures_left = 0
+        self.queue.repository.save_orders = self.flaky_save_orders
+
+    def tearDown(self):
+        self.queue.close(5)
+        connection_manager.close_thread_connections()
+        self.directory.cleanup()
+
+    def flaky_save_orders(self, *args, **kwargs):
+        if self.failures_left:
+            self.failures_left -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self.save_orders(*args, **kwargs)
+
+    def new_order(self, order_id="O202601150001"):
+        order = Order(order_id)
+        order.add_dish().add_product(Product("Agua", 20))
+        order.total()
+        return order
+
+    def wait_until_written(self):
+        for _ in range(100):
+            if self.queue.flush(5):
+                return
+        self.fail("the queue never caught up")
+
+    def test_failed_write_is_retried(self):
+        self.failures_left = 2
+        order = self.new_order()
+        self.queue.save(order)
+        self.wait_until_written()
+
+        self.assertIsNotNone(self.queue.repository.load_order(order.id))
+        failures = [result for result in self.results if result.error is not None]
+        self.assertEqual(len(failures), 2)
+        self.assertTrue(all(result.retrying for result in failures))
+        self.assertIsNotNone(self.results[-1].saved_order)
+
+    def test_flush_returns_when_a_write_fails(self):
+        self.failures_left = 1
+        self.queue.retry_delay = 60
+        self.queue.save(self.new_order())
+        self.assertFalse(self.queue.flush(5))
+        self.assertTrue(self.queue.has_pending())
+
+    def test_newer_snapshot_is_kept_over_the_failed_one(self):
+        started = threading.Event()
+        release = threading.Event()
+        order = self.new_order()
+
+        def blocked_save_orders(*args, **kwargs):
+            self.queue.repository.save_orders = self.flaky_save_orders
+            started.set()
+            release.wait(5)
+            raise sqlite3.OperationalError("database is locked")
+
+        self.queue.repository.save_orders = blocked_save_orders
+        self.queue.save(order)
+        started.wait(5)
+        order.name = "Ana"
+        self.queue.save(order)
+        release.set()
+        self.wait_until_written()
+
+        self.assertEqual(self.queue.repository.load_order(order.id).name, "Ana")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from PyQt6.QtCore import QCoreApplication
+
+from Model.paged_table_model import PagedTableModel
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+class FakeTable:
+    """Rows keyed by their first column, queried the way the order views query the database."""
+
+    def __init__(self, keys):
+        self.rows = {key: (key, f"row {key}") for key in keys}
+
+    def fetch_page(self, after_key, limit):
+        keys = sorted(key for key in self.rows if after_key is None or key > after_key)
+        return [self.rows[key] for key in keys[:limit]]
+
+    def count_rows(self):
+        return len(self.rows)
+
+    def fetch_rows(self, keys):
+        return [self.rows[key] for key in keys if key in self.rows]
+
+
+class PatchPageTest(unittest.TestCase):
+    def setUp(self):
+        # Four pages of three rows; only the last two stay cached
+        self.table = FakeTable(range(10, 130, 10))
+        self.model = PagedTableModel(
+            ["Id", "Name"], self.table.fetch_page, self.table.count_rows, page_size=3, cached_pages=2,
+            fetch_rows=self.table.fetch_rows,
+        )
+        while self.model.canFetchMore(self.model.index(-1, -1)):
+            self.model.fetchMore(self.model.index(-1, -1))
+        self.assertEqual(list(self.model._pages), [2, 3])
+        self.signals = []
+        self.model.rowsInserted.connect(lambda _parent, first, last: self.signals.append(("insert", first, last)))
+        self.model.rowsRemoved.connect(lambda _parent, first, last: self.signals.append(("remove", first, last)))
+        self.model.dataChanged.connect(lambda first, last: self.signals.append(("change", first.row(), last.row())))
+
+    def model_rows(self):
+        return [self.model.row_data(row) for row in range(self.model.rowCount())]
+
+    def assert_matches_table(self):
+        self.assertEqual(self.model_rows(), [self.table.rows[key] for key in sorted(self.table.rows)])
+        self.assertEqual(sum(self.model._page_sizes), self.model.rowCount())
+
+    def test_cached_page(self):
+        self.table.rows[100] = (100, "renamed")
+        self.table.rows[105] = (105, "new")
+        del self.table.rows[110]
+        self.model.refresh_keys([100, 105, 110])
+        self.assert_matches_table()
+        self.assertEqual(self.signals, [("change", 9, 9), ("insert", 10, 10), ("remove", 11, 11)])
+
+    def test_evicted_page(self):
+        # The page's old rows are gone, so the page read back is shown whole
+        self.table.rows[20] = (20, "renamed")
+        self.table.rows[25] = (25, "new")
+        del self.table.rows[30]
+        self.model.refresh_keys([20, 25, 30])
+        self.assert_matches_table()
+        self.assertEqual(self.signals, [("change", 0, 2)])
+
+    def test_evicted_page_grows_past_page_size(self):
+        # 25 was written by another client; only 15 and 26 are refreshed
+        for key in (15, 25, 26):
+            self.table.rows[key] = (key, "new")
+        self.model.refresh_keys([15, 26])
+        self.assert_matches_table()
+        self.assertEqual(self.signals, [("insert", 3, 5), ("change", 0, 2)])
+
+        # Evicted again, the grown page still reads back whole
+        self.model._pages.clear()
+        self.assert_matches_table()
+
+    def test_evicted_page_shrinks(self):
+        del self.table.rows[20]
+        del self.table.rows[30]
+        self.model.refresh_keys([20])
+        self.assert_matches_table()
+        self.assertEqual(self.signals, [("remove", 1, 2), ("change", 0, 0)])
+
+    def test_keys_past_the_loaded_pages_are_left_for_fetch_more(self):
+        self.table.rows[130] = (130, "new")
+        self.model.refresh_keys([130])
+        self.assertTrue(self.model.canFetchMore(self.model.index(-1, -1)))
+        self.model.fetchMore(self.model.index(-1, -1))
+        self.assert_matches_table()
+        self.assertEqual(self.signals, [("insert", 12, 12)])
+
+if __name__ == "__main__":
+    unittest.main()
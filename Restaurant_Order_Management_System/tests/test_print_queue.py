@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from Infrastructure.connection_manager import connection_manager
+from Infrastructure.print_queue import PrintQueue
+from Infrastructure.print_spool import PRINTED, PrintSpool
+
+
+class RecordingPrinter:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.printed = []
+        self.lock = threading.Lock()
+
+    def print_ticket(self, job):
+        time.sleep(self.delay)
+        with self.lock:
+            self.printed.append(job.id)
+
+
+class PrintQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "orders.db")
+        self.spool = PrintSpool(self.db_path)
+        self.queues = []
+
+    def tearDown(self):
+        for queue in self.queues:
+            queue.close()
+        connection_manager.close_thread_connections()
+        self.directory.cleanup()
+
+    def start_queue(self, printer):
+        queue = PrintQueue(printer, self.db_path, retry_delay=0.01)
+        self.queues.append(queue)
+        return queue
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("timed out")
+            time.sleep(0.01)
+
+    def statuses(self):
+        return self.spool.connect().execute("SELECT status FROM print_jobs ORDER BY id").fetchall()
+
+    def test_only_one_claim_wins(self):
+        self.spool.add("O1", "ticket")
+        now = time.time()
+        # Both terminals saw the job as due
+        first = self.spool.next_due(now)
+        second = PrintSpool(self.db_path).next_due(now)
+
+        self.assertTrue(self.spool.claim(first, now, now + 60))
+        self.assertFalse(self.spool.claim(second, now, now + 60))
+        self.assertEqual(first.attempts, 1)
+
+    def test_expired_claim_is_due_again(self):
+        job = self.spool.add("O1", "ticket")
+        now = time.time()
+        self.spool.claim(job, now, now + 60)
+
+        self.assertIsNone(self.spool.next_due(now))
+        self.assertEqual(self.spool.next_due(now + 61).id, job.id)
+
+    def test_terminals_sharing_the_spool_print_each_job_once(self):
+        printers = [RecordingPrinter(delay=0.005), RecordingPrinter(delay=0.005)]
+        jobs = [self.spool.add(f"O{number}", "ticket") for number in range(20)]
+        for printer in printers:
+            self.start_queue(printer)
+        self.wait_for(lambda: self.statuses() == [(PRINTED,)] * len(jobs))
+
+        printed = printers[0].printed + printers[1].printed
+        self.assertEqual(sorted(printed), [job.id for job in jobs])
+
+    def test_database_error_does_not_stop_the_printer_thread(self):
+        printer = RecordingPrinter()
+        queue = self.start_queue(printer)
+        next_due = queue.spool.next_due
+        failures = [2]
+
+        def locked_next_due(now):
+            if failures[0]:
+                failures[0] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            return next_due(now)
+
+        queue.spool.next_due = locked_next_due
+        job = queue.submit("O1", "ticket")
+        self.wait_for(lambda: printer.printed == [job.id])
+        self.assertTrue(queue._thread.is_alive())
+
+    def test_printed_ticket_is_recorded_after_the_database_recovers(self):
+        printer = RecordingPrinter()
+        queue = self.start_queue(printer)
+        mark_printed = queue.spool.mark_printed
+        failures = [1]
+
+        def locked_mark_printed(job):
+            if failures[0]:
+                failures[0] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            mark_printed(job)
+
+        queue.spool.mark_printed = locked_mark_printed
+        job = queue.submit("O1", "ticket")
+        self.wait_for(lambda: self.statuses() == [(PRINTED,)])
+        self.assertEqual(printer.printed, [job.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
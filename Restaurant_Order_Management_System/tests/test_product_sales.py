@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from Infrastructure.connection_manager import connection_manager, get_connection
+from Infrastructure.order_repository import OrderRepository
+from Model.order import Order
+from Model.product import Product
+
+
+class ProductSalesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "orders.db")
+        self.repository = OrderRepository(self.db_path)
+        self.conn = get_connection(self.db_path)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO menu (product_name, cost, product_type) VALUES ('Agua', 20, 'Food')"
+            )
+
+    def tearDown(self):
+        connection_manager.close_thread_connections()
+        self.directory.cleanup()
+
+    def sales(self):
+        return self.conn.execute(
+            "SELECT product_name, product_type, quantity FROM product_sales WHERE quantity != 0 "
+            "ORDER BY product_type"
+        ).fetchall()
+
+    def set_menu_type(self, product_type):
+        with self.conn:
+            self.conn.execute("UPDATE menu SET product_type = ? WHERE product_name = 'Agua'", (product_type,))
+
+    def new_order(self):
+        order = Order("O202601150001")
+        order.service_date = "2026-01-15"
+        order.add_dish().add_product(Product("Agua", 20))
+        order.total()
+        self.repository.save_order(order)
+        return order
+
+    def test_reclassified_product_is_removed_under_its_original_type(self):
+        order = self.new_order()
+        self.set_menu_type("Drink")
+
+        order = self.repository.load_order(order.id)
+        dish = next(iter(order.dishes.values()))
+        dish.set_product_quantity("Agua", 3)
+        order.total()
+        self.repository.save_order(order)
+        self.assertEqual(self.sales(), [("Agua", "food", 3)])
+
+        self.repository.delete_order(order.id)
+        self.assertEqual(self.sales(), [])
+
+    def test_new_items_use_the_current_menu_type(self):
+        self.set_menu_type("Drink")
+        self.new_order()
+        self.assertEqual(self.sales(), [("Agua", "drink", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()